@@ -0,0 +1,576 @@
+"""
+Набор бенчмарков для горячих путей симуляции и отрисовки.
+
+Запуск::
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json --threshold 0.15
+
+Результаты пишутся в JSON: для каждого случая время одной операции в
+наносекундах (медиана и минимум по повторам) и его параметры. В режиме
+сравнения случаи, у которых минимальное время выросло относительно
+базового файла больше чем на ``threshold``, помечаются как регрессии, и
+процесс завершается с кодом 1.
+
+Отрисовка измеряется с видеодрайвером SDL ``dummy``, поэтому окно не
+открывается и бенчмарки можно запускать без дисплея.
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from game.apple import Apple
+from game.arena import Arena
+from game.autopilot import Autopilot
+from game.base import Cell
+from game.env import SnakeEnv
+from game.free_cells import FreeCellIndex
+from game.game_engine import GameEngine, GameLauncher
+from game.hamiltonian import HamiltonianSolver
+from game.simulation import Simulation
+from game.snake import Snake
+from game.utils import HEIGHT_RANGE, WIDTH_RANGE
+
+SNAKE_LENGTHS = (10, 100, 1000, 10000)
+GRID_SIZES = (10, 20, 40)
+# Минимальное, стандартное и максимальное поле из parse_arguments
+FIELD_SIZES = (
+    (WIDTH_RANGE[0], HEIGHT_RANGE[0]),
+    (800, 600),
+    (WIDTH_RANGE[-1], HEIGHT_RANGE[-1]),
+)
+
+
+class Case:
+    """
+    Один случай бенчмарка.
+
+    Attributes:
+        name (str): Уникальное имя случая с параметрами.
+        params (Dict[str, Any]): Параметры случая.
+        setup (Callable[[], Any]): Готовит состояние перед каждым повтором.
+        op (Callable[[Any], None]): Измеряемая операция.
+        number (int): Операций в одном повторе.
+    """
+
+    def __init__(self, name: str, params: Dict[str, Any],
+                 setup: Callable[[], Any], op: Callable[[Any], None],
+                 number: int):
+        self.name = name
+        self.params = params
+        self.setup = setup
+        self.op = op
+        self.number = number
+
+    def run(self, repeat: int, min_time: float = 0.2) -> Dict[str, Any]:
+        """
+        Измеряет случай.
+
+        Повторы продолжаются, пока их меньше repeat или пока суммарное
+        измеренное время меньше min_time: у коротких случаев один повтор
+        длится микросекунды и слишком шумный.
+
+        Args:
+            repeat (int): Минимальное количество повторов.
+            min_time (float): Минимальное суммарное время замеров в секундах.
+
+        Returns:
+            Dict[str, Any]: Время одной операции и параметры.
+        """
+        timings = []
+        total = 0.0
+        while len(timings) < repeat or total < min_time:
+            state = self.setup()
+            op = self.op
+            start = time.perf_counter()
+            for _ in range(self.number):
+                op(state)
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            timings.append(elapsed / self.number * 1e9)
+
+        return {
+            'params': self.params,
+            'number': self.number,
+            'repeat': len(timings),
+            'median_ns': statistics.median(timings),
+            'min_ns': min(timings),
+        }
+
+
+def make_snake(length: int, grid_size: int, width: int, height: int) -> Snake:
+    """
+    Создает змейку заданной длины, уложенную змейкой по рядам снизу вверх.
+
+    Голова находится в левой клетке верхнего ряда и смотрит вправо, так что
+    перед ней остается свободный путь до края поля.
+
+    Args:
+        length (int): Длина змейки вместе с головой.
+        grid_size (int): Размер клетки.
+        width (int): Ширина поля.
+        height (int): Высота поля.
+
+    Returns:
+        Snake: Змейка.
+
+    Raises:
+        ValueError: Если змейка не помещается на поле.
+    """
+    cols = width // grid_size
+    rows = height // grid_size
+    if length > cols * (rows - 1):
+        raise ValueError("Змейка не помещается на поле")
+
+    cells = []
+    for row in range(rows - 1, 0, -1):
+        line = range(cols) if (rows - 1 - row) % 2 == 0 else range(cols - 1, -1, -1)
+        cells.extend(Cell(col * grid_size, row * grid_size) for col in line)
+    # Тело идет от шеи к хвосту, поэтому берем конец обхода и разворачиваем
+    body = cells[:length - 1][::-1]
+
+    snake = Snake(0, 0, grid_size, length=1,
+                  field_width=width, field_height=height)
+    snake.body.extend(body)
+    snake.rebuild_occupancy()
+    return snake
+
+
+def clone_snake(snake: Snake) -> Snake:
+    """
+    Быстро копирует змейку вместе с телом и сеткой занятости.
+
+    Args:
+        snake (Snake): Исходная змейка.
+
+    Returns:
+        Snake: Независимая копия.
+    """
+    clone = copy.copy(snake)
+    clone.body = snake.body.copy()
+    clone.occupancy = bytearray(snake.occupancy)
+    return clone
+
+
+def _fits(length: int, grid_size: int, width: int, height: int) -> bool:
+    return length <= (width // grid_size) * (height // grid_size - 1)
+
+
+def simulation_cases(lengths=SNAKE_LENGTHS, grid_sizes=GRID_SIZES) -> List[Case]:
+    """
+    Возвращает микробенчмарки змейки и яблока.
+
+    Змейки строятся на самом большом допустимом поле; сочетания длины и
+    сетки, при которых змейка не помещается, пропускаются.
+    """
+    width, height = FIELD_SIZES[-1]
+    cases = []
+    for grid_size in grid_sizes:
+        for length in lengths:
+            if not _fits(length, grid_size, width, height):
+                continue
+            params = {'length': length, 'grid_size': grid_size,
+                      'width': width, 'height': height}
+            suffix = f'[length={length},grid={grid_size}]'
+
+            snake = make_snake(length, grid_size, width, height)
+            free = FreeCellIndex(len(snake.occupancy))
+            for index, count in enumerate(snake.occupancy):
+                if count:
+                    free.remove(index)
+
+            # Голова идет по пустому верхнему ряду и не выходит за поле
+            cases.append(Case(
+                'snake.move' + suffix, params,
+                lambda snake=snake: clone_snake(snake),
+                Snake.move, number=width // grid_size - 1
+            ))
+            # Эти операции не меняют состояние, его можно не пересоздавать
+            cases.append(Case(
+                'snake.check_self_collision' + suffix, params,
+                lambda snake=snake: snake,
+                Snake.check_self_collision, number=1000
+            ))
+            cases.append(Case(
+                'apple.respawn' + suffix, params,
+                lambda free=free: (Apple(0, 0, grid_size), free, random.Random(0)),
+                lambda state, grid_size=grid_size: state[0].respawn(
+                    width, height, grid_size, free_cells=state[1], rng=state[2]
+                ),
+                number=1000
+            ))
+    return cases
+
+
+def autopilot_cases(field_size=(1000, 740), grid_size: int = 20,
+                    ticks: int = 2000) -> List[Case]:
+    """
+    Возвращает замер игры автопилота: выбор хода вместе с шагом игры.
+
+    Игра идет с фиксированным зерном и длится дольше ticks шагов, так что
+    в замер попадают и построение поля расстояний после каждого яблока,
+    и ходы по уже построенному полю.
+    """
+    width, height = field_size
+
+    def setup():
+        simulation = Simulation(width, height, grid_size, seed=0)
+        return simulation, Autopilot.for_simulation(simulation)
+
+    def op(state):
+        simulation, pilot = state
+        simulation.step(pilot.choose(simulation))
+
+    params = {'width': width, 'height': height, 'grid_size': grid_size}
+    return [Case(f'autopilot.step[{width}x{height},grid={grid_size}]',
+                 params, setup, op, number=ticks)]
+
+
+def arena_cases(field_size=(4000, 3000), grid_size: int = 20,
+                snake_counts=(25, 100, 400), ticks: int = 200) -> List[Case]:
+    """
+    Возвращает замеры шага арены с ботами для разного числа змеек.
+
+    Время на змейку должно оставаться примерно постоянным: столкновения
+    проверяются по общей сетке, а не попарно между змейками. В замер
+    входят ходы ботов и появление погибших.
+    """
+    width, height = field_size
+    cases = []
+    for count in snake_counts:
+        def setup(count=count):
+            arena = Arena(width, height, grid_size, apples=count // 4 + 1, seed=0)
+            for snake_id in range(count):
+                arena.add_snake(snake_id)
+            return arena, count
+
+        def op(state):
+            arena, count = state
+            arena.step({snake_id: arena.steer(snake_id) for snake_id in arena.snakes})
+            for snake_id in range(count):
+                if snake_id not in arena.snakes:
+                    arena.add_snake(snake_id)
+
+        params = {'width': width, 'height': height, 'grid_size': grid_size,
+                  'snakes': count}
+        cases.append(Case(f'arena.step[{width}x{height},grid={grid_size},snakes={count}]',
+                          params, setup, op, number=ticks))
+    return cases
+
+
+def env_cases(field_size=(800, 600), grid_size: int = 40,
+              steps: int = 2000) -> List[Case]:
+    """
+    Возвращает замер шага среды обучения со случайными действиями.
+
+    В замер входят и перезапуски эпизодов: случайная змейка быстро
+    погибает, и обучение проводит в reset заметную долю времени.
+    """
+    width, height = field_size
+
+    def setup():
+        env = SnakeEnv(width, height, grid_size)
+        env.reset(seed=0)
+        rng = random.Random(0)
+        return env, [rng.randrange(env.action_count) for _ in range(steps)], [0]
+
+    def op(state):
+        env, actions, position = state
+        done = env.step(actions[position[0]])[2]
+        position[0] += 1
+        if done:
+            env.reset()
+
+    params = {'width': width, 'height': height, 'grid_size': grid_size}
+    return [Case(f'env.step[{width}x{height},grid={grid_size}]',
+                 params, setup, op, number=steps)]
+
+
+def hamiltonian_cases(field_size=(600, 400), grid_size: int = 20) -> List[Case]:
+    """
+    Возвращает замер полной игры решателя на гамильтоновом цикле.
+
+    Решатель заполняет все поле, поэтому одна операция - игра до победы:
+    к концу змейка занимает все клетки, и в замер попадают все проходы
+    по ее телу за шаг.
+    """
+    width, height = field_size
+
+    def setup():
+        simulation = Simulation(width, height, grid_size, seed=0)
+        return simulation, HamiltonianSolver.for_simulation(simulation)
+
+    def op(state):
+        simulation, solver = state
+        while not simulation.game_over:
+            simulation.step(solver.choose(simulation))
+
+    params = {'width': width, 'height': height, 'grid_size': grid_size}
+    return [Case(f'hamiltonian.fill[{width}x{height},grid={grid_size}]',
+                 params, setup, op, number=1)]
+
+
+def _engine_setup(width: int, height: int, grid_size: int,
+                  viewport: Optional[Tuple[int, int]] = None
+                  ) -> Callable[[], GameEngine]:
+    """
+    Возвращает функцию подготовки движка для повтора.
+
+    Движок создается один раз, а перед каждым повтором в нем начинается
+    новая игра: создание окна и поверхностей не должно попадать в замеры
+    и занимать большую часть времени прогона.
+    """
+    engines = []
+
+    def setup() -> GameEngine:
+        if not engines:
+            engines.append(GameEngine(
+                width=width, height=height, grid_size=grid_size,
+                snake_speed=10, fullscreen=False, results_path=':memory:',
+                legacy_results_path=None, viewport=viewport
+            ))
+        engine = engines[0]
+        engine._init_game()
+        engine.draw()
+        return engine
+
+    return setup
+
+
+def _huge_simulation_setup(size: int, grid_size: int
+                           ) -> Callable[[], Tuple[Simulation, Iterator[int]]]:
+    """
+    Возвращает функцию подготовки симуляции на большом поле.
+
+    Новая игра на большом поле дорогая, поэтому она одна на все повторы,
+    а змейка кружит по квадрату и не разбивается.
+    """
+    simulations = []
+
+    def setup() -> Tuple[Simulation, Iterator[int]]:
+        if not simulations:
+            simulations.append((Simulation(size, size, grid_size, seed=0),
+                                itertools.count()))
+        return simulations[0]
+
+    return setup
+
+
+def _full_draw(engine: GameEngine) -> None:
+    engine._full_redraw = True
+    engine.draw()
+
+
+def _frame(engine: GameEngine) -> None:
+    engine.update(engine.scheduler.interval)
+    engine.draw()
+
+
+# Вправо, вниз, влево, вверх: номера направлений Simulation.ACTIONS
+_SQUARE = (3, 1, 2, 0)
+
+
+def _square_step(state: Tuple[Simulation, Iterator[int]]) -> None:
+    simulation, ticks = state
+    simulation.step(Simulation.ACTIONS[_SQUARE[next(ticks) // 4 % 4]])
+
+
+def camera_cases(side_cells=(100, 1000), grid_size: int = 40,
+                 viewport=(800, 600), steps: int = 40) -> List[Case]:
+    """
+    Возвращает замеры шага и кадра на квадратных полях с камерой.
+
+    Время не должно зависеть от стороны поля: шаг меняет несколько клеток,
+    а кадр рисует только видимые куски и перерисовывает те из них, где
+    что-то изменилось.
+    """
+    cases = []
+    for side in side_cells:
+        size = side * grid_size
+        params = {'cells': side, 'grid_size': grid_size,
+                  'viewport': list(viewport)}
+        suffix = f'[{side}x{side},grid={grid_size}]'
+
+        cases.append(Case('simulation.step_huge' + suffix, params,
+                          _huge_simulation_setup(size, grid_size),
+                          _square_step, number=1000))
+        cases.append(Case('camera.frame' + suffix, params,
+                          _engine_setup(size, size, grid_size, viewport), _frame,
+                          number=steps))
+    return cases
+
+
+def engine_cases(field_sizes=FIELD_SIZES, grid_sizes=GRID_SIZES) -> List[Case]:
+    """
+    Возвращает бенчмарки игрового движка и лаунчера.
+
+    Каждый повтор начинается с новой игры; число шагов в повторе меньше
+    расстояния от головы до стены, чтобы игра не заканчивалась.
+    """
+    cases = []
+    for width, height in field_sizes:
+        for grid_size in grid_sizes:
+            params = {'width': width, 'height': height, 'grid_size': grid_size}
+            suffix = f'[field={width}x{height},grid={grid_size}]'
+            steps = max(1, width // grid_size // 2 - 2)
+
+            setup = _engine_setup(width, height, grid_size)
+            cases.append(Case(
+                'engine.update' + suffix, params, setup,
+                lambda engine: engine.update(engine.scheduler.interval),
+                number=steps
+            ))
+            cases.append(Case(
+                'engine.draw_full' + suffix, params, setup,
+                _full_draw, number=20
+            ))
+            cases.append(Case(
+                'engine.frame' + suffix, params, setup, _frame, number=steps
+            ))
+
+    launchers = []
+
+    def launcher_setup() -> GameLauncher:
+        if not launchers:
+            launchers.append(GameLauncher())
+        return launchers[0]
+
+    cases.append(Case('launcher.draw', {}, launcher_setup,
+                      GameLauncher.draw, number=20))
+    return cases
+
+
+def run(cases: List[Case], repeat: int, pattern: str = None,
+        log=None, min_time: float = 0.2) -> Dict[str, Any]:
+    """
+    Выполняет бенчмарки.
+
+    Args:
+        cases (List[Case]): Случаи.
+        repeat (int): Количество повторов каждого случая.
+        pattern (str): Подстрока имени; остальные случаи пропускаются.
+        log: Файл для вывода прогресса или None.
+        min_time (float): Минимальное время замеров одного случая в секундах.
+
+    Returns:
+        Dict[str, Any]: Описание окружения и результаты по именам случаев.
+    """
+    results = {}
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        results[case.name] = case.run(repeat, min_time)
+        if log is not None:
+            print(f"{case.name:60s} {results[case.name]['median_ns']:14.0f} нс",
+                  file=log)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Сравнивает результаты с базовыми.
+
+    Сравнивается минимальное время повтора: оно меньше всего зависит от
+    фоновой нагрузки на машину.
+
+    Args:
+        current (Dict[str, Any]): Результат run.
+        baseline (Dict[str, Any]): Сохраненный ранее результат run.
+        threshold (float): Допустимое относительное замедление.
+
+    Returns:
+        List[Dict[str, Any]]: Строки сравнения для общих случаев с полями
+        name, baseline_ns, current_ns, ratio и regression.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = result['min_ns'] / base['min_ns']
+        rows.append({
+            'name': name,
+            'baseline_ns': base['min_ns'],
+            'current_ns': result['min_ns'],
+            'ratio': ratio,
+            'regression': ratio > 1.0 + threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Returns:
+        int: Код завершения: 1 если найдены регрессии, иначе 0.
+    """
+    parser = argparse.ArgumentParser(description='Бенчмарки игры Змейка')
+    parser.add_argument('--output', help='Куда сохранить результаты в JSON')
+    parser.add_argument('--compare', help='Базовый JSON для сравнения')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Допустимое замедление (по умолчанию: 0.1 = 10%%)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Минимум повторов каждого случая (по умолчанию: 5)')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='Минимум секунд замеров на случай (по умолчанию: 0.2)')
+    parser.add_argument('--filter', dest='pattern',
+                        help='Запускать только случаи с этой подстрокой')
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    try:
+        report = run(simulation_cases() + autopilot_cases() + hamiltonian_cases()
+                     + env_cases() + arena_cases() + camera_cases()
+                     + engine_cases(), args.repeat,
+                     args.pattern, log=sys.stderr, min_time=args.min_time)
+    finally:
+        pygame.quit()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    for row in compare(report, baseline, args.threshold):
+        mark = 'РЕГРЕССИЯ' if row['regression'] else ''
+        print(f"{row['name']:60s} {row['ratio']:6.2f}x {mark}", file=sys.stderr)
+        regressions += row['regression']
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Оценка бота на множестве игр без окна.
+
+Игры идут параллельно, по процессу на ядро; сводная статистика выводится
+по мере готовности и целиком в конце.
+
+Примеры использования:
+    python evaluate.py --игры 10000
+    python evaluate.py --games 2000 --width 400-1200 --height 300-900 --pilot cycle
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+# Добавляем папку game в путь для импорта
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game.evaluation import EvaluationConfig, EvaluationStats, PILOTS, run_evaluation
+
+
+def parse_range(text: str) -> Tuple[int, int]:
+    """
+    Разбирает диапазон вида "400-2000" или одно число.
+
+    Args:
+        text (str): Строка аргумента.
+
+    Returns:
+        Tuple[int, int]: Границы диапазона включительно.
+
+    Raises:
+        argparse.ArgumentTypeError: Если строка не число и не диапазон.
+    """
+    low, _, high = text.partition('-')
+    try:
+        low = int(low)
+        high = int(high) if high else low
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается число или диапазон МИН-МАКС: {text}")
+    return low, high
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Парсит аргументы командной строки.
+
+    Args:
+        argv (Optional[List[str]]): Аргументы; по умолчанию sys.argv.
+
+    Returns:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description='Оценка бота на множестве игр')
+    parser.add_argument('--игры', '--games', dest='games', type=int, default=1000,
+                        help='Количество игр (по умолчанию: 1000)')
+    parser.add_argument('--зерно', '--seed', dest='seed', type=int, default=0,
+                        help='Зерно прогона (по умолчанию: 0)')
+    parser.add_argument('--ширина', '--width', dest='width', type=parse_range,
+                        default=(800, 800),
+                        help='Ширина поля или диапазон, например 400-2000 (по умолчанию: 800)')
+    parser.add_argument('--высота', '--height', dest='height', type=parse_range,
+                        default=(600, 600),
+                        help='Высота поля или диапазон (по умолчанию: 600)')
+    parser.add_argument('--сетка', '--grid', dest='grid', type=parse_range,
+                        default=(40, 40),
+                        help='Размер клетки или диапазон (по умолчанию: 40)')
+    parser.add_argument('--скорость', '--speed', dest='speed', type=parse_range,
+                        default=(10, 10),
+                        help='Скорость змейки или диапазон (по умолчанию: 10)')
+    parser.add_argument('--бот', '--pilot', dest='pilot', choices=sorted(PILOTS),
+                        default='path', help='Бот (по умолчанию: path)')
+    parser.add_argument('--процессы', '--workers', dest='workers', type=int,
+                        default=None, help='Количество процессов (по умолчанию: по ядрам)')
+    parser.add_argument('--пачка', '--chunk', dest='chunk_size', type=int,
+                        default=None, help='Игр в одной пачке для процесса')
+    parser.add_argument('--output', default=None,
+                        help='Куда сохранить статистику в JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Запускает прогон и печатает статистику.
+
+    Args:
+        argv (Optional[List[str]]): Аргументы командной строки.
+    """
+    args = parse_arguments(argv)
+    try:
+        config = EvaluationConfig(
+            games=args.games, seed=args.seed, width_range=args.width,
+            height_range=args.height, grid_range=args.grid,
+            speed_range=args.speed, pilot=args.pilot
+        )
+    except ValueError as e:
+        print(f"ОШИБКА: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    start = time.perf_counter()
+
+    def progress(stats: EvaluationStats) -> None:
+        elapsed = time.perf_counter() - start
+        mean = sum(s * n for s, n in stats.scores.items()) / stats.games
+        print(f"\r{stats.games}/{config.games} игр, средний счет {mean:.1f}, "
+              f"{stats.games / elapsed:.1f} игр/с", end='', file=sys.stderr)
+
+    stats = run_evaluation(config, workers=args.workers,
+                           chunk_size=args.chunk_size, on_progress=progress)
+    print(file=sys.stderr)
+
+    summary = stats.summary()
+    summary['seconds'] = time.perf_counter() - start
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    score = summary['score']
+    print("=" * 60)
+    print(f"Игр: {summary['games']} за {summary['seconds']:.1f} с")
+    print("Исходы: " + ", ".join(f"{k} {v}" for k, v in sorted(summary['outcomes'].items())))
+    print(f"Счет: средний {score['mean']:.1f}, min {score['min']}, "
+          f"p25 {score['p25']}, медиана {score['median']}, "
+          f"p75 {score['p75']}, max {score['max']}")
+    print(f"Средняя длина: {summary['mean_length']:.1f}, "
+          f"средняя игра: {summary['mean_ticks']:.0f} шагов "
+          f"({summary['mean_game_seconds']:.1f} с при своей скорости)")
+    for pid, rate in summary['ticks_per_second'].items():
+        print(f"  процесс {pid}: {rate:.0f} шагов/с")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@
 import random
 from typing import Tuple
 from .base import GameObject
+from .free_cells import FreeCellIndex
 
 
 class Apple(GameObject):
@@ -15,6 +16,8 @@ class Apple(GameObject):
         value (int): Количество очков за съедение.
     """
 
+    __slots__ = ('value',)
+
     def __init__(self, x: int, y: int, size: int = 20,
                  color: Tuple[int, int, int] = (255, 50, 50),
                  value: int = 1):
@@ -35,7 +38,9 @@ class Apple(GameObject):
     def create_random(cls, max_x: int, max_y: int, size: int = 20,
                       grid_size: int = 20,
                       color: Tuple[int, int, int] = None,
-                      value: int = 1) -> 'Apple':
+                      value: int = 1,
+                      free_cells: FreeCellIndex = None,
+                      rng: random.Random = None) -> 'Apple':
         """
         Создает яблоко в случайной позиции.
 
@@ -46,20 +51,36 @@ class Apple(GameObject):
             grid_size (int): Размер сетки для выравнивания.
             color (Tuple[int, int, int]): Цвет яблока.
             value (int): Количество очков.
+            free_cells (FreeCellIndex): Свободные клетки; если задан,
+                яблоко появляется только в одной из них.
+            rng (random.Random): Генератор случайных чисел; по умолчанию
+                общий модуль random.
 
         Returns:
             Apple: Созданное яблоко.
+
+        Raises:
+            IndexError: Если свободных клеток нет.
         """
         if color is None:
             color = (255, 50, 50)
+        if rng is None:
+            rng = random
 
         cols = max_x // grid_size
         rows = max_y // grid_size
-        x = random.randint(0, cols - 1) * grid_size
-        y = random.randint(0, rows - 1) * grid_size
+        if free_cells is not None:
+            index = free_cells.sample(rng)
+            x = (index % cols) * grid_size
+            y = (index // cols) * grid_size
+        else:
+            x = rng.randint(0, cols - 1) * grid_size
+            y = rng.randint(0, rows - 1) * grid_size
         return cls(x, y, size, color, value)
 
-    def respawn(self, max_x: int, max_y: int, grid_size: int = 20) -> None:
+    def respawn(self, max_x: int, max_y: int, grid_size: int = 20,
+                free_cells: FreeCellIndex = None,
+                rng: random.Random = None) -> bool:
         """
         Перемещает яблоко в новую случайную позицию.
 
@@ -67,8 +88,26 @@ class Apple(GameObject):
             max_x (int): Максимальная координата X.
             max_y (int): Максимальная координата Y.
             grid_size (int): Размер сетки.
+            free_cells (FreeCellIndex): Свободные клетки; если задан,
+                яблоко появляется только в одной из них.
+            rng (random.Random): Генератор случайных чисел; по умолчанию
+                общий модуль random.
+
+        Returns:
+            bool: False если свободных клеток не осталось, иначе True.
         """
+        if rng is None:
+            rng = random
+
         cols = max_x // grid_size
         rows = max_y // grid_size
-        self.x = random.randint(0, cols - 1) * grid_size
-        self.y = random.randint(0, rows - 1) * grid_size
\ No newline at end of file
+        if free_cells is not None:
+            if not free_cells:
+                return False
+            index = free_cells.sample(rng)
+            self.x = (index % cols) * grid_size
+            self.y = (index // cols) * grid_size
+        else:
+            self.x = rng.randint(0, cols - 1) * grid_size
+            self.y = rng.randint(0, rows - 1) * grid_size
+        return True
\ No newline at end of file
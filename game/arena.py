@@ -0,0 +1,259 @@
+"""
+Несколько змеек на одном поле.
+
+Правила те же, что в :class:`game.simulation.Simulation`: змейка гибнет
+от стены и от собственного тела, а еще от тела или головы чужой змейки.
+Яблоки хранятся номерами клеток ``row * cols + col``.
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+from .simulation import Simulation
+from .snake import Snake
+
+
+class Arena:
+    """
+    Поле с несколькими змейками и яблоками.
+
+    Все змейки делают шаг одновременно: сначала двигаются все, потом
+    проверяются столкновения, поэтому голова может войти в клетку, которую
+    на этом же шаге покинул чужой хвост. При встрече голов гибнут обе.
+
+    Столкновения проверяются по общей сетке занятости: в ней для каждой
+    клетки хранится, сколько сегментов всех змеек ее занимают. Своей сетки
+    у змеек арены нет, они меняют общую, поэтому появление змейки стоит
+    O(ее длины). Шаг змейки меняет в сетке две клетки, голову и хвост, а голова гибнет, если в ее
+    клетке больше одного сегмента - своего, чужого или чужой головы.
+    Поэтому шаг стоит O(количества змеек) независимо от их длины; клетки
+    змейки обходятся только при ее гибели.
+
+    Attributes:
+        cols (int): Количество клеток по горизонтали.
+        rows (int): Количество клеток по вертикали.
+        grid_size (int): Размер клетки.
+        snakes (Dict[int, Snake]): Живые змейки по номерам.
+        occupancy (bytearray): Сегменты всех змеек в каждой клетке.
+        apples (List[int]): Клетки яблок.
+        moved_apples (List[Tuple[int, int]]): Яблоки, переставленные на
+            последнем шаге: (номер, клетка).
+        rng (random.Random): Генератор арены.
+        ticks (int): Количество выполненных шагов.
+    """
+
+    # Длина новой змейки
+    START_LENGTH = 3
+
+    def __init__(self, width: int = 800, height: int = 600,
+                 grid_size: int = 40, apples: int = 1, seed: int = None):
+        """
+        Создает пустую арену.
+
+        Args:
+            width (int): Ширина поля.
+            height (int): Высота поля.
+            grid_size (int): Размер клетки.
+            apples (int): Количество яблок на поле.
+            seed (int): Зерно генератора.
+        """
+        self.grid_size = grid_size
+        self.cols = width // grid_size
+        self.rows = height // grid_size
+        self.rng = random.Random(seed)
+        self.snakes: Dict[int, Snake] = {}
+        self.occupancy = bytearray(self.cols * self.rows)
+        self.ticks = 0
+
+        # Номер яблока по клетке, чтобы проверка головы не обходила список
+        self._apple_slots: Dict[int, int] = {}
+        self.apples: List[int] = []
+        for slot in range(apples):
+            self.apples.append(-1)
+            self._place_apple(slot)
+        self.moved_apples: List[Tuple[int, int]] = []
+
+        # Яблоко, к которому идет каждый бот
+        self._targets: Dict[int, int] = {}
+
+    def add_snake(self, snake_id: int) -> Optional[Snake]:
+        """
+        Ставит новую змейку в свободное место, головой вправо.
+
+        Args:
+            snake_id (int): Номер змейки.
+
+        Returns:
+            Optional[Snake]: Змейка или None, если места не нашлось.
+        """
+        length = self.START_LENGTH
+        size = self.grid_size
+        if self.cols < length + 2:
+            return None
+        # Тело слева от головы и две свободные клетки впереди
+        for _ in range(100):
+            col = self.rng.randrange(length - 1, self.cols - 2)
+            row = self.rng.randrange(self.rows)
+            if all(self._is_free(row * self.cols + c)
+                   for c in range(col - length + 1, col + 3)):
+                break
+        else:
+            return None
+
+        # Змейка сразу занимает свои клетки в общей сетке
+        snake = Snake(col * size, row * size, size=size, length=length,
+                      field_width=self.cols * size, field_height=self.rows * size,
+                      occupancy=self.occupancy)
+        self.snakes[snake_id] = snake
+        return snake
+
+    def remove_snake(self, snake_id: int) -> None:
+        """
+        Убирает змейку с поля.
+
+        Args:
+            snake_id (int): Номер змейки.
+        """
+        snake = self.snakes.pop(snake_id, None)
+        if snake is not None:
+            self._vacate(snake)
+        self._targets.pop(snake_id, None)
+
+    def step(self, directions: Dict[int, Tuple[int, int]] = None
+             ) -> List[Tuple[int, int, bool, bool]]:
+        """
+        Выполняет один шаг всех змеек.
+
+        Args:
+            directions (Dict[int, Tuple[int, int]]): Новые направления по
+                номерам змеек; остальные змейки сохраняют направление.
+
+        Returns:
+            List[Tuple[int, int, bool, bool]]: Для каждой змейки в порядке
+            номеров: номер, индекс направления в Simulation.ACTIONS, выросла
+            ли она (хвост остался на месте) и погибла ли.
+        """
+        self.ticks += 1
+        self.moved_apples = []
+        occupancy = self.occupancy
+        order = sorted(self.snakes)
+        snakes = [self.snakes[i] for i in order]
+
+        heads = []
+        grew = []
+        for snake_id, snake in zip(order, snakes):
+            if directions and snake_id in directions:
+                snake.set_direction(directions[snake_id])
+            # Змейка сама переносит голову и хвост в общей сетке
+            tail = snake.move()
+            heads.append(snake.cell_index(snake.x, snake.y))
+            grew.append(tail is None)
+
+        # Все змейки уже сдвинулись, в клетке живой головы только она сама
+        events = []
+        for snake_id, snake, head, grown in zip(order, snakes, heads, grew):
+            died = head < 0 or occupancy[head] > 1
+            events.append((snake_id, Simulation.ACTIONS.index(snake.direction),
+                           grown, died))
+
+        for (snake_id, _, _, died), head in zip(events, heads):
+            if died:
+                self.remove_snake(snake_id)
+            elif head in self._apple_slots:
+                self.snakes[snake_id].grow()
+                slot = self._apple_slots.pop(head)
+                self._place_apple(slot)
+                self.moved_apples.append((slot, self.apples[slot]))
+
+        return events
+
+    def steer(self, snake_id: int) -> Tuple[int, int]:
+        """
+        Выбирает направление бота: к своему яблоку по свободным клеткам.
+
+        Бот запоминает ближайшее яблоко и ищет новое только после того, как
+        его яблоко переставили, так что ход обходится в O(1), кроме шагов
+        после съеденного яблока.
+
+        Args:
+            snake_id (int): Номер змейки.
+
+        Returns:
+            Tuple[int, int]: Направление (dx, dy).
+        """
+        snake = self.snakes[snake_id]
+        cols = self.cols
+        head = snake.cell_index(snake.x, snake.y)
+        col, row = head % cols, head // cols
+
+        target = self._targets.get(snake_id, -1)
+        if target not in self._apple_slots:
+            target = min(self._apple_slots, default=-1,
+                         key=lambda cell: abs(cell % cols - col) + abs(cell // cols - row))
+            self._targets[snake_id] = target
+
+        best = snake.direction
+        best_distance = None
+        back = (-snake.direction[0], -snake.direction[1])
+        for dx, dy in Simulation.ACTIONS:
+            x, y = col + dx, row + dy
+            if (dx, dy) == back or not (0 <= x < cols and 0 <= y < self.rows):
+                continue
+            if self.occupancy[y * cols + x]:
+                continue
+            distance = 0
+            if target >= 0:
+                distance = abs(target % cols - x) + abs(target // cols - y)
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (dx, dy), distance
+        return best
+
+    def body_cells(self, snake_id: int) -> List[int]:
+        """
+        Возвращает клетки змейки от головы к хвосту.
+
+        Args:
+            snake_id (int): Номер змейки.
+
+        Returns:
+            List[int]: Номера клеток.
+        """
+        snake = self.snakes[snake_id]
+        cells = [snake.cell_index(snake.x, snake.y)]
+        cells.extend(snake.body.indices())
+        return cells
+
+    def _vacate(self, snake: Snake) -> None:
+        """Убирает все клетки змейки из общей сетки."""
+        occupancy = self.occupancy
+        head = snake.cell_index(snake.x, snake.y)
+        if head >= 0:
+            occupancy[head] -= 1
+        for index in snake.body.indices():
+            occupancy[index] -= 1
+
+    def _place_apple(self, slot: int) -> None:
+        """Ставит яблоко с номером slot в случайную свободную клетку."""
+        cell = self._random_free_cell()
+        self.apples[slot] = cell
+        if cell >= 0:
+            self._apple_slots[cell] = slot
+
+    def _is_free(self, cell: int) -> bool:
+        """Проверяет, что в клетке нет змеек и яблок."""
+        return not self.occupancy[cell] and cell not in self._apple_slots
+
+    def _random_free_cell(self) -> int:
+        """
+        Выбирает случайную свободную клетку.
+
+        Returns:
+            int: Номер клетки или -1, если свободных клеток нет.
+        """
+        num_cells = self.cols * self.rows
+        for _ in range(32):
+            cell = self.rng.randrange(num_cells)
+            if self._is_free(cell):
+                return cell
+        # Поле почти заполнено, выбираем из полного списка
+        free = [cell for cell in range(num_cells) if self._is_free(cell)]
+        return self.rng.choice(free) if free else -1
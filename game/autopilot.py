@@ -0,0 +1,338 @@
+"""
+Автопилот для игры без участия человека.
+"""
+
+from array import array
+from typing import List, Optional, Tuple
+from .simulation import Simulation
+from .snake import Snake
+
+
+class Autopilot:
+    """
+    Выбирает направление змейки по кратчайшему пути до яблока.
+
+    Поле расстояний до яблока считается поиском в ширину по плоским
+    массивам с индексом клетки ``row * cols + col``, как в сетке
+    занятости змейки. Пока яблоко на месте, поле переиспользуется: голова
+    идет по убыванию расстояния, и клетки, которые она оставляет за собой,
+    на пути к яблоку больше не встречаются. Поле пересчитывается, когда
+    яблоко сдвинулось или ни один ход не ведет к нему по старому полю.
+
+    Если яблоко недостижимо, змейка уходит в соседнюю клетку с самой
+    большой достижимой областью, чтобы дождаться, пока хвост освободит
+    проход.
+
+    На поле с единичной ценой шага поиск в ширину дает те же пути, что и
+    A*, но одно поле расстояний обслуживает все ходы до следующего яблока.
+
+    Attributes:
+        cols (int): Количество клеток поля по горизонтали.
+        rows (int): Количество клеток поля по вертикали.
+        recomputed (int): Сколько раз строилось поле расстояний.
+    """
+
+    def __init__(self, cols: int, rows: int):
+        """
+        Создает автопилот для поля заданного размера.
+
+        Args:
+            cols (int): Количество клеток по горизонтали.
+            rows (int): Количество клеток по вертикали.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.recomputed = 0
+
+        num_cells = cols * rows
+        self._unreached = array('i', [-1]) * num_cells
+        self._dist = array('i', self._unreached)
+        self._region = array('i', self._unreached)
+        self._queue = array('i', bytes(4 * num_cells))
+        # Клетка яблока, для которой построено поле, или -1
+        self._target = -1
+        # Шаг, раньше которого недостижимое яблоко не стоит искать заново
+        self._retry_tick = 0
+
+    @classmethod
+    def for_simulation(cls, simulation: Simulation) -> 'Autopilot':
+        """
+        Создает автопилот под поле симуляции.
+
+        Args:
+            simulation (Simulation): Игра.
+
+        Returns:
+            Autopilot: Новый автопилот.
+        """
+        return cls(simulation.snake.cols, simulation.snake.rows)
+
+    def choose(self, simulation: Simulation) -> Tuple[int, int]:
+        """
+        Выбирает направление на следующий шаг.
+
+        Args:
+            simulation (Simulation): Игра, для которой выбирается ход.
+
+        Returns:
+            Tuple[int, int]: Направление (dx, dy) для Snake.set_direction.
+        """
+        snake = simulation.snake
+        head = snake.cell_index(snake.x, snake.y)
+        if head < 0:
+            return snake.direction
+
+        moves = self._moves(snake, head)
+        if not moves:
+            # Все соседние клетки заняты, любой ход проигрышный
+            return snake.direction
+
+        apple = snake.cell_index(simulation.apple.x, simulation.apple.y)
+        computed = False
+        if apple != self._target:
+            self._compute_distances(apple, snake.occupancy, moves)
+            computed = True
+
+        direction = self._follow(moves)
+        if (direction is None and not computed
+                and simulation.ticks >= self._retry_tick):
+            # Старое поле не ведет к яблоку, но хвост мог открыть проход
+            self._compute_distances(apple, snake.occupancy, moves)
+            computed = True
+            direction = self._follow(moves)
+        if direction is None:
+            direction = self._largest_region(moves, snake.occupancy)
+            if computed:
+                self._retry_tick = simulation.ticks + self._ticks_until_open(snake)
+        return direction
+
+    def _moves(self, snake: Snake, head: int) -> List[Tuple[Tuple[int, int], int]]:
+        """
+        Возвращает ходы, после которых змейка не погибнет сразу.
+
+        Args:
+            snake (Snake): Змейка.
+            head (int): Индекс клетки головы.
+
+        Returns:
+            List[Tuple[Tuple[int, int], int]]: Пары (направление, клетка),
+            текущее направление первым.
+        """
+        cols = self.cols
+        col, row = head % cols, head // cols
+        occupancy = snake.occupancy
+
+        # Хвост уходит на этом же шаге, если змейка не растет
+        tail = -1
+        if snake.grow_pending == 0 and snake.body:
+            tail = snake.body.index_at(-1)
+
+        back = (-snake.direction[0], -snake.direction[1])
+        moves = []
+        for direction in (snake.direction,) + Simulation.ACTIONS:
+            if direction == back or (moves and direction == moves[0][0]):
+                continue
+            dx, dy = direction
+            x, y = col + dx, row + dy
+            if not (0 <= x < cols and 0 <= y < self.rows):
+                continue
+            index = y * cols + x
+            if occupancy[index] == 0 or (index == tail and occupancy[index] == 1):
+                moves.append((direction, index))
+        return moves
+
+    def _follow(self, moves: List[Tuple[Tuple[int, int], int]]) -> Optional[Tuple[int, int]]:
+        """
+        Выбирает ход к яблоку по полю расстояний.
+
+        Args:
+            moves (List[Tuple[Tuple[int, int], int]]): Допустимые ходы.
+
+        Returns:
+            Optional[Tuple[int, int]]: Направление или None, если ни один
+            ход не ведет к яблоку.
+        """
+        dist = self._dist
+        best = None
+        best_dist = -1
+        for direction, index in moves:
+            d = dist[index]
+            if d >= 0 and (best is None or d < best_dist):
+                best, best_dist = direction, d
+        return best
+
+    def _compute_distances(self, source: int, occupancy: bytearray,
+                           moves: List[Tuple[Tuple[int, int], int]]) -> None:
+        """
+        Строит поле расстояний от клетки яблока по свободным клеткам.
+
+        Поиск останавливается на первой клетке, куда может пойти голова:
+        у нее наименьшее расстояние, а все клетки пути от нее к яблоку
+        уже получили свои расстояния.
+
+        Args:
+            source (int): Клетка яблока.
+            occupancy (bytearray): Сетка занятости змейки.
+            moves (List[Tuple[Tuple[int, int], int]]): Допустимые ходы.
+        """
+        self.recomputed += 1
+        self._target = source
+        dist = self._dist
+        dist[:] = self._unreached
+        if source < 0:
+            return
+
+        goals = {index for _, index in moves}
+        queue = self._queue
+        cols = self.cols
+        last_row = len(dist) - cols
+        dist[source] = 0
+        queue[0] = source
+        head, tail = 0, 1
+        while head < tail:
+            i = queue[head]
+            if i in goals:
+                break
+            head += 1
+            d = dist[i] + 1
+            col = i % cols
+            if col > 0:
+                j = i - 1
+                if dist[j] < 0 and not occupancy[j]:
+                    dist[j] = d
+                    queue[tail] = j
+                    tail += 1
+            if col < cols - 1:
+                j = i + 1
+                if dist[j] < 0 and not occupancy[j]:
+                    dist[j] = d
+                    queue[tail] = j
+                    tail += 1
+            if i >= cols:
+                j = i - cols
+                if dist[j] < 0 and not occupancy[j]:
+                    dist[j] = d
+                    queue[tail] = j
+                    tail += 1
+            if i < last_row:
+                j = i + cols
+                if dist[j] < 0 and not occupancy[j]:
+                    dist[j] = d
+                    queue[tail] = j
+                    tail += 1
+
+    def _ticks_until_open(self, snake: Snake) -> int:
+        """
+        Оценивает, через сколько шагов может открыться проход к яблоку.
+
+        После неудачного поиска область яблока и область головы разделены
+        телом змейки. Голова эти области только сужает, а соединить их
+        может лишь ушедший хвост, поэтому пока не ушли сегменты на границе
+        обеих областей, повторный поиск ничего не даст. Вызывается после
+        _largest_region, когда помечена область головы.
+
+        Args:
+            snake (Snake): Змейка.
+
+        Returns:
+            int: Количество шагов, не меньше одного.
+        """
+        cols = self.cols
+        last_row = len(self._dist) - cols
+        dist = self._dist
+        region = self._region
+        apple_side = head_side = 0
+
+        # Сегмент, k-й от хвоста, уходит не раньше чем через k шагов
+        for k, i in enumerate(snake.body.indices(reverse=True), start=1):
+            col = i % cols
+            near_apple = near_head = False
+            for j, inside in ((i - 1, col > 0), (i + 1, col < cols - 1),
+                              (i - cols, i >= cols), (i + cols, i < last_row)):
+                if inside:
+                    near_apple = near_apple or dist[j] >= 0
+                    near_head = near_head or region[j] >= 0
+            if near_apple and not apple_side:
+                apple_side = k
+            if near_head and not head_side:
+                head_side = k
+            if apple_side and head_side:
+                return max(apple_side, head_side)
+        return 1
+
+    def _largest_region(self, moves: List[Tuple[Tuple[int, int], int]],
+                        occupancy: bytearray) -> Tuple[int, int]:
+        """
+        Выбирает ход в самую большую достижимую область.
+
+        Клетки каждой области помечаются один раз, поэтому ходы в одну
+        область не обходят ее повторно.
+
+        Args:
+            moves (List[Tuple[Tuple[int, int], int]]): Допустимые ходы.
+            occupancy (bytearray): Сетка занятости змейки.
+
+        Returns:
+            Tuple[int, int]: Направление.
+        """
+        region = self._region
+        region[:] = self._unreached
+        sizes = []
+        best, best_size = moves[0][0], -1
+        for direction, index in moves:
+            label = region[index]
+            if label < 0:
+                label = len(sizes)
+                sizes.append(self._fill(index, label, occupancy))
+            if sizes[label] > best_size:
+                best, best_size = direction, sizes[label]
+        return best
+
+    def _fill(self, start: int, label: int, occupancy: bytearray) -> int:
+        """
+        Помечает область свободных клеток, связанную с клеткой.
+
+        Args:
+            start (int): Начальная клетка; может быть хвостом змейки.
+            label (int): Метка области.
+            occupancy (bytearray): Сетка занятости змейки.
+
+        Returns:
+            int: Количество клеток в области.
+        """
+        region = self._region
+        queue = self._queue
+        cols = self.cols
+        last_row = len(region) - cols
+        region[start] = label
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            i = queue[head]
+            head += 1
+            col = i % cols
+            if col > 0:
+                j = i - 1
+                if region[j] < 0 and not occupancy[j]:
+                    region[j] = label
+                    queue[tail] = j
+                    tail += 1
+            if col < cols - 1:
+                j = i + 1
+                if region[j] < 0 and not occupancy[j]:
+                    region[j] = label
+                    queue[tail] = j
+                    tail += 1
+            if i >= cols:
+                j = i - cols
+                if region[j] < 0 and not occupancy[j]:
+                    region[j] = label
+                    queue[tail] = j
+                    tail += 1
+            if i < last_row:
+                j = i + cols
+                if region[j] < 0 and not occupancy[j]:
+                    region[j] = label
+                    queue[tail] = j
+                    tail += 1
+        return tail
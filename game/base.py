@@ -3,7 +3,20 @@
 """
 
 import pygame
-from typing import Tuple
+from typing import NamedTuple, Tuple
+
+
+class Cell(NamedTuple):
+    """
+    Клетка поля, занятая сегментом.
+
+    Attributes:
+        x (int): Координата X левого верхнего угла.
+        y (int): Координата Y левого верхнего угла.
+    """
+
+    x: int
+    y: int
 
 
 class GameObject:
@@ -18,6 +31,9 @@ class GameObject:
         color (Tuple[int, int, int]): Цвет объекта в формате RGB.
     """
 
+    # Без __dict__ у каждого объекта; наследники добавляют свои поля
+    __slots__ = ('x', 'y', 'width', 'height', 'color')
+
     def __init__(self, x: int, y: int, width: int, height: int,
                  color: Tuple[int, int, int] = (255, 255, 255)):
         """
@@ -46,14 +62,16 @@ class GameObject:
         """
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """
         Отрисовывает объект на поверхности.
 
         Args:
             surface (pygame.Surface): Поверхность для отрисовки.
+            offset (Tuple[int, int]): Точка поля, которая приходится на
+                левый верхний угол поверхности.
         """
-        pygame.draw.rect(surface, self.color, self.rect)
+        pygame.draw.rect(surface, self.color, self.rect.move(-offset[0], -offset[1]))
 
     def move(self, dx: int, dy: int) -> None:
         """
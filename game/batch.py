@@ -0,0 +1,225 @@
+"""
+Пакетная симуляция: N независимых игр в массивах NumPy.
+
+Все игры двигаются одновременно за один вызов ``step``. Правила совпадают
+с :class:`game.simulation.Simulation`, но вместо объектов ``GameObject``
+состояние хранится в плоских массивах клеток.
+"""
+
+from typing import Optional, Sequence, Union
+import numpy as np
+
+
+class BatchSimulation:
+    """
+    Пакет игр, которые продвигаются синхронно.
+
+    Клетка поля кодируется числом ``y * cols + x``. Тело каждой змейки
+    лежит в кольцевом буфере ``body``: голова в позиции ``head_ptr``,
+    хвост на ``length - 1`` позиций раньше.
+
+    Attributes:
+        num_games (int): Количество игр.
+        cols (int): Количество клеток по горизонтали.
+        rows (int): Количество клеток по вертикали.
+        body (np.ndarray): Кольцевые буферы тел, форма (N, cols * rows).
+        head_ptr (np.ndarray): Позиция головы в кольцевом буфере.
+        length (np.ndarray): Длина змеек.
+        direction (np.ndarray): Индекс текущего направления в ACTIONS.
+        grow_pending (np.ndarray): Сегменты, ожидающие добавления.
+        occupancy (np.ndarray): Сетки занятости, форма (N, cols * rows).
+        apple (np.ndarray): Клетка яблока.
+        score (np.ndarray): Счет.
+        alive (np.ndarray): Продолжается ли игра.
+        won (np.ndarray): Заполнено ли поле целиком.
+        ticks (np.ndarray): Количество шагов в каждой игре.
+    """
+
+    # Направления в порядке: вверх, вниз, влево, вправо
+    ACTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+    _DX = np.array([dx for dx, _ in ACTIONS], dtype=np.int32)
+    _DY = np.array([dy for _, dy in ACTIONS], dtype=np.int32)
+    _OPPOSITE = np.array([1, 0, 3, 2], dtype=np.int8)
+
+    # Случайных проб на яблоко до перебора всех свободных клеток
+    _APPLE_TRIES = 32
+
+    def __init__(self, num_games: int, cols: int, rows: int,
+                 seed: Optional[int] = None):
+        """
+        Создает пакет игр.
+
+        Args:
+            num_games (int): Количество игр.
+            cols (int): Ширина поля в клетках.
+            rows (int): Высота поля в клетках.
+            seed (Optional[int]): Зерно генератора случайных чисел.
+        """
+        if cols < 4 or rows < 1:
+            raise ValueError("Поле слишком маленькое для змейки длины 3")
+
+        self.num_games = num_games
+        self.cols = cols
+        self.rows = rows
+        self.num_cells = cols * rows
+        self.rng = np.random.default_rng(seed)
+
+        n = num_games
+        self.body = np.zeros((n, self.num_cells), dtype=np.int32)
+        self.occupancy = np.zeros((n, self.num_cells), dtype=np.uint8)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int8)
+        self.grow_pending = np.zeros(n, dtype=np.int64)
+        self.apple = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.alive = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self.ticks = np.zeros(n, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, games: Union[None, Sequence[int], np.ndarray] = None) -> None:
+        """
+        Начинает заново выбранные игры.
+
+        Args:
+            games: Индексы или булева маска игр; None означает все игры.
+        """
+        if games is None:
+            idx = np.arange(self.num_games)
+        else:
+            idx = np.asarray(games)
+            if idx.dtype == bool:
+                idx = np.flatnonzero(idx)
+        if idx.size == 0:
+            return
+
+        # Змейка длины 3 в центре поля, голова смотрит вправо
+        start_x = self.cols // 2
+        start_y = self.rows // 2
+        cells = start_y * self.cols + start_x - np.arange(3)
+
+        self.body[idx] = 0
+        self.occupancy[idx] = 0
+        self.body[idx[:, None], np.arange(3)[::-1]] = cells
+        self.occupancy[idx[:, None], cells] = 1
+        self.head_ptr[idx] = 2
+        self.length[idx] = 3
+        self.direction[idx] = 3
+        self.grow_pending[idx] = 0
+        self.score[idx] = 0
+        self.alive[idx] = True
+        self.won[idx] = False
+        self.ticks[idx] = 0
+        self._respawn_apples(idx)
+
+    def step(self, actions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Выполняет один шаг во всех продолжающихся играх.
+
+        Args:
+            actions (Optional[np.ndarray]): Индексы направлений из ACTIONS
+                для каждой игры; -1 сохраняет текущее направление.
+
+        Returns:
+            np.ndarray: Булев массив продолжающихся игр.
+        """
+        idx = np.flatnonzero(self.alive)
+        if idx.size == 0:
+            return self.alive.copy()
+
+        # Смена направления без разворота на 180 градусов
+        direction = self.direction[idx]
+        if actions is not None:
+            act = np.asarray(actions)[idx]
+            turn = (act >= 0) & (act != self._OPPOSITE[direction])
+            direction = np.where(turn, act, direction).astype(np.int8)
+            self.direction[idx] = direction
+
+        head = self.body[idx, self.head_ptr[idx]]
+        x = head % self.cols + self._DX[direction]
+        y = head // self.cols + self._DY[direction]
+        self.ticks[idx] += 1
+
+        # Хвост освобождает клетку, если змейка не растет
+        growing = self.grow_pending[idx] > 0
+        tail_ptr = (self.head_ptr[idx] - self.length[idx] + 1) % self.num_cells
+        tail = self.body[idx, tail_ptr]
+
+        # Столкновения со стенами и с телом
+        hit_wall = (x < 0) | (x >= self.cols) | (y < 0) | (y >= self.rows)
+        self.alive[idx[hit_wall]] = False
+
+        inside = ~hit_wall
+        idx = idx[inside]
+        cell = (y * self.cols + x)[inside]
+        growing = growing[inside]
+        tail = tail[inside]
+        # В клетку уходящего хвоста входить можно
+        hit_self = (self.occupancy[idx, cell] > 0) & ((cell != tail) | growing)
+        self.alive[idx[hit_self]] = False
+
+        survived = ~hit_self
+        idx = idx[survived]
+        cell = cell[survived]
+        growing = growing[survived]
+        tail = tail[survived]
+
+        # Рост и хвост меняются только у выживших, погибшие остаются как были
+        grow_idx = idx[growing]
+        self.grow_pending[grow_idx] -= 1
+        self.length[grow_idx] += 1
+        self.occupancy[idx[~growing], tail[~growing]] -= 1
+
+        ptr = (self.head_ptr[idx] + 1) % self.num_cells
+        self.head_ptr[idx] = ptr
+        self.body[idx, ptr] = cell
+        self.occupancy[idx, cell] = 1
+
+        # Поедание яблок
+        ate = self.apple[idx] == cell
+        eaters = idx[ate]
+        if eaters.size:
+            self.score[eaters] += 1
+            self.grow_pending[eaters] += 1
+            self._respawn_apples(eaters)
+
+        return self.alive.copy()
+
+    def _respawn_apples(self, idx: np.ndarray) -> None:
+        """
+        Ставит яблоки в случайные свободные клетки.
+
+        Сначала для каждой игры пробуется несколько случайных клеток, и
+        берется первая свободная. Только для почти заполненных полей, где
+        все пробы попали в змейку, свободные клетки перебираются целиком.
+        Если свободных клеток не осталось, игра считается выигранной.
+
+        Args:
+            idx (np.ndarray): Индексы игр.
+        """
+        tries = self.rng.integers(self.num_cells, size=(idx.size, self._APPLE_TRIES))
+        hit = self.occupancy[idx[:, None], tries] == 0
+        found = hit.any(axis=1)
+        first = np.argmax(hit, axis=1)
+        self.apple[idx[found]] = tries[found, first[found]]
+
+        idx = idx[~found]
+        if idx.size == 0:
+            return
+
+        # Поле почти заполнено, выбираем из полного списка
+        free = self.occupancy[idx] == 0
+        counts = free.sum(axis=1)
+
+        full = counts == 0
+        if full.any():
+            self.won[idx[full]] = True
+            self.alive[idx[full]] = False
+
+        # k-я свободная клетка для равномерного выбора среди свободных
+        k = (self.rng.random(idx.size) * counts).astype(np.int64)
+        cells = np.argmax(np.cumsum(free, axis=1) > k[:, None], axis=1)
+        self.apple[idx[~full]] = cells[~full]
@@ -0,0 +1,238 @@
+"""
+Камера и кэш кусков для полей больше окна.
+
+На большом поле целиком рисуется только видимая область: поле делится
+на квадратные куски по несколько клеток, каждый кусок рисуется на свою
+поверхность один раз и перерисовывается только после того, как в нем
+что-то изменилось.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Iterator, Set, Tuple
+import pygame
+
+# Номер куска: столбец и строка в кусках
+ChunkKey = Tuple[int, int]
+
+
+class Camera:
+    """
+    Видимая область поля, которая следует за головой змейки.
+
+    Камера двигается целыми клетками и не выходит за края поля, поэтому
+    клетки на экране всегда выровнены по сетке.
+
+    Attributes:
+        field_width (int): Ширина поля.
+        field_height (int): Высота поля.
+        width (int): Ширина видимой области, кратная размеру клетки.
+        height (int): Высота видимой области, кратная размеру клетки.
+        grid_size (int): Размер клетки.
+        x (int): Координата X левого верхнего угла области на поле.
+        y (int): Координата Y левого верхнего угла области на поле.
+    """
+
+    def __init__(self, field_width: int, field_height: int,
+                 view_width: int, view_height: int, grid_size: int):
+        """
+        Создает камеру в левом верхнем углу поля.
+
+        Args:
+            field_width (int): Ширина поля.
+            field_height (int): Высота поля.
+            view_width (int): Желаемая ширина видимой области.
+            view_height (int): Желаемая высота видимой области.
+            grid_size (int): Размер клетки.
+        """
+        self.field_width = field_width
+        self.field_height = field_height
+        self.grid_size = grid_size
+        self.width = min(view_width // grid_size * grid_size, field_width)
+        self.height = min(view_height // grid_size * grid_size, field_height)
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """Точка поля, которая рисуется в левом верхнем углу области."""
+        return self.x, self.y
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """Видимая область в координатах поля."""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def follow(self, x: int, y: int) -> bool:
+        """
+        Ставит клетку (x, y) в центр области, насколько позволяют края поля.
+
+        Args:
+            x (int): Координата X клетки.
+            y (int): Координата Y клетки.
+
+        Returns:
+            bool: True если камера сдвинулась.
+        """
+        size = self.grid_size
+        new_x = self._clamp(x - (self.width // size // 2) * size,
+                            self.field_width - self.width)
+        new_y = self._clamp(y - (self.height // size // 2) * size,
+                            self.field_height - self.height)
+        moved = (new_x, new_y) != (self.x, self.y)
+        self.x, self.y = new_x, new_y
+        return moved
+
+    @staticmethod
+    def _clamp(value: int, upper: int) -> int:
+        """Ограничивает значение отрезком [0, upper]."""
+        return max(0, min(value, upper))
+
+
+class ChunkCache:
+    """
+    Поверхности кусков поля с перерисовкой по отдельности.
+
+    Кусок - квадрат из chunk_cells x chunk_cells клеток. Поверхность куска
+    рисуется функцией render при первом показе и после invalidate; пока
+    кусок не виден, он не перерисовывается, сколько бы раз ни менялся.
+    Поэтому затраты на кадр зависят от размера окна, а не поля.
+
+    В кэше не больше capacity поверхностей: давно не показанные куски
+    вытесняются, а их поверхности достаются новым кускам, так что при
+    прокрутке память не выделяется.
+
+    Attributes:
+        grid_size (int): Размер клетки.
+        chunk_cells (int): Сторона куска в клетках.
+        chunk_size (int): Сторона куска в пикселях.
+        capacity (int): Наибольшее количество поверхностей в кэше.
+        render (Callable[[pygame.Surface, ChunkKey], None]): Рисует кусок
+            на поверхность, левый верхний угол куска в (0, 0).
+        renders (int): Сколько раз куски рисовались заново.
+    """
+
+    def __init__(self, grid_size: int,
+                 render: Callable[[pygame.Surface, ChunkKey], None],
+                 chunk_cells: int = 16, capacity: int = 64):
+        """
+        Создает пустой кэш.
+
+        Args:
+            grid_size (int): Размер клетки.
+            render (Callable[[pygame.Surface, ChunkKey], None]): Функция
+                отрисовки куска.
+            chunk_cells (int): Сторона куска в клетках.
+            capacity (int): Наибольшее количество поверхностей; должно
+                вмещать все куски, видимые одновременно.
+        """
+        self.grid_size = grid_size
+        self.chunk_cells = chunk_cells
+        self.chunk_size = chunk_cells * grid_size
+        self.capacity = capacity
+        self.render = render
+        self.renders = 0
+        # Порядок - от давно показанных к недавним
+        self._surfaces: 'OrderedDict[ChunkKey, pygame.Surface]' = OrderedDict()
+        self._dirty: Set[ChunkKey] = set()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def chunk_of(self, x: int, y: int) -> ChunkKey:
+        """
+        Возвращает кусок, в который попадает точка поля.
+
+        Args:
+            x (int): Координата X.
+            y (int): Координата Y.
+
+        Returns:
+            ChunkKey: Номер куска.
+        """
+        return x // self.chunk_size, y // self.chunk_size
+
+    def invalidate(self, x: int, y: int) -> None:
+        """
+        Отмечает, что кусок с точкой (x, y) нужно перерисовать.
+
+        Куски, которых нет в кэше, и так будут нарисованы при показе.
+
+        Args:
+            x (int): Координата X.
+            y (int): Координата Y.
+        """
+        key = self.chunk_of(x, y)
+        if key in self._surfaces:
+            self._dirty.add(key)
+
+    def clear(self) -> None:
+        """Отмечает все куски для перерисовки, например в новой игре."""
+        self._dirty.update(self._surfaces)
+
+    def visible(self, rect: pygame.Rect) -> Iterator[ChunkKey]:
+        """
+        Перебирает куски, которые пересекает область поля.
+
+        Args:
+            rect (pygame.Rect): Область в координатах поля.
+
+        Yields:
+            ChunkKey: Номер куска.
+        """
+        size = self.chunk_size
+        for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for col in range(rect.left // size, (rect.right - 1) // size + 1):
+                yield col, row
+
+    def get(self, key: ChunkKey) -> pygame.Surface:
+        """
+        Возвращает поверхность куска, рисуя ее при необходимости.
+
+        Args:
+            key (ChunkKey): Номер куска.
+
+        Returns:
+            pygame.Surface: Поверхность куска.
+        """
+        surfaces = self._surfaces
+        surface = surfaces.get(key)
+        if surface is None:
+            if len(surfaces) >= self.capacity:
+                old_key, surface = surfaces.popitem(last=False)
+                self._dirty.discard(old_key)
+            else:
+                surface = pygame.Surface((self.chunk_size, self.chunk_size))
+            surfaces[key] = surface
+            self._render(surface, key)
+        else:
+            surfaces.move_to_end(key)
+            if key in self._dirty:
+                self._render(surface, key)
+        return surface
+
+    def draw(self, target: pygame.Surface, rect: pygame.Rect) -> None:
+        """
+        Рисует область поля на поверхность начиная с (0, 0).
+
+        Куски, выступающие за область, обрезаются, так что остальная часть
+        поверхности не затрагивается.
+
+        Args:
+            target (pygame.Surface): Поверхность для отрисовки.
+            rect (pygame.Rect): Видимая область в координатах поля.
+        """
+        size = self.chunk_size
+        clip = target.get_clip()
+        target.set_clip(pygame.Rect(0, 0, rect.width, rect.height))
+        try:
+            for key in self.visible(rect):
+                col, row = key
+                target.blit(self.get(key), (col * size - rect.x, row * size - rect.y))
+        finally:
+            target.set_clip(clip)
+
+    def _render(self, surface: pygame.Surface, key: ChunkKey) -> None:
+        """Рисует кусок и снимает с него отметку."""
+        self.render(surface, key)
+        self._dirty.discard(key)
+        self.renders += 1
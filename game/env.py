@@ -0,0 +1,193 @@
+"""
+Среда для обучения с подкреплением в стиле Gym.
+
+Среда не создает окно: шаги выполняет :class:`game.simulation.Simulation`
+по тем же правилам, что и GameEngine. Наблюдение - массив NumPy, который
+выделяется один раз и обновляется на месте.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from .simulation import Simulation
+from .snake import Snake
+
+
+class SnakeEnv:
+    """
+    Змейка с интерфейсом reset(seed) / step(action).
+
+    Наблюдение имеет форму (3, rows, cols) и тип uint8. Каналы: голова,
+    тело без головы, яблоко; в занятой клетке 1, в свободной 0. Канал
+    тела копируется из сетки занятости змейки через представление NumPy
+    без копирования Python-объектов, а в каналах головы и яблока
+    меняются только две клетки.
+
+    ``reset`` и ``step`` возвращают один и тот же массив, поэтому его
+    нужно копировать, если наблюдение хранится дольше одного шага. То же
+    относится к словарю info.
+
+    Действие - номер направления в ACTIONS. Разворот на 180 градусов
+    игнорируется, как и в игре.
+
+    Attributes:
+        width (int): Ширина поля.
+        height (int): Высота поля.
+        grid_size (int): Размер клетки.
+        cols (int): Количество клеток по горизонтали.
+        rows (int): Количество клеток по вертикали.
+        max_idle_steps (int): Сколько шагов без яблока змейка может сделать
+            до принудительного конца эпизода.
+        simulation (Simulation): Текущая игра или None до reset.
+        observation (np.ndarray): Буфер наблюдения.
+    """
+
+    # Направления из Snake.DIRECTIONS без повторов: вверх, вниз, влево, вправо
+    ACTIONS = tuple(dict.fromkeys(Snake.DIRECTIONS.values()))
+
+    # Каналы наблюдения
+    HEAD, BODY, APPLE = range(3)
+
+    REWARD_APPLE = 1.0
+    REWARD_DEATH = -1.0
+    REWARD_STEP = 0.0
+
+    def __init__(self, width: int = 800, height: int = 600,
+                 grid_size: int = 40, max_idle_steps: Optional[int] = None):
+        """
+        Создает среду.
+
+        Args:
+            width (int): Ширина поля.
+            height (int): Высота поля.
+            grid_size (int): Размер клетки.
+            max_idle_steps (Optional[int]): Предел шагов без яблока; по
+                умолчанию два размера поля в клетках.
+        """
+        self.width = width
+        self.height = height
+        self.grid_size = grid_size
+        self.cols = width // grid_size
+        self.rows = height // grid_size
+        if max_idle_steps is None:
+            max_idle_steps = 2 * self.cols * self.rows
+        self.max_idle_steps = max_idle_steps
+
+        self.simulation: Optional[Simulation] = None
+        self.observation = np.zeros((3, self.rows, self.cols), dtype=np.uint8)
+        # Плоские представления каналов для записи по индексу клетки
+        self._head = self.observation[self.HEAD].reshape(-1)
+        self._body = self.observation[self.BODY].reshape(-1)
+        self._apple = self.observation[self.APPLE].reshape(-1)
+        self._occupancy = None
+        self._occupancy_view = None
+        self._head_cell = -1
+        self._apple_cell = -1
+        self._last_meal = 0
+        self._info: Dict[str, Any] = {'score': 0, 'ticks': 0, 'won': False,
+                                      'truncated': False}
+
+    @property
+    def observation_shape(self) -> Tuple[int, int, int]:
+        """Форма наблюдения: каналы, строки, столбцы."""
+        return self.observation.shape
+
+    @property
+    def action_count(self) -> int:
+        """Количество действий."""
+        return len(self.ACTIONS)
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Начинает новый эпизод.
+
+        Args:
+            seed (Optional[int]): Зерно игры; одинаковое зерно и действия
+                дают одинаковый эпизод.
+
+        Returns:
+            np.ndarray: Наблюдение (общий буфер среды).
+        """
+        self.simulation = Simulation(self.width, self.height, self.grid_size,
+                                     seed=seed)
+        self._head[:] = 0
+        self._apple[:] = 0
+        self._head_cell = -1
+        self._apple_cell = -1
+        self._last_meal = 0
+        self._info['truncated'] = False
+        self._observe()
+        return self.observation
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict[str, Any]]:
+        """
+        Выполняет одно действие.
+
+        Args:
+            action (int): Номер направления в ACTIONS.
+
+        Returns:
+            Tuple[np.ndarray, float, bool, Dict[str, Any]]: Наблюдение,
+            награда, конец эпизода и сведения о счете.
+
+        Raises:
+            RuntimeError: Если reset еще не вызывался.
+            ValueError: Если action не номер действия из ACTIONS.
+        """
+        simulation = self.simulation
+        if simulation is None:
+            raise RuntimeError("Перед step нужно вызвать reset")
+        # Отрицательный номер иначе молча выбрал бы действие с конца
+        if not 0 <= action < len(self.ACTIONS):
+            raise ValueError(f"Нет действия {action}: допустимы 0..{len(self.ACTIONS) - 1}")
+        if simulation.game_over:
+            return self.observation, 0.0, True, self._info
+
+        score = simulation.score
+        simulation.step(self.ACTIONS[action])
+
+        reward = self.REWARD_STEP
+        if simulation.score != score:
+            reward = self.REWARD_APPLE
+            self._last_meal = simulation.ticks
+        if simulation.game_over and not simulation.won:
+            reward = self.REWARD_DEATH
+
+        done = simulation.game_over
+        if not done and simulation.ticks - self._last_meal >= self.max_idle_steps:
+            done = True
+            self._info['truncated'] = True
+
+        self._observe()
+        return self.observation, reward, done, self._info
+
+    def _observe(self) -> None:
+        """Переносит состояние игры в буфер наблюдения и info."""
+        simulation = self.simulation
+        snake = simulation.snake
+
+        if snake.occupancy is not self._occupancy:
+            # Сетка занятости заменяется только при rebuild_occupancy
+            self._occupancy = snake.occupancy
+            self._occupancy_view = np.frombuffer(snake.occupancy, dtype=np.uint8)
+        np.copyto(self._body, self._occupancy_view)
+
+        head = snake.cell_index(snake.x, snake.y)
+        if self._head_cell >= 0:
+            self._head[self._head_cell] = 0
+        if head >= 0:
+            self._head[head] = 1
+            self._body[head] -= 1
+        self._head_cell = head
+
+        apple = snake.cell_index(simulation.apple.x, simulation.apple.y)
+        if apple != self._apple_cell:
+            if self._apple_cell >= 0:
+                self._apple[self._apple_cell] = 0
+            if apple >= 0 and not simulation.won:
+                self._apple[apple] = 1
+            self._apple_cell = apple
+
+        info = self._info
+        info['score'] = simulation.score
+        info['ticks'] = simulation.ticks
+        info['won'] = simulation.won
@@ -0,0 +1,328 @@
+"""
+Параллельный прогон игр бота без окна.
+
+Игры раздаются пачками процессам ProcessPoolExecutor. Процесс сам
+восстанавливает параметры каждой игры по ее номеру и зерну прогона и
+возвращает только итоги игр, поэтому между процессами передаются номера
+и короткие кортежи, а не состояние игр.
+"""
+
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from .pilots import PILOTS
+from .simulation import Simulation
+
+# Исходы игры
+WON = 'won'
+CRASHED = 'crashed'
+STALLED = 'stalled'
+
+
+class GameResult(NamedTuple):
+    """
+    Итог одной игры.
+
+    Attributes:
+        index (int): Номер игры в прогоне.
+        width (int): Ширина поля.
+        height (int): Высота поля.
+        grid_size (int): Размер клетки.
+        snake_speed (int): Скорость змейки в шагах в секунду.
+        score (int): Счет.
+        length (int): Длина змейки в конце игры.
+        ticks (int): Количество шагов.
+        outcome (str): WON, CRASHED или STALLED.
+    """
+
+    index: int
+    width: int
+    height: int
+    grid_size: int
+    snake_speed: int
+    score: int
+    length: int
+    ticks: int
+    outcome: str
+
+
+class EvaluationConfig:
+    """
+    Параметры прогона.
+
+    Размеры поля, клетки и скорость каждой игры выбираются равномерно из
+    диапазонов генератором, который зависит только от зерна прогона и
+    номера игры. Поэтому игра воспроизводится независимо от того, какой
+    процесс и в каком порядке ее сыграл.
+
+    Attributes:
+        games (int): Количество игр.
+        seed (int): Зерно прогона.
+        width_range (Tuple[int, int]): Ширина поля, от и до включительно.
+        height_range (Tuple[int, int]): Высота поля.
+        grid_range (Tuple[int, int]): Размер клетки.
+        speed_range (Tuple[int, int]): Скорость змейки.
+        pilot (str): Бот, ключ PILOTS.
+        stall_factor (int): Игра останавливается, если змейка не ела
+            дольше stall_factor * <клеток поля> шагов.
+    """
+
+    def __init__(self, games: int, seed: int = 0,
+                 width_range: Tuple[int, int] = (800, 800),
+                 height_range: Tuple[int, int] = (600, 600),
+                 grid_range: Tuple[int, int] = (40, 40),
+                 speed_range: Tuple[int, int] = (10, 10),
+                 pilot: str = 'path', stall_factor: int = 2):
+        """
+        Создает параметры прогона.
+
+        Args:
+            games (int): Количество игр.
+            seed (int): Зерно прогона.
+            width_range (Tuple[int, int]): Диапазон ширины поля.
+            height_range (Tuple[int, int]): Диапазон высоты поля.
+            grid_range (Tuple[int, int]): Диапазон размера клетки.
+            speed_range (Tuple[int, int]): Диапазон скорости змейки.
+            pilot (str): 'path' или 'cycle'.
+            stall_factor (int): Множитель предела шагов без еды.
+
+        Raises:
+            ValueError: Если параметры не позволяют сыграть ни одной игры.
+        """
+        if games < 1:
+            raise ValueError("Нужна хотя бы одна игра")
+        if pilot not in PILOTS:
+            raise ValueError(f"Неизвестный режим бота: {pilot}")
+        for name, (low, high) in (('ширины', width_range),
+                                  ('высоты', height_range),
+                                  ('размера клетки', grid_range),
+                                  ('скорости', speed_range)):
+            if low < 1 or low > high:
+                raise ValueError(f"Неверный диапазон {name}: {low}-{high}")
+        # На самом узком поле должна поместиться начальная змейка
+        if width_range[0] // grid_range[1] < 4 or height_range[0] // grid_range[1] < 2:
+            raise ValueError("Поле слишком маленькое для такого размера клетки")
+
+        self.games = games
+        self.seed = seed
+        self.width_range = tuple(width_range)
+        self.height_range = tuple(height_range)
+        self.grid_range = tuple(grid_range)
+        self.speed_range = tuple(speed_range)
+        self.pilot = pilot
+        self.stall_factor = stall_factor
+
+    def game_params(self, index: int) -> Tuple[int, int, int, int, int]:
+        """
+        Возвращает параметры игры с заданным номером.
+
+        Args:
+            index (int): Номер игры.
+
+        Returns:
+            Tuple[int, int, int, int, int]: Ширина, высота, размер клетки,
+            скорость и зерно игры.
+        """
+        rng = random.Random(f'{self.seed}:{index}')
+        return (rng.randint(*self.width_range),
+                rng.randint(*self.height_range),
+                rng.randint(*self.grid_range),
+                rng.randint(*self.speed_range),
+                rng.getrandbits(63))
+
+
+def play_game(config: EvaluationConfig, index: int) -> GameResult:
+    """
+    Играет одну игру ботом до конца.
+
+    Args:
+        config (EvaluationConfig): Параметры прогона.
+        index (int): Номер игры.
+
+    Returns:
+        GameResult: Итог игры.
+    """
+    width, height, grid_size, speed, seed = config.game_params(index)
+    simulation = Simulation(width, height, grid_size, seed=seed)
+    pilot = PILOTS[config.pilot].for_simulation(simulation)
+    stall_limit = config.stall_factor * simulation.snake.cols * simulation.snake.rows
+
+    choose = pilot.choose
+    step = simulation.step
+    outcome = CRASHED
+    score = 0
+    last_meal = 0
+    while step(choose(simulation)):
+        if simulation.score != score:
+            score = simulation.score
+            last_meal = simulation.ticks
+        elif simulation.ticks - last_meal > stall_limit:
+            outcome = STALLED
+            break
+    if simulation.won:
+        outcome = WON
+
+    return GameResult(index, width, height, grid_size, speed, simulation.score,
+                      simulation.snake.get_length(), simulation.ticks, outcome)
+
+
+def _play_chunk(config: EvaluationConfig, start: int,
+                stop: int) -> Tuple[int, float, List[GameResult]]:
+    """
+    Играет игры с номерами от start до stop в процессе пула.
+
+    Returns:
+        Tuple[int, float, List[GameResult]]: Номер процесса, время игр в
+        секундах и их итоги.
+    """
+    begin = time.perf_counter()
+    results = [play_game(config, index) for index in range(start, stop)]
+    return os.getpid(), time.perf_counter() - begin, results
+
+
+class EvaluationStats:
+    """
+    Сводная статистика прогона, которая пополняется по мере готовности пачек.
+
+    Attributes:
+        games (int): Сыгранные игры.
+        outcomes (Counter): Количество игр по исходам.
+        scores (Counter): Количество игр по счету.
+        total_length (int): Сумма длин змеек.
+        total_ticks (int): Сумма шагов.
+        total_game_time (float): Сумма длительностей игр в секундах при
+            их скорости змейки.
+        workers (Dict[int, List[float]]): Шаги и секунды работы по процессам.
+    """
+
+    def __init__(self):
+        """Создает пустую статистику."""
+        self.games = 0
+        self.outcomes = Counter()
+        self.scores = Counter()
+        self.total_length = 0
+        self.total_ticks = 0
+        self.total_game_time = 0.0
+        self.workers: Dict[int, List[float]] = {}
+
+    def add(self, worker: int, elapsed: float, results: List[GameResult]) -> None:
+        """
+        Добавляет итоги пачки игр.
+
+        Args:
+            worker (int): Номер процесса, сыгравшего пачку.
+            elapsed (float): Время игр пачки в секундах.
+            results (List[GameResult]): Итоги игр.
+        """
+        ticks = 0
+        for result in results:
+            self.outcomes[result.outcome] += 1
+            self.scores[result.score] += 1
+            self.total_length += result.length
+            ticks += result.ticks
+            self.total_game_time += result.ticks / result.snake_speed
+        self.games += len(results)
+        self.total_ticks += ticks
+
+        totals = self.workers.setdefault(worker, [0, 0.0])
+        totals[0] += ticks
+        totals[1] += elapsed
+
+    def score_percentile(self, fraction: float) -> int:
+        """
+        Возвращает счет, не выше которого набрана заданная доля игр.
+
+        Args:
+            fraction (float): Доля от 0 до 1.
+
+        Returns:
+            int: Счет.
+        """
+        if not self.games:
+            return 0
+        needed = max(1, round(fraction * self.games))
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen >= needed:
+                return score
+        return max(self.scores)
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Возвращает статистику в виде словаря для JSON.
+
+        Returns:
+            Dict[str, object]: Сводные показатели.
+        """
+        games = self.games or 1
+        return {
+            'games': self.games,
+            'outcomes': dict(self.outcomes),
+            'score': {
+                'mean': sum(s * n for s, n in self.scores.items()) / games,
+                'min': self.score_percentile(0),
+                'p25': self.score_percentile(0.25),
+                'median': self.score_percentile(0.5),
+                'p75': self.score_percentile(0.75),
+                'max': max(self.scores, default=0),
+                'counts': {str(s): self.scores[s] for s in sorted(self.scores)},
+            },
+            'mean_length': self.total_length / games,
+            'mean_ticks': self.total_ticks / games,
+            'mean_game_seconds': self.total_game_time / games,
+            'ticks_per_second': {
+                str(pid): ticks / seconds if seconds else 0.0
+                for pid, (ticks, seconds) in sorted(self.workers.items())
+            },
+        }
+
+
+def run_evaluation(config: EvaluationConfig, workers: Optional[int] = None,
+                   chunk_size: Optional[int] = None,
+                   on_progress: Callable[[EvaluationStats], None] = None) -> EvaluationStats:
+    """
+    Играет все игры прогона в пуле процессов.
+
+    Пачек в несколько раз больше, чем процессов: процессы, которым
+    достались короткие игры, забирают следующие пачки, и к концу прогона
+    нагрузка остается ровной.
+
+    Args:
+        config (EvaluationConfig): Параметры прогона.
+        workers (Optional[int]): Количество процессов; по умолчанию по
+            одному на ядро. При одном процессе игры идут в текущем.
+        chunk_size (Optional[int]): Игр в пачке; по умолчанию подбирается
+            так, чтобы на процесс приходилось около восьми пачек.
+        on_progress (Callable[[EvaluationStats], None]): Вызывается после
+            каждой готовой пачки.
+
+    Returns:
+        EvaluationStats: Статистика всех игр.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(100, config.games // (workers * 8)))
+    chunks = [(start, min(start + chunk_size, config.games))
+              for start in range(0, config.games, chunk_size)]
+
+    stats = EvaluationStats()
+    if workers == 1:
+        for start, stop in chunks:
+            stats.add(*_play_chunk(config, start, stop))
+            if on_progress is not None:
+                on_progress(stats)
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_play_chunk, config, start, stop)
+                   for start, stop in chunks]
+        for future in as_completed(futures):
+            stats.add(*future.result())
+            if on_progress is not None:
+                on_progress(stats)
+    return stats
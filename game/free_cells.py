@@ -0,0 +1,107 @@
+"""
+Индекс свободных клеток поля.
+"""
+
+import random
+from array import array
+from typing import Iterable
+
+
+class FreeCellIndex:
+    """
+    Множество свободных клеток с добавлением, удалением и случайным
+    выбором за O(1).
+
+    Клетки хранятся в плотном массиве ``cells``, а ``positions`` для
+    каждой клетки поля хранит ее позицию в этом массиве (-1 если клетка
+    занята). Удаление переставляет последний элемент на место удаленного.
+
+    Attributes:
+        cells (array): Свободные клетки в произвольном порядке.
+        positions (array): Позиция каждой клетки в ``cells`` или -1.
+    """
+
+    def __init__(self, num_cells: int):
+        """
+        Создает индекс, в котором все клетки свободны.
+
+        Args:
+            num_cells (int): Количество клеток поля.
+        """
+        self.cells = array('i', range(num_cells))
+        self.positions = array('i', range(num_cells))
+
+    @classmethod
+    def from_cells(cls, num_cells: int, cells: Iterable[int]) -> 'FreeCellIndex':
+        """
+        Создает индекс с заданными свободными клетками в заданном порядке.
+
+        Порядок важен: от него зависит, какую клетку вернет sample при
+        одном и том же состоянии генератора.
+
+        Args:
+            num_cells (int): Количество клеток поля.
+            cells (Iterable[int]): Свободные клетки.
+
+        Returns:
+            FreeCellIndex: Новый индекс.
+        """
+        index = cls(0)
+        index.cells = array('i', cells)
+        index.positions = array('i', [-1]) * num_cells
+        for position, cell in enumerate(index.cells):
+            index.positions[cell] = position
+        return index
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, index: int) -> bool:
+        return self.positions[index] >= 0
+
+    def add(self, index: int) -> None:
+        """
+        Отмечает клетку свободной.
+
+        Args:
+            index (int): Индекс клетки.
+        """
+        if self.positions[index] < 0:
+            self.positions[index] = len(self.cells)
+            self.cells.append(index)
+
+    def remove(self, index: int) -> None:
+        """
+        Отмечает клетку занятой.
+
+        Args:
+            index (int): Индекс клетки.
+        """
+        position = self.positions[index]
+        if position < 0:
+            return
+
+        last = self.cells.pop()
+        if last != index:
+            self.cells[position] = last
+            self.positions[last] = position
+        self.positions[index] = -1
+
+    def sample(self, rng: random.Random = None) -> int:
+        """
+        Возвращает случайную свободную клетку.
+
+        Args:
+            rng (random.Random): Генератор случайных чисел.
+
+        Returns:
+            int: Индекс клетки.
+
+        Raises:
+            IndexError: Если свободных клеток нет.
+        """
+        if not self.cells:
+            raise IndexError("Нет свободных клеток")
+        if rng is None:
+            rng = random
+        return self.cells[rng.randrange(len(self.cells))]
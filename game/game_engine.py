@@ -2,11 +2,25 @@
 Игровой движок для Змейки.
 """
 
+import os
+import time
+import numpy as np
 import pygame
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .base import Cell
 from .snake import Snake
 from .apple import Apple
+from .simulation import Simulation
+from .camera import Camera, ChunkCache
+from .arena import Arena
+from .network import NetworkClient
+from .pilots import PILOTS
+from .profiler import FrameProfiler
+from .replay import ReplayRecorder
+from .results import ResultsStore, ResultWriter
+from .scheduler import TickScheduler
+from .text_cache import TextCache
 
 
 class GameEngine:
@@ -21,12 +35,62 @@ class GameEngine:
         snake_speed (int): Скорость движения змейки.
         player_name (str): Имя игрока.
         fullscreen (bool): Режим полноэкранный или оконный.
+        dirty_rects (bool): Обновлять на экране только изменившиеся области.
+        replay_dir (str): Папка для реплеев завершенных игр или None.
+        results (ResultsStore): Хранилище результатов игр.
+        result_writer (ResultWriter): Фоновая запись результатов.
+        profiler (FrameProfiler): Время фаз последних кадров.
+        show_profiler (bool): Показывать ли перцентили времени кадра.
+        profile_csv (str): Файл, куда сохранить время кадров при выходе, или None.
+        headless (bool): Игра без окна: кадры только рисуются в game_surface.
+        autopilot (bool): Змейкой управляет бот; переключается по F2.
+        pilot_mode (str): Какой бот управляет змейкой, ключ PILOTS.
+        simulation (Simulation): Одиночная игра или None в сетевой игре и
+            на арене.
+        recorder (ReplayRecorder): Запись реплея одиночной игры или None,
+            если реплеи не сохраняются.
+        pilot (Autopilot | HamiltonianSolver): Бот одиночной игры или None.
+        client (NetworkClient): Подключение к серверу в сетевой игре или None.
+        arena_bots (int): Количество ботов на общем поле в режиме арены.
+        arena (Arena): Поле режима арены или None в обычной игре.
+        camera (Camera): Видимая область большого поля или None, если
+            поле показывается целиком.
+        chunks (ChunkCache): Куски большого поля или None.
+        view_width (int): Ширина показываемой части поля.
+        view_height (int): Высота показываемой части поля.
     """
 
+    # Боты по режимам из game.pilots
+    PILOTS = PILOTS
+
+    # Номер змейки игрока на арене
+    PLAYER_ID = 0
+
+    # Сторона куска большого поля в клетках; четная, чтобы шахматный фон
+    # у всех кусков совпадал
+    CHUNK_CELLS = 16
+
+    # Цвет яблок в сетевой игре и на арене, как у Apple
+    APPLE_COLOR = (255, 50, 50)
+
+    # Цвета чужих змеек в сетевой игре и на арене
+    REMOTE_COLORS = [
+        (230, 126, 34), (155, 89, 182), (241, 196, 15), (52, 152, 219),
+        (231, 76, 60), (26, 188, 156), (236, 240, 241), (149, 165, 166),
+    ]
+
     def __init__(self, width: int = 800, height: int = 600,
                  grid_size: int = 40, fps: int = 60,
                  snake_speed: int = 10, player_name: str = "Игрок",
-                 fullscreen: bool = True):
+                 fullscreen: bool = True, dirty_rects: bool = True,
+                 replay_dir: str = None, results_path: str = 'results.db',
+                 legacy_results_path: str = 'results.txt',
+                 results_sync: str = 'NORMAL', profile_csv: str = None,
+                 headless: bool = False, autopilot: bool = False,
+                 pilot_mode: str = 'path',
+                 server: Optional[Tuple[str, int]] = None,
+                 arena_bots: int = 0,
+                 viewport: Optional[Tuple[int, int]] = None):
         """
         Инициализирует игровой движок.
 
@@ -38,12 +102,66 @@ class GameEngine:
             snake_speed (int): Скорость змейки.
             player_name (str): Имя игрока.
             fullscreen (bool): Режим полноэкранный.
+            dirty_rects (bool): Перерисовывать только изменившиеся клетки.
+            replay_dir (str): Папка, куда сохранять реплей каждой игры. Без
+                нее игра не записывается, например в долгих прогонах бота.
+            results_path (str): Файл базы результатов.
+            legacy_results_path (str): Старый текстовый файл результатов,
+                который переносится в базу, или None.
+            results_sync (str): Режим fsync базы результатов: 'OFF',
+                'NORMAL' или 'FULL'.
+            profile_csv (str): Файл для времени фаз кадров при выходе.
+            headless (bool): Работать без дисплея через видеодрайвер SDL
+                dummy, если другой не задан в SDL_VIDEODRIVER; кадры
+                читаются через capture_frame.
+            autopilot (bool): Отдать управление боту с самого начала.
+            pilot_mode (str): 'path' - кратчайший путь к яблоку, 'cycle' -
+                гамильтонов цикл, который заполняет все поле.
+            server (Optional[Tuple[str, int]]): Адрес и порт сервера сетевой
+                игры. Движок тогда только рисует арену сервера и отправляет
+                ему нажатые направления; поле, размер клетки и скорость
+                задает сервер.
+            arena_bots (int): Если больше нуля - режим арены: змейка игрока
+                и столько ботов на одном поле. Погибшие боты появляются
+                снова, игра заканчивается гибелью змейки игрока.
+            viewport (Optional[Tuple[int, int]]): Размер окна на поле в
+                пикселях. Если задан, поле может быть сколь угодно большим:
+                показывается только область вокруг головы, а поле рисуется
+                кусками, которые перерисовываются, только когда в них
+                что-то изменилось и они видны.
+
+        Raises:
+            ValueError: Если режим бота неизвестен, окно на поле задано
+                для сетевой игры или арены или на арене нет места для
+                змейки игрока.
         """
-        pygame.init()
+        if viewport is not None and (server is not None or arena_bots > 0):
+            raise ValueError("Окно на поле поддерживается только в одиночной игре")
+
+        self.headless = headless
+        # Драйвер выбирается при инициализации дисплея, поэтому dummy нужен
+        # только на время pygame.init; явно заданный драйвер не меняется
+        set_driver = headless and 'SDL_VIDEODRIVER' not in os.environ
+        if headless:
+            fullscreen = False
+        if set_driver:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        try:
+            pygame.init()
+        finally:
+            if set_driver:
+                del os.environ['SDL_VIDEODRIVER']
+
+        self.client = None
+        if server is not None:
+            self.client = NetworkClient(*server)
+            mirror = self.client.mirror
+            grid_size = mirror.grid_size
+            width = mirror.cols * grid_size
+            height = mirror.rows * grid_size
+            snake_speed = mirror.rate
 
-        # Получаем разрешение экрана
         self.fullscreen = fullscreen
-        screen_info = pygame.display.Info()
 
         # Сохраняем РЕАЛЬНЫЕ размеры игрового поля из настроек
         self.original_width = width
@@ -54,24 +172,34 @@ class GameEngine:
         self.game_width = (self.original_width // self.grid_size) * self.grid_size
         self.game_height = (self.original_height // self.grid_size) * self.grid_size
 
+        # На большом поле окно показывает только область вокруг головы
+        self.camera = None
+        self.view_width = self.game_width
+        self.view_height = self.game_height
+        if viewport is not None:
+            self.camera = Camera(self.game_width, self.game_height, *viewport,
+                                 self.grid_size)
+            self.view_width = self.camera.width
+            self.view_height = self.camera.height
+
         # Разделяем экран на игровое поле и панель статистики
         self.ui_height = 120  # Высота панели статистики
-        self.display_width = self.game_width
-        self.display_height = self.game_height + self.ui_height
+        self.display_width = self.view_width
+        self.display_height = self.view_height + self.ui_height
 
         self.fps = fps
         self.snake_speed = snake_speed
         self.player_name = player_name
+        self.replay_dir = replay_dir
+        self.autopilot = autopilot
+        if pilot_mode not in self.PILOTS:
+            raise ValueError(f"Неизвестный режим бота: {pilot_mode}")
+        self.pilot_mode = pilot_mode
+        self.arena_bots = arena_bots
+        self.arena = None
 
         # Создаем окно
-        if self.fullscreen:
-            self.screen = pygame.display.set_mode((screen_info.current_w, screen_info.current_h), pygame.FULLSCREEN)
-            self.screen_width = screen_info.current_w
-            self.screen_height = screen_info.current_h
-        else:
-            self.screen = pygame.display.set_mode((self.display_width, self.display_height))
-            self.screen_width = self.display_width
-            self.screen_height = self.display_height
+        self._set_display_mode()
 
         pygame.display.set_caption(f'Змейка - {self.player_name}')
         self.clock = pygame.time.Clock()
@@ -93,6 +221,44 @@ class GameEngine:
         self.color1 = pygame.Color('#4682B4')
         self.color2 = pygame.Color('#B0E0E6')
 
+        # Кэш отрисованного поля и параметры, с которыми он построен
+        self._board_surface = None
+        self._board_key = None
+
+        # Куски большого поля: в кэше вдвое больше кусков, чем видно сразу
+        self.chunks = None
+        if self.camera is not None:
+            chunk_size = self.CHUNK_CELLS * self.grid_size
+            visible = ((self.view_width // chunk_size + 2) *
+                       (self.view_height // chunk_size + 2))
+            self.chunks = ChunkCache(self.grid_size, self._render_chunk,
+                                     self.CHUNK_CELLS, capacity=2 * visible)
+
+        # Кэш отрисованного текста и фон для сообщений
+        self.text_cache = TextCache()
+        self._overlay_surface = None
+
+        # Частичная перерисовка: клетки, изменившиеся с прошлого кадра
+        self.dirty_rects = dirty_rects
+        self._dirty_cells = set()
+        self._drawn_ui_values = None
+        self._full_redraw = True
+
+        # Кадр рисуется только если что-то изменилось
+        self._needs_redraw = True
+
+        # Время фаз кадра; перцентили показываются по F3
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profile_csv = profile_csv
+        self._profiler_surface = None
+        self._profiler_font = None
+        self._profiler_updated = 0.0
+
+        # Буферы для capture_frame, переиспользуются между кадрами
+        self._frame_buffer = None
+        self._cell_buffer = None
+
         # Цвета UI
         self.ui_bg_color = pygame.Color('#2C3E50')
         self.ui_text_color = pygame.Color('#ECF0F1')
@@ -100,46 +266,126 @@ class GameEngine:
         self.ui_button_color = pygame.Color('#1ABC9C')
         self.ui_button_hover_color = pygame.Color('#16A085')
 
-        self.score = 0
-        self.high_score = 0
-        self.game_over = False
+        # Результаты хранятся в базе, старый results.txt переносится в нее,
+        # а в него дописывается то, что не удалось записать в базу
+        self.results = ResultsStore(results_path, sync=results_sync)
+        if legacy_results_path is not None:
+            self.results.migrate_legacy(legacy_results_path)
+        self.high_score = self.results.high_score(self.player_name)
+        # Дальше базой пользуется только поток записи
+        self.result_writer = ResultWriter(self.results,
+                                          fallback_path=legacy_results_path)
         self.paused = False
 
-        self._init_game()
+        try:
+            self._init_game()
+        except ValueError:
+            # Поток записи уже запущен, без движка его никто не остановит
+            self.result_writer.close()
+            raise
 
     def _init_game(self) -> None:
         """
         Инициализирует игровые объекты.
         """
-        # Создаем змейку в центре игрового поля (ИСПОЛЬЗУЕМ game_width и game_height)
-        start_x = (self.game_width // 2) // self.grid_size * self.grid_size
-        start_y = (self.game_height // 2) // self.grid_size * self.grid_size
-
         # Цвета змейки
         head_color = pygame.Color('#00FF00')
         body_color1 = pygame.Color('#32CD32')
         body_color2 = pygame.Color('#228B22')
 
-        self.snake = Snake(
-            x=start_x,
-            y=start_y,
-            size=self.grid_size,
-            length=3,
-            head_color=head_color,
-            body_colors=[body_color1, body_color2]
-        )
-
-        # Создаем яблоко
-        self.apple = Apple.create_random(
-            max_x=self.game_width,
-            max_y=self.game_height,
-            size=self.grid_size,
-            grid_size=self.grid_size
-        )
-
-        # Таймер для движения змейки
-        self.move_timer = 0
-        self.move_delay = 1000 // self.snake_speed  # мс между движениями
+        self._player_colors = (head_color, [body_color1, body_color2])
+
+        # Счет и конец игры арены и сетевой игры; в одиночной их хранит симуляция
+        self._score = 0
+        self._game_over = False
+        # Видела ли сетевая игра свою змейку на поле с последнего конца игры
+        self._client_alive = False
+
+        # Симуляция, реплей и бот нужны только одиночной игре
+        self.simulation = None
+        self.recorder = None
+        self.pilot = None
+
+        if self.arena_bots > 0:
+            self.arena = Arena(self.game_width, self.game_height, self.grid_size,
+                               apples=1 + self.arena_bots // 4)
+            self._player = self.arena.add_snake(self.PLAYER_ID)
+            if self._player is None:
+                raise ValueError(
+                    f"На поле {self.arena.cols}x{self.arena.rows} клеток "
+                    f"нет места для змейки игрока"
+                )
+            self._player.color = head_color
+            self._player.body_colors = [body_color1, body_color2]
+            for bot_id in range(1, self.arena_bots + 1):
+                self.arena.add_snake(bot_id)
+        elif self.client is None:
+            # Вся игровая логика живет в симуляции, движок только рисует и считает время
+            self.simulation = Simulation(
+                width=self.game_width,
+                height=self.game_height,
+                grid_size=self.grid_size,
+                head_color=head_color,
+                body_colors=[body_color1, body_color2]
+            )
+            if self.replay_dir is not None:
+                self.recorder = ReplayRecorder(self.simulation)
+            self.pilot = self.PILOTS[self.pilot_mode].for_simulation(self.simulation)
+
+        # Шаги змейки идут с фиксированной частотой независимо от FPS
+        self.scheduler = TickScheduler(self.snake_speed)
+
+        # Новая игра всегда рисуется целиком
+        self._full_redraw = True
+        self._needs_redraw = True
+        self._dirty_cells.clear()
+        if self.camera is not None:
+            self.chunks.clear()
+            self.camera.follow(self.snake.x, self.snake.y)
+
+    @property
+    def snake(self) -> Optional[Snake]:
+        """Змейка текущей игры; в сетевой игре None."""
+        if self.arena is not None:
+            return self._player
+        if self.simulation is None:
+            return None
+        return self.simulation.snake
+
+    @property
+    def apple(self) -> Optional[Apple]:
+        """Яблоко одиночной игры или None."""
+        if self.simulation is None:
+            return None
+        return self.simulation.apple
+
+    @property
+    def score(self) -> int:
+        """Счет текущей игры."""
+        if self.simulation is None:
+            return self._score
+        return self.simulation.score
+
+    @score.setter
+    def score(self, value: int) -> None:
+        if self.simulation is None:
+            self._score = value
+        else:
+            self.simulation.score = value
+
+    @property
+    def game_over(self) -> bool:
+        """Завершена ли текущая игра."""
+        if self.simulation is None:
+            return self._game_over
+        return self.simulation.game_over
+
+    @game_over.setter
+    def game_over(self, value: bool) -> None:
+        if self.simulation is None:
+            self._game_over = value
+        else:
+            self.simulation.game_over = value
 
     def handle_events(self) -> bool:
         """
@@ -152,6 +398,12 @@ class GameEngine:
             if event.type == pygame.QUIT:
                 return False
 
+            elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE,
+                                pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED):
+                # Содержимое окна могло быть потеряно
+                self._full_redraw = True
+                self._needs_redraw = True
+
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
@@ -159,15 +411,32 @@ class GameEngine:
                 elif event.key == pygame.K_f:  # Переключение полноэкранного режима
                     self._toggle_fullscreen()
 
+                elif event.key == pygame.K_F3:  # Панель времени кадра
+                    self.show_profiler = not self.show_profiler
+                    self._profiler_surface = None
+                    self._full_redraw = True
+                    self._needs_redraw = True
+
+                elif self.client is not None:
+                    # В сетевой игре на сервер уходят только направления
+                    if event.key in Snake.DIRECTIONS:
+                        self.client.send_direction(Snake.DIRECTIONS[event.key])
+
+                elif event.key == pygame.K_F2:  # Автопилот
+                    self.autopilot = not self.autopilot
+
                 elif event.key == pygame.K_SPACE:
                     if self.game_over:
                         self._init_game()
-                        self.game_over = False
-                        self.score = 0
+                        self.scheduler.reset()
                     else:
                         self.paused = not self.paused
+                        self._needs_redraw = True
+                        if not self.paused:
+                            # Время на паузе не должно превратиться в догоняющие шаги
+                            self.scheduler.reset()
 
-                elif not self.game_over and not self.paused:
+                elif not self.game_over and not self.paused and not self.autopilot:
                     self.snake.change_direction(event.key)
 
         return True
@@ -175,12 +444,73 @@ class GameEngine:
     def _toggle_fullscreen(self):
         """Переключает полноэкранный режим."""
         self.fullscreen = not self.fullscreen
+        self._full_redraw = True
+        self._needs_redraw = True
+        self._set_display_mode()
+
+    def _set_display_mode(self) -> None:
+        """
+        Создает окно для текущего режима и пересчитывает масштабирование.
+
+        В полноэкранном режиме окно создается с флагом SCALED: игра рисуется
+        в своем разрешении, а растягивает и центрирует кадр сама SDL. Если
+        SCALED недоступен, кадр масштабируется вручную в заранее созданную
+        поверхность.
+        """
+        self.scaled_by_sdl = False
 
         if self.fullscreen:
-            screen_info = pygame.display.Info()
-            self.screen = pygame.display.set_mode((screen_info.current_w, screen_info.current_h), pygame.FULLSCREEN)
+            try:
+                self.screen = pygame.display.set_mode(
+                    (self.display_width, self.display_height),
+                    pygame.FULLSCREEN | pygame.SCALED
+                )
+                self.scaled_by_sdl = True
+                self.screen_width = self.display_width
+                self.screen_height = self.display_height
+            except pygame.error:
+                screen_info = pygame.display.Info()
+                self.screen = pygame.display.set_mode((screen_info.current_w, screen_info.current_h), pygame.FULLSCREEN)
+                self.screen_width = screen_info.current_w
+                self.screen_height = screen_info.current_h
         else:
             self.screen = pygame.display.set_mode((self.display_width, self.display_height))
+            self.screen_width = self.display_width
+            self.screen_height = self.display_height
+
+        self._update_scaling()
+
+    def _update_scaling(self) -> None:
+        """
+        Вычисляет масштаб и смещение кадра на экране.
+
+        Вызывается только при смене режима экрана, а не каждый кадр.
+        """
+        self.scale_factor = min(
+            self.screen_width / self.display_width,
+            self.screen_height / self.display_height
+        )
+        scaled_width = int(self.display_width * self.scale_factor)
+        scaled_height = int(self.display_height * self.scale_factor)
+
+        # Центрируем отмасштабированную поверхность
+        self.screen_offset = (
+            (self.screen_width - scaled_width) // 2,
+            (self.screen_height - scaled_height) // 2
+        )
+
+        # Поверхность для ручного масштабирования переиспользуется между кадрами
+        if self.needs_scaling:
+            self._scaled_surface = pygame.Surface((scaled_width, scaled_height))
+        else:
+            self._scaled_surface = None
+
+    @property
+    def needs_scaling(self) -> bool:
+        """Нужно ли масштабировать кадр вручную перед выводом."""
+        return (self.fullscreen and not self.scaled_by_sdl and
+                (self.screen_width, self.screen_height) !=
+                (self.display_width, self.display_height))
 
     def update(self, dt: float) -> None:
         """
@@ -189,114 +519,571 @@ class GameEngine:
         Args:
             dt (float): Время с последнего обновления в секундах.
         """
-        if self.game_over or self.paused:
+        if self.client is not None:
+            # Шаги выполняет сервер, здесь только применяются его сообщения
+            if self.client.poll():
+                self._needs_redraw = True
+                self._client_update()
+            elif not self.client.connected and not self.game_over:
+                self._client_update()
             return
 
-        # Обновляем таймер движения
-        self.move_timer += dt * 1000  # Преобразуем в миллисекунды
-
-        if self.move_timer >= self.move_delay:
-            self.move_timer = 0
+        if self.game_over or self.paused:
+            return
 
-            # Двигаем змейку
-            self.snake.move()
+        # Выполняем столько шагов, сколько набралось за прошедшее время
+        for _ in range(self.scheduler.advance(dt)):
+            self._tick()
+            if self.game_over:
+                break
 
-            # Проверяем столкновение с яблоком (ИСПОЛЬЗУЕМ game_width и game_height)
-            if self.snake.check_collision(self.apple):
-                self.snake.grow()
-                self.score += self.apple.value
-                self.apple.respawn(self.game_width, self.game_height, self.grid_size)
+    def _tick(self) -> None:
+        """
+        Выполняет один шаг игровой логики.
+        """
+        if self.arena is not None:
+            self._arena_tick()
+            return
 
-                # Обновляем рекорд
-                if self.score > self.high_score:
-                    self.high_score = self.score
+        changed = self._tracked_cells()
+        if self.autopilot:
+            self.snake.set_direction(self.pilot.choose(self.simulation))
+        if self.recorder is not None:
+            self.recorder.step()
+        else:
+            self.simulation.step()
+        self._needs_redraw = True
+        if self.camera is not None:
+            # Перерисовываются только куски с изменившимися клетками
+            for cell in changed + self._tracked_cells():
+                self.chunks.invalidate(cell.x, cell.y)
+            self.camera.follow(self.snake.x, self.snake.y)
+        elif self.dirty_rects:
+            self._dirty_cells.update(changed)
+            self._dirty_cells.update(self._tracked_cells())
+
+        # Обновляем рекорд
+        if self.score > self.high_score:
+            self.high_score = self.score
+
+        if self.game_over:
+            self._save_result()
+            self._save_replay()
+
+    def _arena_tick(self) -> None:
+        """
+        Выполняет один шаг арены: ходы ботов, шаг всех змеек и появление
+        погибших ботов.
+        """
+        arena = self.arena
+        directions = {snake_id: arena.steer(snake_id) for snake_id in arena.snakes
+                      if snake_id != self.PLAYER_ID or self.autopilot}
+        arena.step(directions)
+        for bot_id in range(1, self.arena_bots + 1):
+            if bot_id not in arena.snakes:
+                arena.add_snake(bot_id)
+        self._needs_redraw = True
+
+        player = self._player
+        self.score = player.get_length() + player.grow_pending - Arena.START_LENGTH
+        if self.score > self.high_score:
+            self.high_score = self.score
+
+        if self.PLAYER_ID not in arena.snakes:
+            self.game_over = True
+            self._save_result()
+
+    def _client_update(self) -> None:
+        """
+        Переносит состояние сервера в счет и конец сетевой игры.
 
-            # Проверяем столкновения
-            if (self.snake.check_self_collision() or
-                self.snake.check_wall_collision(self.game_width, self.game_height)):
-                self.game_over = True
+        Игра заканчивается гибелью своей змейки или потерей подключения:
+        результат записывается, а поверх поля показывается конец игры.
+        Когда сервер снова ставит змейку на поле, начинается новая игра.
+        """
+        client = self.client
+        mirror = client.mirror
+        alive = client.connected and mirror.player_id in mirror.snakes
+        if alive:
+            if self.game_over:
+                # Сервер снова поставил змейку: новая игра
+                self.game_over = False
+            self._client_alive = True
+            # Счет - сколько змейка выросла с появления
+            self._score = max(0, mirror.length - Arena.START_LENGTH)
+            if self._score > self.high_score:
+                self.high_score = self._score
+        elif not self.game_over and (self._client_alive or not client.connected):
+            self.game_over = True
+            self._needs_redraw = True
+            if self._client_alive:
                 self._save_result()
+            self._client_alive = False
 
     def _save_result(self) -> None:
         """
-        Сохраняет результат игры в файл.
+        Ставит результат игры в очередь на запись в базу.
         """
-        result = {
+        self.result_writer.put({
             'player': self.player_name,
             'score': self.score,
-            'length': self.snake.get_length(),
+            'length': self._snake_length(),
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'speed': self.snake_speed,
-            'field_size': f"{self.original_width}x{self.original_height}",
+            'field_width': self.original_width,
+            'field_height': self.original_height,
             'grid_size': self.grid_size
-        }
+        })
 
-        with open('results.txt', 'a', encoding='utf-8') as f:
-            f.write(f"{result['timestamp']} | {result['player']} | "
-                   f"Очки: {result['score']} | "
-                   f"Длина: {result['length']} | "
-                   f"Скорость: {result['speed']} | "
-                   f"Поле: {result['field_size']} | "
-                   f"Сетка: {result['grid_size']}\n")
+    def _save_replay(self) -> None:
+        """
+        Сохраняет реплей игры, если задана папка для реплеев.
+        """
+        if self.recorder is None:
+            return
+
+        os.makedirs(self.replay_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(
+            self.replay_dir, f'replay_{timestamp}_{self.simulation.seed}.snkr'
+        )
+        self.recorder.save(path)
+
+    def _tracked_cells(self) -> List[Cell]:
+        """
+        Возвращает клетки, которые меняются при шаге змейки.
+
+        Returns:
+            List[Cell]: Голова, хвост и яблоко.
+        """
+        cells = [Cell(self.snake.x, self.snake.y), Cell(self.apple.x, self.apple.y)]
+        if self.snake.body:
+            cells.append(self.snake.body[-1])
+        return cells
+
+    def _ui_values(self) -> Tuple[int, int, int]:
+        """
+        Возвращает значения, которые меняются на панели статистики.
+
+        Returns:
+            Tuple[int, int, int]: Счет, рекорд и длина змейки.
+        """
+        return self.score, self.high_score, self._snake_length()
+
+    def _snake_length(self) -> int:
+        """
+        Возвращает длину своей змейки.
+
+        Returns:
+            int: Длина змейки; в сетевой игре - по состоянию сервера, а
+            после гибели - длина перед ней.
+        """
+        if self.client is not None:
+            if self.game_over:
+                return Arena.START_LENGTH + self._score
+            return self.client.mirror.length
+        return self.snake.get_length()
 
     def draw(self) -> None:
         """
         Отрисовывает игровое поле.
+
+        Если включена частичная перерисовка, после первого полного кадра
+        обновляются только изменившиеся клетки и панель статистики.
+        Полный кадр рисуется после смены режима экрана, событий окна,
+        перезапуска, а также пока показана пауза или конец игры.
         """
+        overlay = self.paused or self.game_over
+        if (self.dirty_rects and not self._full_redraw and not overlay
+                and not self.needs_scaling and self.client is None
+                and self.arena is None and self.camera is None):
+            self._draw_dirty()
+            self._needs_redraw = False
+            return
+
+        profiler = self.profiler
+
         # Очищаем игровую поверхность
         self.game_surface.fill((0, 0, 0))
 
-        # Рисуем игровое поле
-        self._draw_game_board()
+        if self.camera is not None:
+            # Видимые куски поля, голова рисуется поверх них каждый кадр
+            self.chunks.draw(self.game_surface, self.camera.rect)
+            profiler.lap('board')
+            self.snake.draw_head(self.game_surface, self.camera.offset)
+            profiler.lap('snake')
+        else:
+            # Рисуем игровое поле
+            self._draw_game_board()
+            profiler.lap('board')
 
-        # Рисуем игровые объекты
-        self.apple.draw(self.game_surface)
-        self.snake.draw(self.game_surface)
+            # Рисуем игровые объекты
+            self._draw_objects()
+            profiler.lap('snake')
 
         # Рисуем панель статистики
         self._draw_ui_panel()
+        profiler.lap('ui')
 
         # Рисуем сообщения поверх всего
         self._draw_messages()
+        profiler.lap('messages')
 
         # Масштабируем и центрируем на основном экране
         self._draw_to_screen()
 
-    def _draw_to_screen(self):
-        """Рисует игровую поверхность на основном экране."""
-        # Очищаем основной экран
-        self.screen.fill((0, 0, 0))
+        # После оверлея следующий кадр тоже должен быть полным
+        self._full_redraw = overlay
+        self._needs_redraw = False
+        self._dirty_cells.clear()
+        self._drawn_ui_values = self._ui_values()
 
-        if self.fullscreen:
-            # В полноэкранном режиме масштабируем всю поверхность целиком
-            scale_factor = min(
-                self.screen_width / self.display_width,
-                self.screen_height / self.display_height
-            )
+    def _draw_objects(self) -> None:
+        """
+        Рисует яблоки и змеек поверх поля, показанного целиком.
+        """
+        if self.client is not None:
+            mirror = self.client.mirror
+            self._draw_snakes(mirror.apples, mirror.snakes, mirror.player_id)
+        elif self.arena is not None:
+            arena = self.arena
+            self._draw_snakes(arena.apples, {snake_id: arena.body_cells(snake_id)
+                                             for snake_id in arena.snakes},
+                              self.PLAYER_ID)
+        else:
+            self.apple.draw(self.game_surface)
+            self.snake.draw(self.game_surface)
+
+    def _render_chunk(self, surface: pygame.Surface, key: Tuple[int, int]) -> None:
+        """
+        Рисует кусок большого поля: клетки, яблоко и тело змейки.
 
-            scaled_width = int(self.display_width * scale_factor)
-            scaled_height = int(self.display_height * scale_factor)
+        Занятые клетки находятся по сетке занятости змейки, поэтому
+        перерисовка куска не зависит от длины змейки. Голова рисуется в
+        куске как сегмент тела, а поверх кусков - отдельно в draw.
+
+        Args:
+            surface (pygame.Surface): Поверхность куска.
+            key (Tuple[int, int]): Столбец и строка куска.
+        """
+        chunk_cells = self.chunks.chunk_cells
+        chunk_size = self.chunks.chunk_size
+        offset = (key[0] * chunk_size, key[1] * chunk_size)
+
+        # Крайние куски заходят за поле, там остается черный фон
+        surface.fill((0, 0, 0))
+        surface.blit(self._get_board_surface(), (0, 0), pygame.Rect(
+            0, 0, self.game_width - offset[0], self.game_height - offset[1]
+        ))
+
+        apple = self.apple
+        if self.chunks.chunk_of(apple.x, apple.y) == key:
+            apple.draw(surface, offset)
+
+        snake = self.snake
+        size = self.grid_size
+        first_col = key[0] * chunk_cells
+        last_col = min(first_col + chunk_cells, snake.cols)
+        first_row = key[1] * chunk_cells
+        for row in range(first_row, min(first_row + chunk_cells, snake.rows)):
+            start = row * snake.cols
+            line = snake.occupancy[start + first_col:start + last_col]
+            if not any(line):
+                continue
+            for i, count in enumerate(line):
+                if count:
+                    snake.draw_segment(surface, Cell((first_col + i) * size, row * size),
+                                       offset)
+
+    def _draw_dirty(self) -> None:
+        """
+        Перерисовывает только изменившиеся клетки и панель статистики.
+        """
+        dirty = []
+        profiler = self.profiler
+        board = self._get_board_surface()
+
+        # Сначала восстанавливаем поле под всеми клетками, потом рисуем объекты
+        for cell in self._dirty_cells:
+            if not (0 <= cell.x < self.view_width and 0 <= cell.y < self.view_height):
+                continue
+
+            rect = pygame.Rect(cell.x, cell.y, self.grid_size, self.grid_size)
+            self.game_surface.blit(board, rect, rect)
+            dirty.append(rect)
+        profiler.lap('board')
+
+        touches_bottom = False
+        for rect in dirty:
+            if self.apple.x == rect.x and self.apple.y == rect.y:
+                self.apple.draw(self.game_surface)
+            if self.snake.is_head_at(rect.x, rect.y):
+                self.snake.draw_head(self.game_surface)
+            elif not self.snake.is_cell_free(rect.x, rect.y):
+                self.snake.draw_segment(self.game_surface, Cell(rect.x, rect.y))
+            touches_bottom = touches_bottom or rect.bottom >= self.view_height
+        self._dirty_cells.clear()
+        profiler.lap('snake')
+
+        # Линия панели статистики заходит на нижний ряд клеток
+        if touches_bottom:
+            self._draw_ui_separator()
+
+        ui_values = self._ui_values()
+        if ui_values != self._drawn_ui_values:
+            self._draw_ui_panel()
+            self._drawn_ui_values = ui_values
+            dirty.append(pygame.Rect(0, self.view_height, self.display_width, self.ui_height))
+        profiler.lap('ui')
+
+        # Сообщения паузы и конца игры рисуются только в полном кадре
+        profiler.lap('messages')
+
+        # Без окна фазы вывода пустые, но отмечаются, как и в полном кадре
+        on_screen = not self.headless
+        if on_screen:
+            for rect in dirty:
+                self.screen.blit(self.game_surface, rect, rect)
+        profiler.lap('screen')
+
+        if on_screen and self.show_profiler:
+            # Клетки под панелью могли стереть ее, рисуем заново поверх кадра
+            rect = self._draw_profiler()
+            self.screen.blit(self.game_surface, rect, rect)
+            self.screen.blit(self._profiler_surface, rect)
+            dirty.append(rect)
+        profiler.lap('profiler')
+
+        if on_screen and dirty:
+            pygame.display.update(dirty)
+        profiler.lap('flip')
+
+    def _draw_snakes(self, apples: List[int], snakes: Dict[int, Iterable[int]],
+                     player_id: int) -> None:
+        """
+        Рисует яблоки и змеек, заданных номерами клеток.
 
-            scaled_surface = pygame.transform.scale(self.game_surface, (scaled_width, scaled_height))
+        Используется в сетевой игре и на арене. Своя змейка рисуется
+        цветами обычной игры, чужие - цветами из REMOTE_COLORS по номеру
+        змейки.
 
-            # Центрируем отмасштабированную поверхность
-            x_pos = (self.screen_width - scaled_width) // 2
-            y_pos = (self.screen_height - scaled_height) // 2
+        Args:
+            apples (List[int]): Клетки яблок; -1 - яблока нет.
+            snakes (Dict[int, Iterable[int]]): Клетки змеек от головы к хвосту.
+            player_id (int): Номер своей змейки.
+        """
+        cols = self.game_width // self.grid_size
+        size = self.grid_size
+        surface = self.game_surface
+
+        for cell in apples:
+            if cell >= 0:
+                rect = ((cell % cols) * size, (cell // cols) * size, size, size)
+                pygame.draw.rect(surface, self.APPLE_COLOR, rect)
+
+        for snake_id, body in snakes.items():
+            if snake_id == player_id:
+                head_color = self._player_colors[0]
+                body_color = self._player_colors[1][0]
+            else:
+                head_color = body_color = self.REMOTE_COLORS[snake_id % len(self.REMOTE_COLORS)]
+            for i, cell in enumerate(body):
+                rect = ((cell % cols) * size, (cell // cols) * size, size, size)
+                pygame.draw.rect(surface, head_color if i == 0 else body_color, rect)
+                pygame.draw.rect(surface, (0, 0, 0), rect, 1)
 
-            self.screen.blit(scaled_surface, (x_pos, y_pos))
+    def _draw_to_screen(self):
+        """
+        Рисует игровую поверхность на основном экране.
+
+        Без окна ничего не рисует, но отмечает те же фазы профилировщика.
+        """
+        profiler = self.profiler
+        if self.headless:
+            for phase in ('screen', 'profiler', 'flip'):
+                profiler.lap(phase)
+            return
+
+        if self.needs_scaling:
+            # Поля вокруг кадра нужно очищать только при полной перерисовке
+            self.screen.fill((0, 0, 0))
+
+            # Масштабируем в заранее созданную поверхность без новых выделений памяти
+            pygame.transform.scale(
+                self.game_surface,
+                self._scaled_surface.get_size(),
+                self._scaled_surface
+            )
+            self.screen.blit(self._scaled_surface, self.screen_offset)
         else:
-            # В оконном режиме просто отображаем
+            # Кадр выводится как есть, при SCALED его растягивает SDL
             self.screen.blit(self.game_surface, (0, 0))
+        profiler.lap('screen')
+
+        if self.show_profiler:
+            rect = self._draw_profiler()
+            self.screen.blit(self._profiler_surface, rect)
+        profiler.lap('profiler')
 
         # Обновляем экран
         pygame.display.flip()
+        profiler.lap('flip')
+
+    def _draw_profiler(self) -> pygame.Rect:
+        """
+        Обновляет панель перцентилей времени кадра не чаще двух раз в секунду.
+
+        Панель рисуется прямо на экране поверх готового кадра и не попадает
+        на игровую поверхность.
+
+        Returns:
+            pygame.Rect: Область панели на экране.
+        """
+        now = time.perf_counter()
+        if self._profiler_surface is None or now - self._profiler_updated >= 0.5:
+            self._profiler_updated = now
+            lines = ['фаза       p50    p95    p99 мс']
+            for phase in self.profiler.PHASES + ('total',):
+                p50, p95, p99 = self.profiler.percentiles(phase)
+                lines.append(f'{phase:8s} {p50:6.2f} {p95:6.2f} {p99:6.2f}')
+
+            # Моноширинный шрифт для ровных столбцов; ищется только при первом показе
+            if self._profiler_font is None:
+                self._profiler_font = pygame.font.SysFont('monospace', 18)
+
+            # Текст меняется каждый раз, поэтому мимо кэша
+            rendered = [self._profiler_font.render(line, True, self.ui_text_color)
+                        for line in lines]
+            line_height = max(text.get_height() for text in rendered)
+            width = max(text.get_width() for text in rendered) + 16
+            self._profiler_surface = pygame.Surface(
+                (width, line_height * len(lines) + 16), pygame.SRCALPHA
+            )
+            self._profiler_surface.fill((0, 0, 0, 180))
+            for i, text in enumerate(rendered):
+                self._profiler_surface.blit(text, (8, 8 + i * line_height))
+
+        return self._profiler_surface.get_rect(topleft=(8, 8))
+
+    def capture_frame(self, per_cell: bool = False) -> np.ndarray:
+        """
+        Возвращает текущий кадр как массив NumPy.
+
+        Кадр копируется из game_surface в буфер, созданный один раз, поэтому
+        при каждом вызове возвращается тот же массив с новым содержимым.
+        Чтобы сохранить кадр, вызывающий код должен сделать copy().
+
+        Args:
+            per_cell (bool): Вернуть по одному пикселю на клетку поля (цвет
+                центра клетки) без панели статистики.
+
+        Returns:
+            np.ndarray: Массив uint8 формы (ширина, высота, 3) в порядке
+            осей pygame.surfarray; при per_cell - (столбцы, строки, 3).
+        """
+        if self._needs_redraw:
+            self.draw()
+
+        # pixels3d не копирует пиксели, но блокирует поверхность, пока жив массив
+        pixels = pygame.surfarray.pixels3d(self.game_surface)
+        try:
+            if per_cell:
+                center = self.grid_size // 2
+                source = pixels[center:self.view_width:self.grid_size,
+                                center:self.view_height:self.grid_size]
+                if self._cell_buffer is None or self._cell_buffer.shape != source.shape:
+                    self._cell_buffer = self._new_frame_buffer(source.shape)
+                buffer = self._cell_buffer
+            else:
+                source = pixels
+                if self._frame_buffer is None or self._frame_buffer.shape != source.shape:
+                    self._frame_buffer = self._new_frame_buffer(source.shape)
+                buffer = self._frame_buffer
+            np.copyto(buffer, source)
+        finally:
+            # Срез тоже ссылается на пиксели, освобождаем оба
+            source = None
+            del pixels
+        return buffer
+
+    @staticmethod
+    def _new_frame_buffer(shape: Tuple[int, int, int]) -> np.ndarray:
+        """
+        Создает буфер кадра с тем же порядком строк в памяти, что у поверхности.
+
+        Массивы surfarray индексируются (x, y), но в памяти идут по строкам,
+        поэтому буфер создается как (y, x, 3) и транспонируется: копирование
+        идет подряд, а не вразброс.
+        """
+        width, height, channels = shape
+        return np.empty((height, width, channels), dtype=np.uint8).transpose(1, 0, 2)
+
+    def step_frame(self, action: Optional[Tuple[int, int]] = None,
+                   per_cell: bool = False) -> np.ndarray:
+        """
+        Выполняет ровно один шаг змейки и возвращает получившийся кадр.
+
+        Время и пауза не учитываются, поэтому игра идет с той скоростью, с
+        какой вызывающий код запрашивает кадры.
+
+        Args:
+            action (Optional[Tuple[int, int]]): Новое направление или None.
+            per_cell (bool): Вернуть по одному пикселю на клетку поля.
+
+        Returns:
+            np.ndarray: Кадр, как в capture_frame.
+        """
+        if not self.game_over:
+            if action is not None:
+                self.snake.set_direction(action)
+            self._tick()
+        return self.capture_frame(per_cell)
 
     def _draw_game_board(self) -> None:
         """
-        Рисует игровое поле в шахматном порядке.
+        Рисует игровое поле из кэша одним вызовом blit.
+        """
+        self.game_surface.blit(self._get_board_surface(), (0, 0))
+
+    def _get_board_surface(self) -> pygame.Surface:
         """
-        cols = self.game_width // self.grid_size  # ИСПОЛЬЗУЕМ game_width
-        rows = self.game_height // self.grid_size  # ИСПОЛЬЗУЕМ game_height
+        Возвращает закэшированное поле, перестраивая его при изменении
+        размеров или цветов.
+
+        В режиме камеры поле целиком не рисуется, а возвращается фон одного
+        куска: сторона куска - четное число клеток, поэтому шахматный фон у
+        всех кусков одинаковый.
+
+        Returns:
+            pygame.Surface: Поверхность с полем.
+        """
+        if self.chunks is not None:
+            width = height = self.chunks.chunk_size
+        else:
+            width, height = self.game_width, self.game_height
+        key = (width, height, self.grid_size,
+               tuple(self.color1), tuple(self.color2))
+        if self._board_key != key:
+            self._board_surface = self._render_game_board(width, height)
+            self._board_key = key
+        return self._board_surface
+
+    def _render_game_board(self, width: int = None, height: int = None) -> pygame.Surface:
+        """
+        Рисует игровое поле в шахматном порядке на отдельной поверхности.
+
+        Args:
+            width (int): Ширина поверхности; по умолчанию ширина поля.
+            height (int): Высота поверхности; по умолчанию высота поля.
+
+        Returns:
+            pygame.Surface: Поверхность с полем.
+        """
+        if width is None:
+            width, height = self.game_width, self.game_height
+        board = pygame.Surface((width, height))
+        cols = width // self.grid_size
+        rows = height // self.grid_size
 
         for row in range(rows):
             for col in range(cols):
@@ -313,64 +1100,88 @@ class GameEngine:
                     self.grid_size,
                     self.grid_size
                 )
-                pygame.draw.rect(self.game_surface, color, rect)
+                pygame.draw.rect(board, color, rect)
 
                 # Добавляем обводку
-                pygame.draw.rect(self.game_surface, (40, 40, 40), rect, 1)
+                pygame.draw.rect(board, (40, 40, 40), rect, 1)
+
+        return board
+
+    def _draw_ui_separator(self) -> pygame.Rect:
+        """
+        Рисует линию между полем и панелью статистики.
+
+        Returns:
+            pygame.Rect: Область, занятая линией.
+        """
+        return pygame.draw.line(
+            self.game_surface, self.ui_accent_color,
+            (0, self.view_height), (self.display_width, self.view_height), 3
+        )
 
     def _draw_ui_panel(self) -> None:
         """
         Рисует панель статистики.
         """
         # Фон панели статистики
-        ui_rect = pygame.Rect(0, self.game_height, self.display_width, self.ui_height)
+        ui_rect = pygame.Rect(0, self.view_height, self.display_width, self.ui_height)
         pygame.draw.rect(self.game_surface, self.ui_bg_color, ui_rect)
 
         # Разделительная линия
-        pygame.draw.line(
-            self.game_surface, self.ui_accent_color,
-            (0, self.game_height), (self.display_width, self.game_height), 3
-        )
+        self._draw_ui_separator()
 
         # Текст статистики
-        y_offset = self.game_height + 10
+        y_offset = self.view_height + 10
 
         # Имя игрока и скорость
-        player_text = self.font.render(
-            f'Игрок: {self.player_name}', True, self.ui_text_color
+        player_text = self.text_cache.render(
+            self.font, f'Игрок: {self.player_name}', self.ui_text_color
         )
         self.game_surface.blit(player_text, (20, y_offset))
 
-        speed_text = self.font.render(
-            f'Скорость: {self.snake_speed}', True, self.ui_text_color
+        speed_text = self.text_cache.render(
+            self.font, f'Скорость: {self.snake_speed}', self.ui_text_color
         )
         self.game_surface.blit(speed_text, (self.display_width // 3, y_offset))
 
         # Размер поля
-        field_text = self.font.render(
-            f'Поле: {self.original_width}x{self.original_height}', True, self.ui_text_color
+        field_text = self.text_cache.render(
+            self.font, f'Поле: {self.original_width}x{self.original_height}', self.ui_text_color
         )
         self.game_surface.blit(field_text, (2 * self.display_width // 3, y_offset))
 
         # Счет и рекорд
         y_offset += 40
 
-        score_text = self.font.render(
-            f'Очки: {self.score}', True, (255, 255, 100)
+        score_text = self.text_cache.render(
+            self.font, f'Очки: {self.score}', (255, 255, 100)
         )
         self.game_surface.blit(score_text, (20, y_offset))
 
-        high_score_text = self.font.render(
-            f'Рекорд: {self.high_score}', True, (255, 200, 50)
+        high_score_text = self.text_cache.render(
+            self.font, f'Рекорд: {self.high_score}', (255, 200, 50)
         )
         self.game_surface.blit(high_score_text, (self.display_width // 3, y_offset))
 
         # Длина змейки
-        length_text = self.font.render(
-            f'Длина: {self.snake.get_length()}', True, (100, 255, 100)
+        length_text = self.text_cache.render(
+            self.font, f'Длина: {self._snake_length()}', (100, 255, 100)
         )
         self.game_surface.blit(length_text, (2 * self.display_width // 3, y_offset))
 
+    def _get_overlay_surface(self) -> pygame.Surface:
+        """
+        Возвращает полупрозрачный фон для сообщений, создавая его один раз
+        для текущего размера поля.
+
+        Returns:
+            pygame.Surface: Поверхность затемнения.
+        """
+        size = (self.view_width, self.view_height)
+        if self._overlay_surface is None or self._overlay_surface.get_size() != size:
+            self._overlay_surface = pygame.Surface(size, pygame.SRCALPHA)
+            self._overlay_surface.fill((0, 0, 0, 150))  # Полупрозрачный черный
+        return self._overlay_surface
 
     def _draw_messages(self) -> None:
         """
@@ -378,43 +1189,51 @@ class GameEngine:
         """
         if self.paused:
             # Полупрозрачный фон
-            overlay = pygame.Surface((self.game_width, self.game_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))  # Полупрозрачный черный
-            self.game_surface.blit(overlay, (0, 0))
+            self.game_surface.blit(self._get_overlay_surface(), (0, 0))
 
-            pause_text = self.big_font.render('ПАУЗА', True, (255, 255, 0))
-            text_rect = pause_text.get_rect(center=(self.game_width//2, self.game_height//2))
+            pause_text = self.text_cache.render(
+                self.big_font, 'ПАУЗА', (255, 255, 0)
+            )
+            text_rect = pause_text.get_rect(center=(self.view_width//2, self.view_height//2))
             self.game_surface.blit(pause_text, text_rect)
 
-            hint_text = self.font.render(
-                'Нажмите ПРОБЕЛ чтобы продолжить',
-                True, (200, 200, 200)
+            hint_text = self.text_cache.render(
+                self.font, 'Нажмите ПРОБЕЛ чтобы продолжить', (200, 200, 200)
             )
-            hint_rect = hint_text.get_rect(center=(self.game_width//2, self.game_height//2 + 50))
+            hint_rect = hint_text.get_rect(center=(self.view_width//2, self.view_height//2 + 50))
             self.game_surface.blit(hint_text, hint_rect)
 
         elif self.game_over:
             # Полупрозрачный фон
-            overlay = pygame.Surface((self.game_width, self.game_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))  # Полупрозрачный черный
-            self.game_surface.blit(overlay, (0, 0))
+            self.game_surface.blit(self._get_overlay_surface(), (0, 0))
 
-            game_over_text = self.big_font.render('ИГРА ОКОНЧЕНА', True, (255, 50, 50))
-            text_rect = game_over_text.get_rect(center=(self.game_width//2, self.game_height//2 - 50))
+            if self.simulation is not None and self.simulation.won:
+                game_over_text = self.text_cache.render(
+                    self.big_font, 'ПОБЕДА!', (255, 255, 0)
+                )
+            else:
+                game_over_text = self.text_cache.render(
+                    self.big_font, 'ИГРА ОКОНЧЕНА', (255, 50, 50)
+                )
+            text_rect = game_over_text.get_rect(center=(self.view_width//2, self.view_height//2 - 50))
             self.game_surface.blit(game_over_text, text_rect)
 
-            score_text = self.font.render(
-                f'Ваш счет: {self.score} | Длина: {self.snake.get_length()}',
-                True, (255, 255, 255)
+            score_text = self.text_cache.render(
+                self.font, f'Ваш счет: {self.score} | Длина: {self._snake_length()}', (255, 255, 255)
             )
-            score_rect = score_text.get_rect(center=(self.game_width//2, self.game_height//2))
+            score_rect = score_text.get_rect(center=(self.view_width//2, self.view_height//2))
             self.game_surface.blit(score_text, score_rect)
 
-            restart_text = self.font.render(
-                'Нажмите ПРОБЕЛ чтобы начать заново',
-                True, (200, 200, 200)
+            if self.client is None:
+                restart = 'Нажмите ПРОБЕЛ чтобы начать заново'
+            elif self.client.connected:
+                restart = 'Змейка скоро появится снова'
+            else:
+                restart = 'Соединение с сервером потеряно'
+            restart_text = self.text_cache.render(
+                self.font, restart, (200, 200, 200)
             )
-            restart_rect = restart_text.get_rect(center=(self.game_width//2, self.game_height//2 + 50))
+            restart_rect = restart_text.get_rect(center=(self.view_width//2, self.view_height//2 + 50))
             self.game_surface.blit(restart_text, restart_rect)
 
     def run(self) -> None:
@@ -424,14 +1243,51 @@ class GameEngine:
         running = True
 
         while running:
+            # Пока кадр не изменился, спим до следующего шага или события
+            if not self._needs_redraw:
+                self._wait_for_work()
+
             dt = self.clock.tick(self.fps) / 1000.0
+            self.profiler.start_frame()
 
             running = self.handle_events()
+            self.profiler.lap('events')
             self.update(dt)
-            self.draw()
+            self.profiler.lap('update')
+            if self._needs_redraw:
+                self.draw()
+                # В статистику попадают только нарисованные кадры
+                self.profiler.end_frame()
 
+        if self.profile_csv is not None:
+            self.profiler.dump_csv(self.profile_csv)
+
+        if self.client is not None:
+            self.client.close()
+
+        # Дописываем результаты до закрытия окна
+        self.result_writer.close()
         pygame.quit()
 
+    def _wait_for_work(self) -> None:
+        """
+        Блокирует цикл до следующего шага змейки или до прихода события.
+
+        На паузе и после конца игры шагов нет, поэтому ждем только событие.
+        Полученное событие возвращается в очередь для handle_events.
+        """
+        if self.client is not None:
+            # Сообщения сервера не приходят событиями Pygame
+            timeout = max(1, 1000 // self.client.mirror.rate)
+        elif self.paused or self.game_over:
+            timeout = 0  # Ждать без ограничения
+        else:
+            timeout = max(1, int(self.scheduler.time_to_next_tick() * 1000))
+
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+
 
 class GameLauncher:
     """
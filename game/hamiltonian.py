@@ -0,0 +1,257 @@
+"""
+Решатель, который ведет змейку по гамильтонову циклу поля.
+"""
+
+from array import array
+from typing import List, Tuple
+from .simulation import Simulation
+
+
+def build_cycle(cols: int, rows: int) -> List[int]:
+    """
+    Строит гамильтонов цикл поля.
+
+    Первая строка проходится слева направо, следующие строки змейкой
+    без нулевого столбца, а по нулевому столбцу цикл возвращается к
+    началу. Для этого нужно четное число строк; если оно нечетное, а
+    столбцов четное, строится транспонированный цикл.
+
+    Если обе стороны нечетные, цикла через все клетки не существует
+    (клеток нечетное число, а в клетчатом поле каждый цикл четной длины).
+    Тогда последняя строка обходится петлями из предпоследней, а правый
+    нижний угол остается вне цикла. Его соседи в цикле идут подряд:
+    (cols - 1, rows - 2), (cols - 2, rows - 2), (cols - 2, rows - 1), так
+    что средняя клетка этой тройки и угол взаимозаменяемы.
+
+    Args:
+        cols (int): Количество клеток по горизонтали.
+        rows (int): Количество клеток по вертикали.
+
+    Returns:
+        List[int]: Индексы клеток ``row * cols + col`` в порядке обхода.
+
+    Raises:
+        ValueError: Если поле уже двух клеток.
+    """
+    if cols < 2 or rows < 2:
+        raise ValueError(f"Поле {cols}x{rows} слишком узкое для цикла")
+
+    if rows % 2 and not cols % 2:
+        # Транспонируем цикл поля rows x cols
+        return [(i % rows) * cols + i // rows for i in build_cycle(rows, cols)]
+
+    # При нечетных сторонах последняя строка добавляется петлями
+    height = rows - 1 if rows % 2 else rows
+    cells = [(col, 0) for col in range(cols)]
+    for row in range(1, height):
+        if row % 2:
+            cells.extend((col, row) for col in range(cols - 1, 0, -1))
+        else:
+            cells.extend((col, row) for col in range(1, cols))
+    cells.extend((0, row) for row in range(height - 1, 0, -1))
+
+    if height < rows:
+        last = rows - 1
+        bumped = []
+        for col, row in cells:
+            bumped.append((col, row))
+            # Ребро (col, last - 1) -> (col - 1, last - 1) идет через нижнюю строку
+            if row == last - 1 and col % 2:
+                bumped.extend(((col, last), (col - 1, last)))
+        cells = bumped
+
+    return [row * cols + col for col, row in cells]
+
+
+class HamiltonianSolver:
+    """
+    Ведет змейку по гамильтонову циклу, срезая путь там, где это безопасно.
+
+    Пока змейка идет по циклу, ее тело уложено по циклу от хвоста к голове,
+    и все клетки впереди головы до хвоста свободны, поэтому следующая
+    клетка цикла всегда доступна. Срезка - ход в соседнюю клетку дальше
+    по циклу - сохраняет этот порядок, если не перепрыгивает яблоко и
+    оставляет до хвоста запас на рост.
+
+    Перепрыгнутые клетки остаются свободными внутри тела, пока их не
+    пройдет хвост. Чтобы голова не уперлась в хвост раньше, срезка
+    разрешена, только если после нее зазор до хвоста длиннее тела и
+    вмещает отложенный рост. К концу игры зазор сокращается, срезки
+    прекращаются сами, и змейка заполняет поле строго по циклу.
+
+    Если обе стороны поля нечетные, цикла через все клетки нет, и угол
+    остается вне цикла. Когда в него попадает яблоко, он меняется местами
+    с соседом по диагонали, если тот свободен, а на последнем круге, когда
+    свободно не больше двух клеток, змейка заходит в угол из соседней
+    клетки цикла. Заполнить такое поле удается не всегда: последнее яблоко
+    появляется в одной из двух клеток случайно, и выиграть можно не больше
+    чем в половине игр. Иначе игра заканчивается столкновением при длине
+    на клетку-две меньше поля.
+
+    Attributes:
+        cols (int): Количество клеток поля по горизонтали.
+        rows (int): Количество клеток поля по вертикали.
+        cycle (array): Клетки в порядке обхода.
+        order (array): Номер каждой клетки в цикле или -1.
+    """
+
+    def __init__(self, cols: int, rows: int):
+        """
+        Строит цикл для поля заданного размера.
+
+        Args:
+            cols (int): Количество клеток по горизонтали.
+            rows (int): Количество клеток по вертикали.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.cycle = array('i', build_cycle(cols, rows))
+        self.order = array('i', [-1]) * (cols * rows)
+        for position, cell in enumerate(self.cycle):
+            self.order[cell] = position
+
+        # Клетка вне цикла и позиция, которую она может занять
+        self._spare = -1
+        self._slot = -1
+        if len(self.cycle) < cols * rows:
+            self._spare = cols * rows - 1
+            self._slot = self.order[self._spare - cols - 1]
+
+        # Сколько ходов подряд сделано вперед по циклу и куда ведет последний
+        self._streak = 0
+        self._expected = -1
+        # Направление по разности индексов соседних клеток
+        self._moves = {1: (1, 0), -1: (-1, 0), cols: (0, 1), -cols: (0, -1)}
+
+    @classmethod
+    def for_simulation(cls, simulation: Simulation) -> 'HamiltonianSolver':
+        """
+        Создает решатель под поле симуляции.
+
+        Args:
+            simulation (Simulation): Игра.
+
+        Returns:
+            HamiltonianSolver: Новый решатель.
+        """
+        return cls(simulation.snake.cols, simulation.snake.rows)
+
+    def choose(self, simulation: Simulation) -> Tuple[int, int]:
+        """
+        Выбирает направление на следующий шаг.
+
+        Args:
+            simulation (Simulation): Игра, для которой выбирается ход.
+
+        Returns:
+            Tuple[int, int]: Направление (dx, dy) для Snake.set_direction.
+        """
+        snake = simulation.snake
+        order = self.order
+        cycle = self.cycle
+        size = len(cycle)
+
+        head = snake.cell_index(snake.x, snake.y)
+        if head != self._expected:
+            # Змейку двигал кто-то другой, порядок тела по циклу неизвестен
+            self._streak = 0
+        position = order[head] if head >= 0 else -1
+
+        tail = snake.body.index_at(-1) if snake.body else head
+        leaving = tail if snake.grow_pending == 0 else -1
+
+        apple = snake.cell_index(simulation.apple.x, simulation.apple.y)
+        if apple == self._spare and apple >= 0:
+            if snake.occupancy[cycle[self._slot]] == 0:
+                # Яблоко в клетке вне цикла: она встает в цикл вместо соседа
+                self._swap_spare()
+            elif (len(simulation.free_cells) <= 2
+                  and apple in self._neighbours(head)
+                  and self._final_exit(simulation, apple, head)):
+                # Последний круг: сосед по диагонали занят, и угол можно взять
+                # только заходом из соседней клетки цикла
+                self._streak = 0
+                self._expected = apple
+                return self._moves[apple - head]
+
+        successor = cycle[(position + 1) % size] if position >= 0 else -1
+        if successor < 0 or not self._is_free(snake, successor, leaving):
+            # Голова еще не встала на цикл: любой ход в свободную клетку
+            self._streak = 0
+            for cell in self._neighbours(head):
+                if self._is_free(snake, cell, leaving):
+                    self._expected = cell
+                    return self._moves[cell - head]
+            return snake.direction
+
+        best = successor
+        # Срезать можно, только когда все тело уложено ходами вперед по циклу:
+        # тогда все клетки цикла от головы до хвоста свободны
+        if self._streak > len(snake.body) and order[tail] >= 0:
+            to_tail = (order[tail] - position) % size
+            # Цель должна лежать между головой и хвостом, и после прыжка до
+            # хвоста остается запас на весь отложенный рост
+            limit = to_tail - snake.grow_pending - 1
+            # Перепрыгнутые клетки остаются свободными позади головы, и хвост
+            # освободит их, только пройдя все тело. Поэтому зазор после прыжка
+            # должен быть длиннее тела: иначе голова догонит хвост раньше,
+            # чем дыры закроются
+            limit = min(limit, to_tail - 2 - snake.grow_pending
+                        - len(snake.body))
+            if apple >= 0 and order[apple] >= 0:
+                # Яблоко впереди не перепрыгиваем
+                limit = min(limit, (order[apple] - position) % size)
+            best_jump = 1
+            for cell in self._neighbours(head):
+                jump = (order[cell] - position) % size
+                if (order[cell] >= 0 and best_jump < jump <= limit
+                        and snake.occupancy[cell] == 0):
+                    best, best_jump = cell, jump
+
+        self._streak += 1
+        self._expected = best
+        return self._moves[best - head]
+
+    def _final_exit(self, simulation: Simulation, spare: int, head: int) -> bool:
+        """
+        Проверяет, можно ли зайти в угол вне цикла на последнем круге.
+
+        Если угол - последняя свободная клетка, заход в нее выигрывает игру.
+        Иначе после него змейке нужна свободная клетка рядом с углом, куда
+        появится следующее яблоко.
+        """
+        free_cells = simulation.free_cells
+        if len(free_cells) == 1:
+            return True
+        occupancy = simulation.snake.occupancy
+        return any(occupancy[cell] == 0 and cell != head
+                   for cell in self._neighbours(spare))
+
+    def _neighbours(self, cell: int) -> List[int]:
+        """Соседние клетки поля."""
+        cols = self.cols
+        col = cell % cols
+        result = []
+        if col > 0:
+            result.append(cell - 1)
+        if col < cols - 1:
+            result.append(cell + 1)
+        if cell >= cols:
+            result.append(cell - cols)
+        if cell + cols < len(self.order):
+            result.append(cell + cols)
+        return result
+
+    @staticmethod
+    def _is_free(snake, cell: int, leaving: int) -> bool:
+        """Проверяет, можно ли шагнуть в клетку: она пуста или ее покидает хвост."""
+        count = snake.occupancy[cell]
+        return count == 0 or (cell == leaving and count == 1)
+
+    def _swap_spare(self) -> None:
+        """Меняет местами угол вне цикла и его соседа в цикле."""
+        inside = self.cycle[self._slot]
+        self.cycle[self._slot] = self._spare
+        self.order[self._spare] = self._slot
+        self.order[inside] = -1
+        self._spare = inside
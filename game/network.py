@@ -0,0 +1,601 @@
+"""
+Сетевая игра: сервер на asyncio и клиент для GameEngine.
+
+Сервер ведет арену и на каждом шаге рассылает изменения, а не состояние
+целиком. Сообщение::
+
+    длина данных (u32) | тип (u8) | данные
+
+WELCOME (сервер -> клиент, один раз): номер игрока, размеры поля,
+частота шагов и полный снимок арены.
+
+TICK (сервер -> все клиенты, каждый шаг): номер шага, новые змейки с
+телами, убранные змейки, по одному байту на каждую змейку и переставленные
+яблоки. Биты байта змейки: 0-1 - направление головы (индекс в
+``Simulation.ACTIONS``), 2 - змейка выросла и хвост остался на месте,
+3 - змейка погибла. Новая голова получается сдвигом старой на
+направление, поэтому клетки тела не передаются. Байты идут в порядке
+номеров змеек, которые есть у клиента после добавления новых и удаления
+убранных змеек.
+
+INPUT (клиент -> сервер): индекс направления в ``Simulation.ACTIONS``.
+Сообщение клиента длиннее MAX_CLIENT_PAYLOAD сервер не читает и закрывает
+подключение.
+
+Все количества (змеек, убранных змеек, яблок) и номера яблок - u16.
+"""
+
+import asyncio
+import heapq
+import socket
+import struct
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from .arena import Arena
+from .scheduler import TickScheduler
+from .simulation import Simulation
+
+# Типы сообщений
+WELCOME = 1
+TICK = 2
+INPUT = 3
+
+# Предел данных одного сообщения клиента; INPUT занимает один байт
+MAX_CLIENT_PAYLOAD = 64
+
+# Флаги байта змейки в TICK
+GROWN = 4
+DIED = 8
+
+_FRAME = struct.Struct('<IB')
+_WELCOME = struct.Struct('<HHHHHI')
+_TICK = struct.Struct('<I')
+_SNAKE = struct.Struct('<HBI')
+_COUNT = struct.Struct('<H')
+_APPLE = struct.Struct('<Hi')
+
+# Индекс направления вправо: так смотрят новые змейки
+_RIGHT = Simulation.ACTIONS.index((1, 0))
+
+
+def encode_frame(kind: int, payload: bytes) -> bytes:
+    """
+    Добавляет к данным заголовок сообщения.
+
+    Args:
+        kind (int): Тип сообщения.
+        payload (bytes): Данные.
+
+    Returns:
+        bytes: Сообщение целиком.
+    """
+    return _FRAME.pack(len(payload), kind) + payload
+
+
+def encode_snake(snake_id: int, direction: int, cells: List[int]) -> bytes:
+    """
+    Кодирует змейку целиком для снимка или появления.
+
+    Args:
+        snake_id (int): Номер змейки.
+        direction (int): Индекс направления в Simulation.ACTIONS.
+        cells (List[int]): Клетки от головы к хвосту.
+
+    Returns:
+        bytes: Запись змейки.
+    """
+    return (_SNAKE.pack(snake_id, direction, len(cells))
+            + struct.pack(f'<{len(cells)}I', *cells))
+
+
+def encode_welcome(player_id: int, arena: Arena, rate: int) -> bytes:
+    """
+    Кодирует приветствие с полным снимком арены.
+
+    Args:
+        player_id (int): Номер игрока, он же номер его змейки.
+        arena (Arena): Арена.
+        rate (int): Шагов в секунду.
+
+    Returns:
+        bytes: Сообщение WELCOME.
+    """
+    parts = [_WELCOME.pack(player_id, arena.cols, arena.rows, arena.grid_size,
+                           rate, arena.ticks),
+             _COUNT.pack(len(arena.apples))]
+    parts.extend(struct.pack('<i', cell) for cell in arena.apples)
+    parts.append(_COUNT.pack(len(arena.snakes)))
+    for snake_id in sorted(arena.snakes):
+        snake = arena.snakes[snake_id]
+        parts.append(encode_snake(snake_id, Simulation.ACTIONS.index(snake.direction),
+                                  arena.body_cells(snake_id)))
+    return encode_frame(WELCOME, b''.join(parts))
+
+
+def encode_tick(tick: int, spawned: List[bytes], removed: List[int],
+                events: List[Tuple[int, int, bool, bool]],
+                moved_apples: List[Tuple[int, int]]) -> bytes:
+    """
+    Кодирует изменения за один шаг.
+
+    Args:
+        tick (int): Номер шага.
+        spawned (List[bytes]): Записи encode_snake новых змеек.
+        removed (List[int]): Номера змеек, убранных с поля.
+        events (List[Tuple[int, int, bool, bool]]): Результат Arena.step.
+        moved_apples (List[Tuple[int, int]]): Переставленные яблоки.
+
+    Returns:
+        bytes: Сообщение TICK.
+    """
+    moves = bytes(direction | (GROWN if grew else 0) | (DIED if died else 0)
+                  for _, direction, grew, died in events)
+    parts = [_TICK.pack(tick), _COUNT.pack(len(spawned))]
+    parts.extend(spawned)
+    parts.append(_COUNT.pack(len(removed)))
+    parts.extend(_COUNT.pack(snake_id) for snake_id in removed)
+    parts.append(_COUNT.pack(len(moves)))
+    parts.append(moves)
+    parts.append(_COUNT.pack(len(moved_apples)))
+    parts.extend(_APPLE.pack(slot, cell) for slot, cell in moved_apples)
+    return encode_frame(TICK, b''.join(parts))
+
+
+class FrameDecoder:
+    """
+    Собирает сообщения из кусков потока.
+    """
+
+    def __init__(self):
+        """Создает пустой декодер."""
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Tuple[int, bytes]]:
+        """
+        Добавляет байты и возвращает сообщения, пришедшие целиком.
+
+        Args:
+            data (bytes): Очередной кусок потока.
+
+        Returns:
+            List[Tuple[int, bytes]]: Пары (тип, данные).
+        """
+        buffer = self._buffer
+        buffer.extend(data)
+        frames = []
+        offset = 0
+        while len(buffer) - offset >= _FRAME.size:
+            length, kind = _FRAME.unpack_from(buffer, offset)
+            end = offset + _FRAME.size + length
+            if end > len(buffer):
+                break
+            frames.append((kind, bytes(buffer[offset + _FRAME.size:end])))
+            offset = end
+        del buffer[:offset]
+        return frames
+
+
+class ArenaMirror:
+    """
+    Копия арены на стороне клиента, которую обновляют сообщения сервера.
+
+    Attributes:
+        player_id (int): Номер своей змейки или -1 до приветствия.
+        cols (int): Количество клеток по горизонтали.
+        rows (int): Количество клеток по вертикали.
+        grid_size (int): Размер клетки.
+        rate (int): Шагов сервера в секунду.
+        tick (int): Номер последнего примененного шага.
+        snakes (Dict[int, Deque[int]]): Клетки змеек от головы к хвосту.
+        directions (Dict[int, int]): Направления змеек.
+        apples (List[int]): Клетки яблок.
+    """
+
+    def __init__(self):
+        """Создает пустую копию."""
+        self.player_id = -1
+        self.cols = self.rows = self.grid_size = self.rate = 0
+        self.tick = 0
+        self.snakes: Dict[int, Deque[int]] = {}
+        self.directions: Dict[int, int] = {}
+        self.apples: List[int] = []
+
+    def apply(self, kind: int, payload: bytes) -> None:
+        """
+        Применяет сообщение сервера.
+
+        Args:
+            kind (int): Тип сообщения.
+            payload (bytes): Данные.
+        """
+        if kind == WELCOME:
+            self._apply_welcome(payload)
+        elif kind == TICK:
+            self._apply_tick(payload)
+
+    @property
+    def length(self) -> int:
+        """Длина своей змейки или 0, пока она не на поле."""
+        return len(self.snakes.get(self.player_id, ()))
+
+    def _read_snakes(self, payload: bytes, offset: int, count: int) -> int:
+        """Читает записи encode_snake и заменяет ими змеек."""
+        for _ in range(count):
+            snake_id, direction, length = _SNAKE.unpack_from(payload, offset)
+            offset += _SNAKE.size
+            self.snakes[snake_id] = deque(struct.unpack_from(f'<{length}I', payload, offset))
+            self.directions[snake_id] = direction
+            offset += 4 * length
+        return offset
+
+    def _apply_welcome(self, payload: bytes) -> None:
+        """Заменяет состояние снимком из приветствия."""
+        (self.player_id, self.cols, self.rows, self.grid_size,
+         self.rate, self.tick) = _WELCOME.unpack_from(payload, 0)
+        offset = _WELCOME.size
+        (count,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        self.apples = list(struct.unpack_from(f'<{count}i', payload, offset))
+        offset += 4 * count
+
+        self.snakes.clear()
+        self.directions.clear()
+        (count,) = _COUNT.unpack_from(payload, offset)
+        self._read_snakes(payload, offset + _COUNT.size, count)
+
+    def _apply_tick(self, payload: bytes) -> None:
+        """Применяет изменения одного шага."""
+        (self.tick,) = _TICK.unpack_from(payload, 0)
+        offset = _TICK.size
+
+        (count,) = _COUNT.unpack_from(payload, offset)
+        offset = self._read_snakes(payload, offset + _COUNT.size, count)
+
+        (count,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            (snake_id,) = _COUNT.unpack_from(payload, offset)
+            offset += _COUNT.size
+            self.snakes.pop(snake_id, None)
+            self.directions.pop(snake_id, None)
+
+        (count,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        order = sorted(self.snakes)
+        if count != len(order):
+            raise ValueError(f"Шаг {self.tick}: {count} змеек вместо {len(order)}")
+
+        cols = self.cols
+        for snake_id, move in zip(order, payload[offset:offset + count]):
+            if move & DIED:
+                del self.snakes[snake_id]
+                del self.directions[snake_id]
+                continue
+            direction = move & 3
+            dx, dy = Simulation.ACTIONS[direction]
+            body = self.snakes[snake_id]
+            body.appendleft(body[0] + dy * cols + dx)
+            if not move & GROWN:
+                body.pop()
+            self.directions[snake_id] = direction
+        offset += count
+
+        (count,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            slot, cell = _APPLE.unpack_from(payload, offset)
+            self.apples[slot] = cell
+            offset += _APPLE.size
+
+
+class GameServer:
+    """
+    Сервер сетевой игры: одна арена, по змейке на подключение.
+
+    Шаги идут с фиксированной частотой через TickScheduler, как в
+    GameEngine.update. Каждый шаг кодируется один раз, и одни и те же
+    байты пишутся всем клиентам. Клиент, который не успевает читать и
+    накопил больше max_buffer неотправленных байт, отключается.
+
+    Attributes:
+        arena (Arena): Состояние игры.
+        rate (int): Шагов в секунду.
+        respawn_ticks (int): Через сколько шагов погибшая змейка
+            появляется снова.
+        max_buffer (int): Предел очереди отправки одного клиента в байтах.
+        clients (Dict[int, asyncio.StreamWriter]): Подключения по номерам
+            игроков.
+        scheduler (TickScheduler): Планировщик шагов.
+        port (int): Порт после start.
+        bytes_sent (int): Всего отправлено байт сообщений TICK.
+        bots (List[int]): Номера змеек ботов.
+    """
+
+    # Номера ботов не пересекаются с номерами игроков: игрокам выдаются
+    # номера ниже, а после отключения они выдаются снова
+    BOT_ID_BASE = 1 << 15
+
+    def __init__(self, width: int = 800, height: int = 600,
+                 grid_size: int = 40, rate: int = 60, apples: int = 1,
+                 seed: int = None, respawn_ticks: int = None,
+                 max_buffer: int = 1 << 20, bots: int = 0):
+        """
+        Создает сервер.
+
+        Args:
+            width (int): Ширина поля.
+            height (int): Высота поля.
+            grid_size (int): Размер клетки.
+            rate (int): Шагов в секунду.
+            apples (int): Количество яблок.
+            seed (int): Зерно арены.
+            respawn_ticks (int): Задержка появления после гибели; по
+                умолчанию одна секунда.
+            max_buffer (int): Предел очереди отправки клиента.
+            bots (int): Количество змеек, которыми управляет сервер.
+        """
+        self.arena = Arena(width, height, grid_size, apples=apples, seed=seed)
+        self.rate = rate
+        self.respawn_ticks = rate if respawn_ticks is None else respawn_ticks
+        self.max_buffer = max_buffer
+        self.clients: Dict[int, asyncio.StreamWriter] = {}
+        self.scheduler = TickScheduler(rate)
+        self.port = None
+        self.bytes_sent = 0
+
+        # Номера игроков: еще не выданные, освобожденные и те, удаление
+        # змеек которых клиенты получат только со следующим шагом
+        self._next_id = 1
+        self._free_ids: List[int] = []
+        self._released: List[int] = []
+        self._inputs: Dict[int, Tuple[int, int]] = {}
+        self._spawned: List[bytes] = []
+        self._removed: List[int] = []
+        self._respawns: Dict[int, int] = {}
+        self._server = None
+        self._ticker = None
+        self._handlers = set()
+
+        self.bots = [self.BOT_ID_BASE + i for i in range(bots)]
+        for bot_id in self.bots:
+            if not self._spawn(bot_id):
+                self._respawns[bot_id] = 1
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        """
+        Начинает принимать подключения и выполнять шаги.
+
+        Args:
+            host (str): Адрес.
+            port (int): Порт; 0 - любой свободный.
+        """
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ticker = asyncio.create_task(self._run_ticks())
+
+    async def close(self) -> None:
+        """Останавливает шаги и закрывает все подключения."""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+        for player_id in list(self.clients):
+            self._disconnect(player_id)
+        # Обработчики клиентов дочитывают закрытые подключения и выходят
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def tick(self) -> bytes:
+        """
+        Выполняет один шаг и рассылает его клиентам.
+
+        Returns:
+            bytes: Разосланное сообщение TICK.
+        """
+        tick = self.arena.ticks + 1
+        for player_id, due in list(self._respawns.items()):
+            if due <= tick and self._spawn(player_id):
+                del self._respawns[player_id]
+
+        for bot_id in self.bots:
+            if bot_id in self.arena.snakes:
+                self._inputs[bot_id] = self.arena.steer(bot_id)
+
+        events = self.arena.step(self._inputs)
+        self._inputs = {}
+        for player_id, _, _, died in events:
+            if died and (player_id in self.clients or player_id >= self.BOT_ID_BASE):
+                self._respawns[player_id] = tick + self.respawn_ticks
+
+        frame = encode_tick(tick, self._spawned, self._removed, events,
+                            self.arena.moved_apples)
+        self._spawned = []
+        self._removed = []
+        # Удаление змеек ушло в этом шаге, их номера можно выдавать снова
+        for player_id in self._released:
+            heapq.heappush(self._free_ids, player_id)
+        self._released = []
+
+        for player_id, writer in list(self.clients.items()):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self._disconnect(player_id)
+                continue
+            writer.write(frame)
+            self.bytes_sent += len(frame)
+        return frame
+
+    async def _run_ticks(self) -> None:
+        """Выполняет шаги с частотой rate, пока сервер не закрыт."""
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(self.scheduler.time_to_next_tick())
+            now = loop.time()
+            for _ in range(self.scheduler.advance(now - last)):
+                self.tick()
+            last = now
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> None:
+        """Регистрирует игрока и читает его ввод до отключения."""
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        player_id = self._allocate_id()
+        if player_id is None:
+            # Все номера игроков заняты
+            writer.close()
+            self._handlers.discard(handler)
+            return
+        if not self._spawn(player_id):
+            # Места нет, змейка появится, когда оно освободится
+            self._respawns[player_id] = self.arena.ticks + 1
+        self.clients[player_id] = writer
+        writer.write(encode_welcome(player_id, self.arena, self.rate))
+
+        try:
+            while True:
+                length, kind = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+                if length > MAX_CLIENT_PAYLOAD:
+                    # Испорченный или чужой поток: длину не читаем и отключаем
+                    break
+                payload = await reader.readexactly(length)
+                if kind == INPUT and payload and payload[0] < len(Simulation.ACTIONS):
+                    self._inputs[player_id] = Simulation.ACTIONS[payload[0]]
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._disconnect(player_id)
+            self._handlers.discard(handler)
+
+    def _allocate_id(self) -> Optional[int]:
+        """
+        Выдает наименьший свободный номер игрока.
+
+        Номера игроков лежат ниже BOT_ID_BASE, чтобы не пересекаться с
+        ботами и помещаться в u16 сообщений.
+
+        Returns:
+            Optional[int]: Номер или None, если свободных номеров нет.
+        """
+        if self._free_ids:
+            return heapq.heappop(self._free_ids)
+        if self._next_id < self.BOT_ID_BASE:
+            player_id = self._next_id
+            self._next_id += 1
+            return player_id
+        return None
+
+    def _spawn(self, player_id: int) -> bool:
+        """Ставит змейку игрока на поле и запоминает ее для рассылки."""
+        if self.arena.add_snake(player_id) is None:
+            return False
+        self._spawned.append(encode_snake(player_id, _RIGHT,
+                                          self.arena.body_cells(player_id)))
+        return True
+
+    def _disconnect(self, player_id: int) -> None:
+        """Убирает игрока и его змейку."""
+        writer = self.clients.pop(player_id, None)
+        if writer is None:
+            return
+        if player_id in self.arena.snakes:
+            self.arena.remove_snake(player_id)
+            self._removed.append(player_id)
+        self._respawns.pop(player_id, None)
+        self._inputs.pop(player_id, None)
+        self._released.append(player_id)
+        writer.close()
+
+
+class NetworkClient:
+    """
+    Подключение к серверу для GameEngine.
+
+    Сокет неблокирующий после приветствия: poll вызывается из игрового
+    цикла и забирает только уже пришедшие данные.
+
+    Attributes:
+        mirror (ArenaMirror): Состояние арены по сообщениям сервера.
+        connected (bool): Открыто ли подключение.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 5.0):
+        """
+        Подключается и ждет приветствия сервера.
+
+        Args:
+            host (str): Адрес сервера.
+            port (int): Порт сервера.
+            timeout (float): Время ожидания подключения и приветствия.
+
+        Raises:
+            ConnectionError: Если сервер закрыл подключение до приветствия.
+        """
+        self.mirror = ArenaMirror()
+        self._decoder = FrameDecoder()
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connected = True
+
+        while self.mirror.player_id < 0:
+            data = self._sock.recv(65536)
+            if not data:
+                raise ConnectionError("Сервер закрыл подключение")
+            self._feed(data)
+        self._sock.setblocking(False)
+
+    def poll(self) -> int:
+        """
+        Применяет все пришедшие сообщения.
+
+        Returns:
+            int: Количество примененных сообщений.
+        """
+        applied = 0
+        while self.connected:
+            try:
+                data = self._sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b''
+            if not data:
+                self.connected = False
+                break
+            applied += self._feed(data)
+        return applied
+
+    def send_direction(self, direction: Tuple[int, int]) -> None:
+        """
+        Отправляет новое направление своей змейки.
+
+        Args:
+            direction (Tuple[int, int]): Направление (dx, dy).
+        """
+        if not self.connected:
+            return
+        frame = encode_frame(INPUT, bytes([Simulation.ACTIONS.index(direction)]))
+        try:
+            self._sock.send(frame)
+        except OSError:
+            self.connected = False
+
+    def close(self) -> None:
+        """Закрывает подключение."""
+        self.connected = False
+        self._sock.close()
+
+    def _feed(self, data: bytes) -> int:
+        """Передает байты декодеру и применяет готовые сообщения."""
+        frames = self._decoder.feed(data)
+        for kind, payload in frames:
+            self.mirror.apply(kind, payload)
+        return len(frames)
@@ -0,0 +1,12 @@
+"""
+Реестр ботов, которые ведут змейку в одиночной игре.
+
+Вынесен отдельно от движка, чтобы прогон игр без окна не загружал
+game_engine и все, что нужно для отрисовки и сети.
+"""
+
+from .autopilot import Autopilot
+from .hamiltonian import HamiltonianSolver
+
+# Боты по режимам; у каждого есть for_simulation и choose
+PILOTS = {'path': Autopilot, 'cycle': HamiltonianSolver}
@@ -0,0 +1,143 @@
+"""
+Замер времени кадра по фазам.
+"""
+
+import csv
+import math
+import time
+from array import array
+from typing import Iterator, List, Tuple
+
+
+class FrameProfiler:
+    """
+    Хранит длительность фаз последних кадров в кольцевом буфере.
+
+    Кадр размечается вызовами start_frame, lap и end_frame: lap относит
+    время, прошедшее с предыдущей отметки, к указанной фазе. Фазы, которые
+    в кадре не выполнялись, получают ноль. Буфер фиксированного размера,
+    поэтому профилировщик можно держать включенным все время.
+
+    Attributes:
+        phases (Tuple[str, ...]): Имена фаз в порядке столбцов.
+        capacity (int): Сколько последних кадров хранится.
+        frame_count (int): Сколько кадров записано за все время.
+    """
+
+    # ui - панель статистики, messages - сообщения паузы и конца игры,
+    # screen - вывод кадра на экран с масштабом, profiler - эта панель
+    PHASES = ('events', 'update', 'board', 'snake', 'ui', 'messages',
+              'screen', 'profiler', 'flip')
+
+    def __init__(self, capacity: int = 600, phases: Tuple[str, ...] = PHASES):
+        """
+        Создает профилировщик.
+
+        Args:
+            capacity (int): Размер кольцевого буфера в кадрах.
+            phases (Tuple[str, ...]): Имена фаз.
+        """
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self.frame_count = 0
+
+        self._columns = {phase: i for i, phase in enumerate(self.phases)}
+        # Строка кадра i лежит в samples[i * len(phases):(i + 1) * len(phases)]
+        self._samples = array('d', bytes(8 * capacity * len(self.phases)))
+        self._totals = array('d', bytes(8 * capacity))
+        self._current = array('d', bytes(8 * len(self.phases)))
+        self._last = time.perf_counter()
+
+    def __len__(self) -> int:
+        return min(self.frame_count, self.capacity)
+
+    def start_frame(self) -> None:
+        """
+        Начинает новый кадр.
+        """
+        for i in range(len(self._current)):
+            self._current[i] = 0.0
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """
+        Относит время с предыдущей отметки к фазе.
+
+        Args:
+            phase (str): Имя фазы.
+        """
+        now = time.perf_counter()
+        self._current[self._columns[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self) -> None:
+        """
+        Записывает текущий кадр в буфер.
+        """
+        width = len(self.phases)
+        row = self.frame_count % self.capacity
+        self._samples[row * width:(row + 1) * width] = self._current
+        self._totals[row] = sum(self._current)
+        self.frame_count += 1
+
+    def _rows(self) -> Iterator[int]:
+        """Номера строк буфера от старого кадра к новому."""
+        start = self.frame_count - len(self)
+        for frame in range(start, self.frame_count):
+            yield frame % self.capacity
+
+    def values(self, phase: str = 'total') -> List[float]:
+        """
+        Возвращает длительности фазы за хранящиеся кадры.
+
+        Args:
+            phase (str): Имя фазы или 'total' для всего кадра.
+
+        Returns:
+            List[float]: Длительности в секундах от старого кадра к новому.
+        """
+        if phase == 'total':
+            return [self._totals[row] for row in self._rows()]
+        column = self._columns[phase]
+        width = len(self.phases)
+        return [self._samples[row * width + column] for row in self._rows()]
+
+    def percentiles(self, phase: str = 'total',
+                    qs: Tuple[float, ...] = (50, 95, 99)) -> Tuple[float, ...]:
+        """
+        Возвращает перцентили длительности фазы.
+
+        Args:
+            phase (str): Имя фазы или 'total' для всего кадра.
+            qs (Tuple[float, ...]): Перцентили от 0 до 100.
+
+        Returns:
+            Tuple[float, ...]: Значения в миллисекундах; нули, если кадров нет.
+        """
+        values = sorted(self.values(phase))
+        if not values:
+            return tuple(0.0 for _ in qs)
+        # Метод ближайшего ранга
+        return tuple(
+            values[max(0, math.ceil(q / 100 * len(values)) - 1)] * 1000
+            for q in qs
+        )
+
+    def dump_csv(self, path: str) -> None:
+        """
+        Сохраняет хранящиеся кадры в CSV, длительности в миллисекундах.
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        width = len(self.phases)
+        first = self.frame_count - len(self)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(('frame',) + self.phases + ('total',))
+            for frame, row in enumerate(self._rows(), start=first):
+                values = self._samples[row * width:(row + 1) * width]
+                writer.writerow(
+                    [frame] + [f'{value * 1000:.3f}' for value in values]
+                    + [f'{self._totals[row] * 1000:.3f}']
+                )
@@ -0,0 +1,435 @@
+"""
+Запись и воспроизведение игр.
+
+Реплей хранит зерно генератора, параметры поля и направление, выбранное
+на каждом шаге. Этого достаточно, чтобы детерминированно повторить игру
+через :class:`game.simulation.Simulation`. Дополнительно через равные
+промежутки сохраняются ключевые кадры с полным состоянием, чтобы можно
+было перейти к любому шагу, не проигрывая игру с начала.
+
+Формат файла::
+
+    b'SNKR' | версия (u8) | сжатие (u8) | сжатые данные
+
+Сжатые данные: заголовок (зерно, ширина, высота, сетка, интервал ключевых
+кадров, число шагов), по одному байту ввода на шаг (0 - без поворота,
+1-4 - индекс в ``Simulation.ACTIONS`` + 1) и список ключевых кадров.
+Ключевой кадр хранит тело номерами клеток, а свободные клетки - разностями
+соседних номеров.
+"""
+
+import lzma
+import operator
+import struct
+import zlib
+from itertools import accumulate, chain
+from typing import Dict, Optional, Tuple
+from .free_cells import FreeCellIndex
+from .simulation import Simulation
+
+MAGIC = b'SNKR'
+VERSION = 2
+
+_COMPRESSORS = {
+    'zlib': (0, zlib.compress, zlib.decompress),
+    'lzma': (1, lzma.compress, lzma.decompress),
+}
+
+_HEADER = struct.Struct('<qIIIII')
+_KEYFRAME = struct.Struct('<II')
+_STATE = struct.Struct('<iibbbbIIIBBii')
+_COUNT = struct.Struct('<I')
+
+
+def _pack_ints(values) -> bytes:
+    """Упаковывает последовательность int32 с префиксом длины."""
+    values = list(values)
+    return _COUNT.pack(len(values)) + struct.pack(f'<{len(values)}i', *values)
+
+
+def _unpack_ints(data: bytes, offset: int) -> Tuple[tuple, int]:
+    """Распаковывает последовательность int32 с префиксом длины."""
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    values = struct.unpack_from(f'<{count}i', data, offset)
+    return values, offset + 4 * count
+
+
+def _deltas(values) -> map:
+    """Разности соседних значений, первое - от нуля."""
+    return map(operator.sub, values, chain((0,), values))
+
+
+def pack_state(simulation: Simulation) -> bytes:
+    """
+    Сохраняет полное состояние симуляции в байты.
+
+    Args:
+        simulation (Simulation): Симуляция.
+
+    Returns:
+        bytes: Упакованное состояние.
+    """
+    snake = simulation.snake
+    apple = simulation.apple
+    parts = [_STATE.pack(
+        snake.x, snake.y,
+        snake.direction[0], snake.direction[1],
+        snake.next_direction[0], snake.next_direction[1],
+        snake.grow_pending, simulation.score, simulation.ticks,
+        simulation.game_over, simulation.won,
+        apple.x, apple.y
+    )]
+
+    # Тело - номера клеток от шеи к хвосту
+    parts.append(_pack_ints(snake.body.indices()))
+
+    # Порядок свободных клеток влияет на выбор позиции яблока. Удаление
+    # переставляет в индексе только отдельные клетки, поэтому почти все
+    # разности соседних равны 1 и хорошо сжимаются
+    parts.append(_pack_ints(_deltas(simulation.free_cells.cells)))
+
+    version, internal, gauss = simulation.rng.getstate()
+    parts.append(struct.pack('<I', version))
+    parts.append(struct.pack(f'<{len(internal)}I', *internal))
+    parts.append(struct.pack('<?d', gauss is not None, gauss or 0.0))
+
+    return b''.join(parts)
+
+
+def unpack_state(simulation: Simulation, data: bytes) -> None:
+    """
+    Восстанавливает состояние симуляции из байтов.
+
+    Args:
+        simulation (Simulation): Симуляция с теми же параметрами поля.
+        data (bytes): Результат pack_state.
+    """
+    (x, y, dx, dy, ndx, ndy, grow_pending, score, ticks,
+     game_over, won, apple_x, apple_y) = _STATE.unpack_from(data, 0)
+    offset = _STATE.size
+
+    body, offset = _unpack_ints(data, offset)
+    free, offset = _unpack_ints(data, offset)
+
+    snake = simulation.snake
+    snake.x, snake.y = x, y
+    snake.direction = (dx, dy)
+    snake.next_direction = (ndx, ndy)
+    snake.grow_pending = grow_pending
+    snake.body.clear()
+    for index in body:
+        snake.body.append_index(index)
+    snake.rebuild_occupancy()
+
+    simulation.apple.x, simulation.apple.y = apple_x, apple_y
+    simulation.score = score
+    simulation.ticks = ticks
+    simulation.game_over = bool(game_over)
+    simulation.won = bool(won)
+    simulation.free_cells = FreeCellIndex.from_cells(len(snake.occupancy),
+                                                     accumulate(free))
+
+    (version,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    count = (len(data) - offset - 9) // 4
+    internal = struct.unpack_from(f'<{count}I', data, offset)
+    offset += 4 * count
+    has_gauss, gauss = struct.unpack_from('<?d', data, offset)
+    simulation.rng.setstate((version, internal, gauss if has_gauss else None))
+
+
+def _encode_input(simulation: Simulation) -> int:
+    """Возвращает код направления, которое будет применено на шаге."""
+    snake = simulation.snake
+    if snake.next_direction == snake.direction:
+        return 0
+    return Simulation.ACTIONS.index(snake.next_direction) + 1
+
+
+class ReplayRecorder:
+    """
+    Записывает ввод игры по шагам.
+
+    Рекордер создается для новой игры и вызывается вместо
+    ``Simulation.step``. Ключевые кадры сжимаются сразу при записи, а когда
+    их набирается больше MAX_KEYFRAMES, каждый второй отбрасывается и
+    интервал удваивается. Так память под кадры ограничена при любой длине
+    игры, а на шаг остается байт ввода.
+
+    Attributes:
+        simulation (Simulation): Записываемая игра.
+        keyframe_interval (int): Через сколько шагов сохранять ключевой кадр.
+        inputs (bytearray): Код ввода для каждого шага.
+        keyframes (Dict[int, bytes]): Сжатые zlib состояния по номеру шага.
+    """
+
+    # Интервал ключевых кадров на обычном поле
+    KEYFRAME_INTERVAL = 500
+
+    # Сколько ключевых кадров держать в памяти
+    MAX_KEYFRAMES = 64
+
+    def __init__(self, simulation: Simulation,
+                 keyframe_interval: Optional[int] = None):
+        """
+        Начинает запись.
+
+        Args:
+            simulation (Simulation): Новая игра.
+            keyframe_interval (Optional[int]): Интервал ключевых кадров в
+                шагах. По умолчанию KEYFRAME_INTERVAL, а на большом поле
+                реже: ключевой кадр хранит все свободные клетки и без
+                этого занимал бы память чаще, чем нужно для перемотки.
+        """
+        if keyframe_interval is None:
+            keyframe_interval = max(self.KEYFRAME_INTERVAL,
+                                    len(simulation.snake.occupancy) // 8)
+        self.simulation = simulation
+        self.keyframe_interval = keyframe_interval
+        self.inputs = bytearray()
+        self.keyframes: Dict[int, bytes] = {}
+        self._add_keyframe()
+
+    def step(self, action: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Выполняет и записывает один шаг игры.
+
+        Args:
+            action (Optional[Tuple[int, int]]): Новое направление или None.
+
+        Returns:
+            bool: True если игра продолжается, иначе False.
+        """
+        simulation = self.simulation
+        if simulation.game_over:
+            return False
+
+        if action is not None:
+            simulation.snake.set_direction(action)
+
+        self.inputs.append(_encode_input(simulation))
+        alive = simulation.step()
+
+        if simulation.ticks % self.keyframe_interval == 0:
+            self._add_keyframe()
+        return alive
+
+    def _add_keyframe(self) -> None:
+        """Сохраняет сжатое состояние текущего шага, прореживая старые."""
+        self.keyframes[self.simulation.ticks] = zlib.compress(
+            pack_state(self.simulation), 1)
+        if len(self.keyframes) > self.MAX_KEYFRAMES:
+            self.keyframe_interval *= 2
+            self.keyframes = {tick: state for tick, state in self.keyframes.items()
+                              if tick % self.keyframe_interval == 0}
+
+    def to_replay(self) -> 'Replay':
+        """
+        Возвращает записанную игру.
+
+        Returns:
+            Replay: Реплей.
+        """
+        simulation = self.simulation
+        return Replay(
+            seed=simulation.seed,
+            width=simulation.game_width,
+            height=simulation.game_height,
+            grid_size=simulation.grid_size,
+            inputs=bytes(self.inputs),
+            keyframes={tick: zlib.decompress(state)
+                       for tick, state in self.keyframes.items()},
+            keyframe_interval=self.keyframe_interval
+        )
+
+    def save(self, path: str, compression: str = 'lzma') -> None:
+        """
+        Сохраняет реплей в файл.
+
+        Args:
+            path (str): Путь к файлу.
+            compression (str): 'lzma' или 'zlib'.
+        """
+        self.to_replay().save(path, compression)
+
+
+class Replay:
+    """
+    Записанная игра.
+
+    Attributes:
+        seed (int): Зерно генератора.
+        width (int): Ширина поля.
+        height (int): Высота поля.
+        grid_size (int): Размер сетки.
+        inputs (bytes): Код ввода для каждого шага.
+        keyframes (Dict[int, bytes]): Состояния по номеру шага.
+        keyframe_interval (int): Интервал ключевых кадров в шагах.
+    """
+
+    def __init__(self, seed: int, width: int, height: int, grid_size: int,
+                 inputs: bytes, keyframes: Dict[int, bytes],
+                 keyframe_interval: int):
+        """
+        Создает реплей из готовых данных.
+
+        Args:
+            seed (int): Зерно генератора.
+            width (int): Ширина поля.
+            height (int): Высота поля.
+            grid_size (int): Размер сетки.
+            inputs (bytes): Код ввода для каждого шага.
+            keyframes (Dict[int, bytes]): Состояния по номеру шага.
+            keyframe_interval (int): Интервал ключевых кадров в шагах.
+        """
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.grid_size = grid_size
+        self.inputs = inputs
+        self.keyframes = keyframes
+        self.keyframe_interval = keyframe_interval
+
+    @property
+    def num_ticks(self) -> int:
+        """Количество записанных шагов."""
+        return len(self.inputs)
+
+    def to_bytes(self, compression: str = 'lzma') -> bytes:
+        """
+        Сериализует реплей.
+
+        Args:
+            compression (str): 'lzma' или 'zlib'.
+
+        Returns:
+            bytes: Содержимое файла реплея.
+        """
+        code, compress, _ = _COMPRESSORS[compression]
+
+        parts = [
+            _HEADER.pack(self.seed, self.width, self.height, self.grid_size,
+                         self.keyframe_interval, len(self.inputs)),
+            self.inputs,
+            _COUNT.pack(len(self.keyframes)),
+        ]
+        for tick in sorted(self.keyframes):
+            state = self.keyframes[tick]
+            parts.append(_KEYFRAME.pack(tick, len(state)))
+            parts.append(state)
+
+        return MAGIC + bytes([VERSION, code]) + compress(b''.join(parts))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        """
+        Читает реплей из байтов.
+
+        Args:
+            data (bytes): Содержимое файла реплея.
+
+        Returns:
+            Replay: Реплей.
+
+        Raises:
+            ValueError: Если данные не являются реплеем этой версии.
+        """
+        if data[:4] != MAGIC or len(data) < 6 or data[4] != VERSION:
+            raise ValueError("Неизвестный формат реплея")
+
+        decompress = None
+        for code, _, func in _COMPRESSORS.values():
+            if code == data[5]:
+                decompress = func
+        if decompress is None:
+            raise ValueError("Неизвестный способ сжатия реплея")
+        payload = decompress(data[6:])
+
+        (seed, width, height, grid_size,
+         keyframe_interval, num_ticks) = _HEADER.unpack_from(payload, 0)
+        offset = _HEADER.size
+        inputs = payload[offset:offset + num_ticks]
+        offset += num_ticks
+
+        (count,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        keyframes = {}
+        for _ in range(count):
+            tick, size = _KEYFRAME.unpack_from(payload, offset)
+            offset += _KEYFRAME.size
+            keyframes[tick] = payload[offset:offset + size]
+            offset += size
+
+        return cls(seed, width, height, grid_size, inputs, keyframes,
+                   keyframe_interval)
+
+    def save(self, path: str, compression: str = 'lzma') -> None:
+        """
+        Сохраняет реплей в файл.
+
+        Args:
+            path (str): Путь к файлу.
+            compression (str): 'lzma' или 'zlib'.
+        """
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(compression))
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """
+        Загружает реплей из файла.
+
+        Args:
+            path (str): Путь к файлу.
+
+        Returns:
+            Replay: Реплей.
+        """
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def seek(self, tick: int) -> Simulation:
+        """
+        Возвращает игру в состоянии после заданного шага.
+
+        Восстанавливается ближайший предыдущий ключевой кадр, дальше шаги
+        проигрываются без отрисовки.
+
+        Args:
+            tick (int): Номер шага от 0 до num_ticks.
+
+        Returns:
+            Simulation: Симуляция в нужном состоянии.
+        """
+        tick = max(0, min(tick, self.num_ticks))
+        start = max(t for t in self.keyframes if t <= tick)
+
+        simulation = Simulation(self.width, self.height, self.grid_size,
+                                seed=self.seed)
+        unpack_state(simulation, self.keyframes[start])
+        self.fast_forward(simulation, tick)
+        return simulation
+
+    def fast_forward(self, simulation: Simulation, tick: int) -> None:
+        """
+        Проигрывает записанный ввод до заданного шага.
+
+        Args:
+            simulation (Simulation): Симуляция этого реплея.
+            tick (int): Номер шага, на котором остановиться.
+        """
+        actions = Simulation.ACTIONS
+        inputs = self.inputs
+        for current in range(simulation.ticks, min(tick, self.num_ticks)):
+            code = inputs[current]
+            simulation.step(actions[code - 1] if code else None)
+
+    def play(self) -> Simulation:
+        """
+        Проигрывает реплей до конца.
+
+        Returns:
+            Simulation: Итоговое состояние игры.
+        """
+        return self.seek(self.num_ticks)
@@ -0,0 +1,510 @@
+"""
+Хранилище результатов игр на SQLite.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    speed INTEGER NOT NULL,
+    field_width INTEGER,
+    field_height INTEGER,
+    grid_size INTEGER,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_player_score
+    ON results (player, score DESC);
+CREATE INDEX IF NOT EXISTS results_config_score
+    ON results (speed, field_width, field_height, grid_size, score DESC);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+'''
+
+SYNC_MODES = ('OFF', 'NORMAL', 'FULL')
+
+COLUMNS = ('player', 'score', 'length', 'speed',
+           'field_width', 'field_height', 'grid_size', 'timestamp')
+
+
+def parse_legacy_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Разбирает строку старого файла results.txt.
+
+    Поддерживаются все три встречавшихся формата: без поля, с полем
+    и с полем и сеткой. Отсутствующие значения возвращаются как None.
+
+    Args:
+        line (str): Строка файла.
+
+    Returns:
+        Optional[Dict[str, Any]]: Результат или None, если строка не распознана.
+    """
+    parts = [part.strip() for part in line.strip().split(' | ')]
+    if len(parts) < 5:
+        return None
+
+    result = {
+        'timestamp': parts[0],
+        'player': parts[1],
+        'field_width': None,
+        'field_height': None,
+        'grid_size': None,
+    }
+    labels = {'Очки': 'score', 'Длина': 'length', 'Скорость': 'speed',
+              'Поле': 'field', 'Сетка': 'grid_size'}
+    try:
+        for part in parts[2:]:
+            label, _, value = part.partition(': ')
+            key = labels.get(label)
+            if key == 'field':
+                width, _, height = value.partition('x')
+                result['field_width'] = int(width)
+                result['field_height'] = int(height)
+            elif key is not None:
+                result[key] = int(value)
+    except ValueError:
+        return None
+
+    if not all(key in result for key in ('score', 'length', 'speed')):
+        return None
+    return result
+
+
+def format_legacy_line(result: Dict[str, Any]) -> str:
+    """
+    Записывает результат строкой старого файла results.txt.
+
+    Поле и сетка добавляются, только если они известны, так что строка
+    всегда разбирается parse_legacy_line.
+
+    Args:
+        result (Dict[str, Any]): Значения столбцов из COLUMNS.
+
+    Returns:
+        str: Строка с переводом строки в конце.
+    """
+    parts = [result['timestamp'], result['player'],
+             f"Очки: {result['score']}", f"Длина: {result['length']}",
+             f"Скорость: {result['speed']}"]
+    if result.get('field_width') is not None:
+        parts.append(f"Поле: {result['field_width']}x{result['field_height']}")
+        if result.get('grid_size') is not None:
+            parts.append(f"Сетка: {result['grid_size']}")
+    return ' | '.join(str(part) for part in parts) + '\n'
+
+
+class ResultsStore:
+    """
+    Результаты игр в базе SQLite с индексами для рекордов.
+
+    Соединение разрешено передать другому потоку (см. ResultWriter), но
+    пользоваться им одновременно из нескольких потоков нельзя.
+
+    Attributes:
+        path (str): Путь к файлу базы.
+        connection (sqlite3.Connection): Соединение с базой.
+    """
+
+    def __init__(self, path: str = 'results.db', sync: str = 'NORMAL'):
+        """
+        Открывает базу, создавая таблицы при необходимости.
+
+        Args:
+            path (str): Путь к файлу базы или ':memory:'.
+            sync (str): Когда SQLite вызывает fsync: 'OFF' - никогда,
+                'NORMAL' - на контрольных точках WAL, 'FULL' - на каждой
+                транзакции.
+
+        Raises:
+            ValueError: Если режим sync неизвестен.
+        """
+        sync = sync.upper()
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Неизвестный режим синхронизации: {sync}")
+
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # WAL не блокирует чтение рекордов во время записи результата
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(f'PRAGMA synchronous={sync}')
+        self.connection.executescript(SCHEMA)
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """
+        Сохраняет один результат.
+
+        Args:
+            result (Dict[str, Any]): Значения столбцов из COLUMNS.
+        """
+        self.add_many([result])
+
+    def add_many(self, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Сохраняет несколько результатов одной транзакцией.
+
+        Args:
+            results (Iterable[Dict[str, Any]]): Результаты.
+
+        Returns:
+            int: Количество добавленных строк.
+        """
+        rows = [tuple(result.get(column) for column in COLUMNS) for result in results]
+        with self.connection:
+            self.connection.executemany(
+                f'INSERT INTO results ({", ".join(COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(COLUMNS))})',
+                rows
+            )
+        return len(rows)
+
+    def high_score(self, player: str = None) -> int:
+        """
+        Возвращает лучший счет игрока или всех игроков.
+
+        Args:
+            player (str): Имя игрока или None для общего рекорда.
+
+        Returns:
+            int: Рекорд или 0, если результатов нет.
+        """
+        if player is None:
+            row = self.connection.execute('SELECT MAX(score) FROM results').fetchone()
+        else:
+            row = self.connection.execute(
+                'SELECT MAX(score) FROM results WHERE player = ?', (player,)
+            ).fetchone()
+        return row[0] or 0
+
+    def config_high_score(self, speed: int, field_width: int,
+                          field_height: int, grid_size: int) -> int:
+        """
+        Возвращает лучший счет для набора настроек игры.
+
+        Args:
+            speed (int): Скорость змейки.
+            field_width (int): Ширина поля.
+            field_height (int): Высота поля.
+            grid_size (int): Размер сетки.
+
+        Returns:
+            int: Рекорд или 0, если результатов нет.
+        """
+        row = self.connection.execute(
+            'SELECT MAX(score) FROM results WHERE speed = ? AND field_width = ? '
+            'AND field_height = ? AND grid_size = ?',
+            (speed, field_width, field_height, grid_size)
+        ).fetchone()
+        return row[0] or 0
+
+    def count(self) -> int:
+        """
+        Возвращает количество сохраненных результатов.
+
+        Returns:
+            int: Количество строк.
+        """
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def migrate_legacy(self, path: str = 'results.txt',
+                       batch_size: int = 1000) -> int:
+        """
+        Переносит результаты из старого текстового файла.
+
+        Файл читается построчно, начиная с места, где остановился прошлый
+        перенос, поэтому повторный вызов при каждом запуске ничего не
+        дублирует, а дописанные старой версией строки тоже подхватываются.
+
+        Args:
+            path (str): Путь к results.txt.
+            batch_size (int): Сколько строк вставлять одной транзакцией.
+
+        Returns:
+            int: Количество перенесенных результатов.
+        """
+        if not os.path.exists(path):
+            return 0
+
+        key = f'legacy_offset:{os.path.abspath(path)}'
+        row = self.connection.execute(
+            'SELECT value FROM meta WHERE key = ?', (key,)
+        ).fetchone()
+        offset = int(row[0]) if row else 0
+        if offset > os.path.getsize(path):
+            offset = 0  # Файл был перезаписан
+
+        imported = 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for batch in self._read_batches(f, batch_size):
+                imported += self.add_many(batch)
+            offset = f.tell()
+
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                (key, str(offset))
+            )
+        return imported
+
+    @staticmethod
+    def _read_batches(f, batch_size: int) -> Iterator[list]:
+        """Читает файл результатов порциями разобранных строк."""
+        batch = []
+        for raw in f:
+            result = parse_legacy_line(raw.decode('utf-8', errors='replace'))
+            if result is not None:
+                batch.append(result)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        """
+        Закрывает соединение с базой.
+        """
+        self.connection.close()
+
+
+class ResultWriter:
+    """
+    Фоновый поток, который сохраняет результаты в ResultsStore.
+
+    Результаты попадают в ограниченную очередь, поток забирает их
+    пачками и записывает одной транзакцией. Кадр конца игры только кладет
+    результат в очередь и не ждет диска. При закрытии, в том числе при
+    выходе из процесса, очередь дописывается до конца.
+
+    Пачка, которую не удалось записать в базу, пробуется еще раз через
+    retry_interval или при закрытии. Если и это не удалось, результаты
+    дописываются в старый текстовый файл fallback_path, откуда их
+    перенесет migrate_legacy при следующем запуске. Туда же поток отправляет
+    результаты, для которых не нашлось места в очереди: put никогда не
+    ждет и не трогает файлы.
+
+    Attributes:
+        store (ResultsStore): Хранилище, которым теперь владеет поток.
+        batch_size (int): Максимум результатов в одной транзакции.
+        fallback_path (str): Текстовый файл для результатов, которые не
+            попали в базу, или None.
+        retry_interval (float): Через сколько секунд повторять запись.
+        written (int): Сколько результатов записано в базу.
+        spilled (int): Сколько результатов дописано в fallback_path.
+        lost (int): Сколько результатов не удалось сохранить никуда.
+        last_error (Exception): Последняя ошибка записи или None.
+    """
+
+    _STOP = object()
+
+    def __init__(self, store: ResultsStore, max_queue: int = 256,
+                 batch_size: int = 64, fallback_path: Optional[str] = None,
+                 retry_interval: float = 1.0):
+        """
+        Запускает поток записи.
+
+        Args:
+            store (ResultsStore): Хранилище результатов.
+            max_queue (int): Размер очереди. Если она заполнена, еще
+                столько же результатов ждут потока записи в отдельном
+                списке, а остальные теряются.
+            batch_size (int): Максимум результатов в одной транзакции.
+            fallback_path (Optional[str]): Старый текстовый файл результатов
+                или None.
+            retry_interval (float): Пауза перед повторной записью пачки.
+        """
+        self.store = store
+        self.batch_size = batch_size
+        self.fallback_path = fallback_path
+        self.retry_interval = retry_interval
+        self.written = 0
+        self.spilled = 0
+        self.lost = 0
+        self.last_error = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        # Результаты, не поместившиеся в очередь; их дописывает в файл поток
+        self._overflow: List[Dict[str, Any]] = []
+        self._overflow_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name='ResultWriter', daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, result: Dict[str, Any]) -> None:
+        """
+        Ставит результат в очередь на запись.
+
+        Если очередь заполнена, результат передается потоку записи для
+        fallback_path: ждать базу или файл в кадре нельзя. Если и для
+        этого нет места, результат теряется.
+
+        Args:
+            result (Dict[str, Any]): Значения столбцов из COLUMNS.
+
+        Raises:
+            RuntimeError: Если писатель уже закрыт.
+        """
+        if self._closed:
+            raise RuntimeError("Запись результатов уже остановлена")
+        try:
+            self._queue.put_nowait(result)
+        except queue.Full:
+            with self._overflow_lock:
+                if len(self._overflow) < self._queue.maxsize:
+                    self._overflow.append(result)
+                    return
+                self.lost += 1
+            logger.error("Результат потерян: очередь записи заполнена")
+
+    def flush(self) -> None:
+        """
+        Ждет, пока все поставленные в очередь результаты будут записаны.
+
+        Пачка, которая ждет повторной записи, уже считается обработанной.
+        """
+        self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Дописывает очередь, останавливает поток и закрывает базу.
+
+        Повторный вызов ничего не делает.
+
+        Args:
+            timeout (float): Сколько ждать места в очереди для команды
+                остановки. Если поток записи так и не освободил его, close
+                возвращается сразу, не закрыв базу: поток допишет очередь
+                и завершится сам, если процесс не выйдет раньше.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("Поток записи результатов не отвечает, в очереди "
+                         "осталось %d результатов", self._queue.qsize())
+            atexit.unregister(self.close)
+            return
+        self._thread.join()
+        self.store.close()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        """Цикл потока записи."""
+        failed = []
+        while True:
+            batch, taken, stop = self._collect(
+                self.retry_interval if failed else None
+            )
+
+            # Вторая попытка для пачки, которая не записалась в прошлый раз
+            if failed:
+                error = self._write(failed)
+                if error is not None:
+                    self._spill(failed, error)
+                failed = []
+
+            if batch:
+                error = self._write(batch)
+                if error is not None:
+                    logger.warning("Не удалось записать %d результатов, "
+                                   "будет повтор: %s", len(batch), error)
+                    if stop:
+                        # Дальше ждать нечего: вторая попытка сразу
+                        error = self._write(batch)
+                        if error is not None:
+                            self._spill(batch, error)
+                    else:
+                        failed = batch
+
+            with self._overflow_lock:
+                overflow, self._overflow = self._overflow, []
+            if overflow:
+                self._spill(overflow, "очередь записи заполнена")
+
+            for _ in range(taken):
+                self._queue.task_done()
+            # После close, не дождавшегося места для STOP, поток выходит сам
+            if stop or (self._closed and not failed and self._queue.empty()):
+                return
+
+    def _collect(self, timeout: Optional[float]
+                 ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Забирает из очереди пачку результатов.
+
+        Args:
+            timeout (Optional[float]): Сколько ждать первого элемента или
+                None, чтобы ждать без ограничения.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int, bool]: Результаты, сколько
+                элементов взято из очереди и пришла ли команда остановки.
+        """
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return [], 0, False
+
+        batch = []
+        taken = 1
+        stop = item is self._STOP
+        if not stop:
+            batch.append(item)
+
+        # Забираем все, что уже накопилось, чтобы писать одной транзакцией
+        while not stop and len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            taken += 1
+            if item is self._STOP:
+                stop = True
+            else:
+                batch.append(item)
+        return batch, taken, stop
+
+    def _write(self, batch: List[Dict[str, Any]]) -> Optional[sqlite3.Error]:
+        """Записывает пачку в базу и возвращает ошибку или None."""
+        try:
+            self.written += self.store.add_many(batch)
+        except sqlite3.Error as e:
+            self.last_error = e
+            return e
+        return None
+
+    def _spill(self, results: List[Dict[str, Any]], reason: Any) -> None:
+        """Дописывает результаты в fallback_path вместо базы."""
+        if self.fallback_path is None:
+            self.lost += len(results)
+            logger.error("Потеряно %d результатов: %s", len(results), reason)
+            return
+        try:
+            with open(self.fallback_path, 'a', encoding='utf-8') as f:
+                f.writelines(format_legacy_line(result) for result in results)
+        except OSError as e:
+            self.lost += len(results)
+            logger.error("Потеряно %d результатов: %s; %s",
+                         len(results), reason, e)
+            return
+        self.spilled += len(results)
+        logger.error("%d результатов записано в %s вместо базы: %s",
+                     len(results), self.fallback_path, reason)
@@ -0,0 +1,103 @@
+"""
+Планировщик шагов игры с фиксированным интервалом.
+"""
+
+
+class TickScheduler:
+    """
+    Накопитель времени, который переводит прошедшее время в целое число
+    шагов симуляции с фиксированной частотой.
+
+    Остаток времени после шагов не теряется, поэтому средняя частота
+    шагов совпадает с заданной и не зависит от частоты кадров. Если за
+    один вызов набралось больше ``max_ticks`` шагов (например, окно
+    перетаскивали), лишнее время отбрасывается, чтобы игра не пыталась
+    догнать его бесконечно.
+
+    Attributes:
+        rate (float): Шагов в секунду.
+        interval (float): Длительность одного шага в секундах.
+        max_ticks (int): Максимум шагов за один вызов advance.
+        accumulator (float): Накопленное, но еще не отработанное время.
+        measured_rate (float): Измеренная частота шагов за последнее окно.
+        dropped_ticks (int): Сколько шагов отброшено ограничителем.
+    """
+
+    def __init__(self, rate: float, max_ticks: int = 8,
+                 measure_window: float = 1.0):
+        """
+        Создает планировщик.
+
+        Args:
+            rate (float): Шагов в секунду.
+            max_ticks (int): Максимум шагов за один вызов advance.
+            measure_window (float): Окно измерения частоты в секундах.
+        """
+        if rate <= 0:
+            raise ValueError("Частота шагов должна быть положительной")
+
+        self.rate = rate
+        self.interval = 1.0 / rate
+        self.max_ticks = max_ticks
+        self.measure_window = measure_window
+
+        self.accumulator = 0.0
+        self.measured_rate = 0.0
+        self.dropped_ticks = 0
+        self._skip_next = False
+        self._window_time = 0.0
+        self._window_ticks = 0
+
+    def reset(self) -> None:
+        """
+        Сбрасывает накопленное время.
+
+        Следующий вызов advance не учитывает переданный интервал: так время,
+        проведенное на паузе или на экране конца игры, не превращается в
+        серию догоняющих шагов.
+        """
+        self.accumulator = 0.0
+        self._skip_next = True
+
+    def advance(self, dt: float) -> int:
+        """
+        Добавляет прошедшее время и возвращает количество шагов.
+
+        Args:
+            dt (float): Время с прошлого вызова в секундах.
+
+        Returns:
+            int: Сколько шагов симуляции нужно выполнить.
+        """
+        if self._skip_next:
+            self._skip_next = False
+            dt = 0.0
+
+        self.accumulator += dt
+        # Небольшой допуск, чтобы 0.3 с при 10 шагах/с давали 3 шага
+        ticks = int((self.accumulator + 1e-9) / self.interval)
+        self.accumulator = max(0.0, self.accumulator - ticks * self.interval)
+
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = 0.0
+
+        # Измеряем фактическую частоту шагов
+        self._window_time += dt
+        self._window_ticks += ticks
+        if self._window_time >= self.measure_window:
+            self.measured_rate = self._window_ticks / self._window_time
+            self._window_time = 0.0
+            self._window_ticks = 0
+
+        return ticks
+
+    def time_to_next_tick(self) -> float:
+        """
+        Возвращает время до следующего шага.
+
+        Returns:
+            float: Время в секундах.
+        """
+        return max(0.0, self.interval - self.accumulator)
@@ -0,0 +1,159 @@
+"""
+Игровая логика Змейки без отрисовки.
+
+Модуль не создает окно, не загружает шрифты и не использует таймер Pygame,
+поэтому симуляцию можно запускать в фоновых задачах и тестах.
+"""
+
+import random
+from typing import List, Optional, Tuple
+from .base import Cell
+from .snake import Snake
+from .apple import Apple
+from .free_cells import FreeCellIndex
+
+
+class Simulation:
+    """
+    Состояние одной игры и правила перехода между тиками.
+
+    Attributes:
+        game_width (int): Ширина поля, выровненная по сетке.
+        game_height (int): Высота поля, выровненная по сетке.
+        grid_size (int): Размер клетки.
+        snake (Snake): Змейка.
+        apple (Apple): Яблоко.
+        score (int): Текущий счет.
+        game_over (bool): Завершена ли игра.
+        won (bool): Змейка заполнила все поле.
+        free_cells (FreeCellIndex): Клетки, не занятые змейкой.
+        ticks (int): Количество выполненных шагов.
+        seed (int): Зерно генератора случайных чисел игры.
+        rng (random.Random): Собственный генератор игры; одинаковые зерно
+            и ввод всегда дают одинаковую игру.
+    """
+
+    # Направления в порядке: вверх, вниз, влево, вправо
+    ACTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+    def __init__(self, width: int = 800, height: int = 600,
+                 grid_size: int = 40,
+                 head_color: Tuple[int, int, int] = None,
+                 body_colors: List[Tuple[int, int, int]] = None,
+                 seed: int = None):
+        """
+        Создает новую игру.
+
+        Args:
+            width (int): Ширина поля.
+            height (int): Высота поля.
+            grid_size (int): Размер сетки.
+            head_color (Tuple[int, int, int]): Цвет головы змейки.
+            body_colors (List[Tuple[int, int, int]]): Цвета тела змейки.
+            seed (int): Зерно генератора; если не задано, выбирается случайно.
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.grid_size = grid_size
+        self.game_width = (width // grid_size) * grid_size
+        self.game_height = (height // grid_size) * grid_size
+
+        # Змейка стартует в центре поля
+        start_x = (self.game_width // 2) // grid_size * grid_size
+        start_y = (self.game_height // 2) // grid_size * grid_size
+
+        snake_kwargs = {}
+        if head_color is not None:
+            snake_kwargs['head_color'] = head_color
+        if body_colors is not None:
+            snake_kwargs['body_colors'] = body_colors
+
+        self.snake = Snake(
+            x=start_x,
+            y=start_y,
+            size=grid_size,
+            length=3,
+            field_width=self.game_width,
+            field_height=self.game_height,
+            **snake_kwargs
+        )
+
+        # Индекс свободных клеток для появления яблока
+        self.free_cells = FreeCellIndex(self.snake.cols * self.snake.rows)
+        self.free_cells.remove(self.snake.cell_index(self.snake.x, self.snake.y))
+        for index in self.snake.body.indices():
+            self.free_cells.remove(index)
+
+        self.apple = Apple.create_random(
+            max_x=self.game_width,
+            max_y=self.game_height,
+            size=grid_size,
+            grid_size=grid_size,
+            free_cells=self.free_cells,
+            rng=self.rng
+        )
+
+        self.score = 0
+        self.game_over = False
+        self.won = False
+        self.ticks = 0
+
+    def step(self, action: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Выполняет один шаг игры.
+
+        Args:
+            action (Optional[Tuple[int, int]]): Новое направление (dx, dy)
+                или None, чтобы сохранить текущее.
+
+        Returns:
+            bool: True если игра продолжается, иначе False.
+        """
+        if self.game_over:
+            return False
+
+        if action is not None:
+            self.snake.set_direction(action)
+
+        tail = self.snake.move()
+        self.ticks += 1
+        self._update_free_cells(tail)
+
+        # Проверяем столкновение с яблоком
+        if self.snake.is_head_at(self.apple.x, self.apple.y):
+            self.snake.grow()
+            self.score += self.apple.value
+            if not self.apple.respawn(self.game_width, self.game_height,
+                                      self.grid_size, self.free_cells,
+                                      self.rng):
+                # Свободных клеток не осталось - поле заполнено
+                self.won = True
+                self.game_over = True
+                return False
+
+        # Проверяем столкновения
+        if (self.snake.check_self_collision() or
+                self.snake.check_wall_collision(self.game_width, self.game_height)):
+            self.game_over = True
+
+        return not self.game_over
+
+    def _update_free_cells(self, tail: Optional[Cell]) -> None:
+        """
+        Переносит в индекс изменения после движения змейки.
+
+        Args:
+            tail (Optional[Cell]): Клетка, освобожденная хвостом.
+        """
+        snake = self.snake
+        if tail is not None:
+            index = snake.cell_index(tail.x, tail.y)
+            if index >= 0 and snake.occupancy[index] == 0:
+                self.free_cells.add(index)
+
+        index = snake.cell_index(snake.x, snake.y)
+        if index >= 0:
+            self.free_cells.remove(index)
@@ -2,9 +2,266 @@
 Класс для змейки в игре.
 """
 
-from typing import List, Tuple
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
 import pygame
-from .base import GameObject
+from .base import Cell, GameObject
+
+
+class SnakeBody:
+    """
+    Клетки тела змейки от шеи к хвосту, упакованные в массив int32.
+
+    Снаружи тело ведет себя как deque клеток Cell: поддерживает len,
+    перебор, индексацию, appendleft, pop, extend и clear. Внутри хранится
+    кольцевой буфер номеров клеток ``row * cols + col``, по 4 байта на
+    сегмент; Cell создается только при чтении. Движение и рост не создают
+    объектов на сегмент, а буфер при заполнении удваивается, но не больше
+    количества клеток поля.
+
+    Клетки тела должны лежать на поле: змейка, голова которой вышла за
+    край, уже разбилась и дальше не двигается.
+
+    Attributes:
+        cols (int): Количество клеток поля по горизонтали.
+        rows (int): Количество клеток поля по вертикали.
+        size (int): Размер клетки.
+        occupancy (Optional[bytearray]): Сетка занятости, в которой учтены
+            клетки тела; по ней ``in`` сразу отвечает для свободных клеток.
+            Ее задает змейка; None - проверять только перебором.
+    """
+
+    __slots__ = ('cols', 'rows', 'size', 'occupancy', '_cells', '_start',
+                 '_length')
+
+    # Начальная емкость буфера
+    MIN_CAPACITY = 16
+
+    def __init__(self, cols: int, rows: int, size: int,
+                 cells: Iterable[Cell] = ()):
+        """
+        Создает тело.
+
+        Args:
+            cols (int): Количество клеток поля по горизонтали.
+            rows (int): Количество клеток поля по вертикали.
+            size (int): Размер клетки.
+            cells (Iterable[Cell]): Клетки от шеи к хвосту.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.size = size
+        self.occupancy: Optional[bytearray] = None
+        self._cells = array('i', [0]) * self.MIN_CAPACITY
+        self._start = 0
+        self._length = 0
+        self.extend(cells)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Cell]:
+        return map(self._to_cell, self.indices())
+
+    def __reversed__(self) -> Iterator[Cell]:
+        return map(self._to_cell, self.indices(reverse=True))
+
+    def __getitem__(self, position: int) -> Cell:
+        return self._to_cell(self.index_at(position))
+
+    def __contains__(self, cell: object) -> bool:
+        if not isinstance(cell, tuple) or len(cell) != 2:
+            return False
+        index = self._to_index(*cell)
+        if index < 0:
+            return False
+        # Сетка может быть общей или учитывать голову, поэтому занятая
+        # клетка еще проверяется перебором, а свободная - нет
+        if self.occupancy is not None and not self.occupancy[index]:
+            return False
+        return index in self.indices()
+
+    def __repr__(self) -> str:
+        return f'SnakeBody({list(self)!r})'
+
+    @property
+    def nbytes(self) -> int:
+        """Размер буфера в байтах."""
+        return len(self._cells) * self._cells.itemsize
+
+    def copy(self) -> 'SnakeBody':
+        """
+        Возвращает независимую копию тела.
+
+        Returns:
+            SnakeBody: Копия с тем же буфером, но без сетки занятости.
+        """
+        body = SnakeBody(self.cols, self.rows, self.size)
+        body._cells = array('i', self._cells)
+        body._start = self._start
+        body._length = self._length
+        return body
+
+    def indices(self, reverse: bool = False) -> Iterator[int]:
+        """
+        Перебирает номера клеток без создания Cell.
+
+        Буфер читается на месте, без копии, поэтому тело нельзя менять,
+        пока перебор не закончен.
+
+        Args:
+            reverse (bool): Перебирать от хвоста к шее.
+
+        Returns:
+            Iterator[int]: Номера клеток ``row * cols + col``.
+        """
+        cells = self._cells
+        capacity = len(cells)
+        start = self._start
+        end = start + self._length
+        if end <= capacity:
+            if reverse:
+                positions = range(end - 1, start - 1, -1)
+            else:
+                positions = range(start, end)
+        elif reverse:
+            positions = chain(range(end - capacity - 1, -1, -1),
+                              range(capacity - 1, start - 1, -1))
+        else:
+            positions = chain(range(start, capacity), range(end - capacity))
+        return map(cells.__getitem__, positions)
+
+    def index_at(self, position: int) -> int:
+        """
+        Возвращает номер клетки сегмента.
+
+        Args:
+            position (int): Номер сегмента от шеи; отрицательный - от хвоста.
+
+        Returns:
+            int: Номер клетки.
+
+        Raises:
+            IndexError: Если сегмента нет.
+        """
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("Нет такого сегмента тела")
+        cells = self._cells
+        return cells[(self._start + position) % len(cells)]
+
+    def appendleft(self, cell: Cell) -> None:
+        """
+        Добавляет клетку у шеи.
+
+        Args:
+            cell (Cell): Клетка.
+        """
+        self.appendleft_index(self._checked_index(cell))
+
+    def appendleft_index(self, index: int) -> None:
+        """
+        Добавляет клетку у шеи по номеру.
+
+        Args:
+            index (int): Номер клетки на поле.
+        """
+        if self._length == len(self._cells):
+            self._reserve()
+        self._start = (self._start - 1) % len(self._cells)
+        self._cells[self._start] = index
+        self._length += 1
+
+    def append(self, cell: Cell) -> None:
+        """
+        Добавляет клетку за хвостом.
+
+        Args:
+            cell (Cell): Клетка.
+        """
+        self.append_index(self._checked_index(cell))
+
+    def append_index(self, index: int) -> None:
+        """
+        Добавляет клетку за хвостом по номеру.
+
+        Args:
+            index (int): Номер клетки на поле.
+        """
+        if self._length == len(self._cells):
+            self._reserve()
+        self._cells[(self._start + self._length) % len(self._cells)] = index
+        self._length += 1
+
+    def extend(self, cells: Iterable[Cell]) -> None:
+        """
+        Добавляет клетки за хвостом по порядку.
+
+        Args:
+            cells (Iterable[Cell]): Клетки.
+        """
+        for cell in cells:
+            self.append(cell)
+
+    def pop(self) -> Cell:
+        """
+        Убирает клетку хвоста.
+
+        Returns:
+            Cell: Клетка хвоста.
+        """
+        return self._to_cell(self.pop_index())
+
+    def pop_index(self) -> int:
+        """
+        Убирает клетку хвоста и возвращает ее номер.
+
+        Returns:
+            int: Номер клетки.
+
+        Raises:
+            IndexError: Если тело пустое.
+        """
+        if not self._length:
+            raise IndexError("Тело змейки пустое")
+        self._length -= 1
+        cells = self._cells
+        return cells[(self._start + self._length) % len(cells)]
+
+    def clear(self) -> None:
+        """Убирает все клетки."""
+        self._start = 0
+        self._length = 0
+
+    def _reserve(self) -> None:
+        """Удваивает буфер, укладывая сегменты с начала."""
+        capacity = len(self._cells)
+        new_capacity = max(min(2 * capacity, self.cols * self.rows), capacity + 1)
+        cells = array('i', self.indices())
+        cells.extend(array('i', [0]) * (new_capacity - len(cells)))
+        self._cells = cells
+        self._start = 0
+
+    def _to_cell(self, index: int) -> Cell:
+        """Переводит номер клетки в координаты."""
+        return Cell((index % self.cols) * self.size, (index // self.cols) * self.size)
+
+    def _to_index(self, x: int, y: int) -> int:
+        """Переводит координаты в номер клетки или -1 вне поля."""
+        col = x // self.size
+        row = y // self.size
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return -1
+
+    def _checked_index(self, cell: Cell) -> int:
+        """Номер клетки тела; клетка должна быть на поле."""
+        index = self._to_index(cell[0], cell[1])
+        if index < 0:
+            raise ValueError(f"Клетка тела вне поля: {tuple(cell)}")
+        return index
 
 
 class Snake(GameObject):
@@ -12,11 +269,15 @@ class Snake(GameObject):
     Представляет змейку в игре.
 
     Attributes:
-        body (List[GameObject]): Сегменты тела змейки.
+        body (SnakeBody): Клетки тела змейки, от шеи к хвосту.
         direction (Tuple[int, int]): Текущее направление движения.
         next_direction (Tuple[int, int]): Следующее направление.
         grow_pending (int): Количество сегментов для добавления.
         body_colors (List[Tuple[int, int, int]]): Цвета для чередования.
+        cols (int): Количество клеток поля по горизонтали.
+        rows (int): Количество клеток поля по вертикали.
+        occupancy (bytearray): Сколько сегментов (включая голову) занимает
+            каждую клетку поля; индекс клетки ``row * cols + col``.
     """
 
     DIRECTIONS = {
@@ -33,7 +294,9 @@ class Snake(GameObject):
     def __init__(self, x: int, y: int, size: int = 20,
                  length: int = 3,
                  head_color: Tuple[int, int, int] = (50, 255, 50),
-                 body_colors: List[Tuple[int, int, int]] = None):
+                 body_colors: List[Tuple[int, int, int]] = None,
+                 *, field_width: int = 800, field_height: int = 600,
+                 occupancy: Optional[bytearray] = None):
         """
         Инициализирует змейку.
 
@@ -44,6 +307,14 @@ class Snake(GameObject):
             length (int): Начальная длина.
             head_color (Tuple[int, int, int]): Цвет головы.
             body_colors (List[Tuple[int, int, int]]): Цвета для чередования.
+            field_width (int): Ширина поля для сетки занятости: тело
+                хранится индексами клеток поля, поэтому змейка на поле
+                другого размера должна получить его явно.
+            field_height (int): Высота поля для сетки занятости.
+            occupancy (Optional[bytearray]): Общая сетка занятости поля,
+                например арены. Змейка добавляет в нее свои клетки и дальше
+                меняет ее при движении, а своей сетки не заводит, так что
+                создание стоит O(длины змейки), а не O(клеток поля).
         """
         super().__init__(x, y, size, size, head_color)
 
@@ -56,15 +327,66 @@ class Snake(GameObject):
         self.next_direction = self.direction
         self.grow_pending = 0
 
+        # Сетка занятости обновляется при каждом движении
+        self.cols = field_width // size
+        self.rows = field_height // size
+
         # Создаем тело змейки
-        self.body: List[GameObject] = []
-        for i in range(1, length):
-            # Чередуем цвета для сегментов
-            color_index = (i - 1) % len(self.body_colors)
-            segment_color = self.body_colors[color_index]
+        self.body = SnakeBody(self.cols, self.rows, size,
+                              (Cell(x - i * size, y) for i in range(1, length)))
+        if occupancy is None:
+            self.rebuild_occupancy()
+        else:
+            self.occupancy = occupancy
+            self.body.occupancy = occupancy
+            self._occupy(self.x, self.y, 1)
+            for index in self.body.indices():
+                occupancy[index] += 1
+
+    def rebuild_occupancy(self) -> None:
+        """
+        Заново заполняет сетку занятости по голове и телу.
+
+        Нужна после того, как координаты змейки были заданы напрямую,
+        например при восстановлении сохраненного состояния. Змейке на
+        общей сетке заводит собственную.
+        """
+        self.occupancy = bytearray(self.cols * self.rows)
+        self.body.occupancy = self.occupancy
+        self._occupy(self.x, self.y, 1)
+        occupancy = self.occupancy
+        for index in self.body.indices():
+            occupancy[index] += 1
+
+    def cell_index(self, x: int, y: int) -> int:
+        """
+        Возвращает индекс клетки в сетке занятости.
+
+        Args:
+            x (int): Координата X.
+            y (int): Координата Y.
 
-            segment = GameObject(x - i * size, y, size, size, segment_color)
-            self.body.append(segment)
+        Returns:
+            int: Индекс клетки или -1, если клетка вне поля.
+        """
+        col = x // self.width
+        row = y // self.height
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return -1
+
+    def _occupy(self, x: int, y: int, delta: int) -> None:
+        """
+        Изменяет счетчик занятости клетки.
+
+        Args:
+            x (int): Координата X.
+            y (int): Координата Y.
+            delta (int): +1 если сегмент пришел, -1 если ушел.
+        """
+        index = self.cell_index(x, y)
+        if index >= 0:
+            self.occupancy[index] += delta
 
     def change_direction(self, key: int) -> bool:
         """
@@ -77,60 +399,65 @@ class Snake(GameObject):
             bool: True если направление изменено, иначе False.
         """
         if key in self.DIRECTIONS:
-            new_dir = self.DIRECTIONS[key]
-            # Не позволяем развернуться на 180 градусов
-            if (new_dir[0] != -self.direction[0] or
-                new_dir[1] != -self.direction[1]):
-                self.next_direction = new_dir
-                return True
+            return self.set_direction(self.DIRECTIONS[key])
         return False
 
-    def move(self) -> None:
+    def set_direction(self, new_dir: Tuple[int, int]) -> bool:
         """
-        Перемещает змейку на один шаг.
-        """
-        self.direction = self.next_direction
+        Изменяет направление движения по вектору.
 
-        # Перемещаем тело
-        if self.body:
-            # Сдвигаем все сегменты тела
-            for i in range(len(self.body) - 1, 0, -1):
-                self.body[i].x = self.body[i-1].x
-                self.body[i].y = self.body[i-1].y
+        Args:
+            new_dir (Tuple[int, int]): Направление (dx, dy).
 
-            # Первый сегмент тела занимает позицию головы
-            self.body[0].x = self.x
-            self.body[0].y = self.y
+        Returns:
+            bool: True если направление изменено, иначе False.
+        """
+        # Не позволяем развернуться на 180 градусов
+        if (new_dir[0] != -self.direction[0] or
+            new_dir[1] != -self.direction[1]):
+            self.next_direction = new_dir
+            return True
+        return False
 
-        # Перемещаем голову
-        dx = self.direction[0] * self.width
-        dy = self.direction[1] * self.height
-        super().move(dx, dy)
+    def move(self) -> Optional[Cell]:
+        """
+        Перемещает змейку на один шаг.
 
-        # Добавляем новые сегменты если нужно
-        if self.grow_pending > 0:
-            self._grow()
-            self.grow_pending -= 1
+        Returns:
+            Optional[Cell]: Клетка, которую освободил хвост, или None,
+            если змейка выросла.
 
-    def _grow(self) -> None:
+        Raises:
+            ValueError: Если голова уже за пределами поля.
         """
-        Добавляет новый сегмент к телу.
-        """
-        if self.body:
-            last_segment = self.body[-1]
+        neck = self.cell_index(self.x, self.y)
+        if neck < 0:
+            raise ValueError("Змейка за пределами поля не может двигаться")
+        self.direction = dx, dy = self.next_direction
+        cols = self.cols
+        occupancy = self.occupancy
+
+        # Старая позиция головы становится первым сегментом тела
+        self.body.appendleft_index(neck)
+
+        # Хвост остается на месте, пока змейка растет
+        tail = None
+        if self.grow_pending > 0:
+            self.grow_pending -= 1
         else:
-            last_segment = self
+            index = self.body.pop_index()
+            occupancy[index] -= 1
+            tail = Cell((index % cols) * self.width, (index // cols) * self.height)
 
-        # Чередуем цвета для нового сегмента
-        color_index = len(self.body) % len(self.body_colors)
-        new_color = self.body_colors[color_index]
+        # Перемещаем голову; за краем поля клетки в сетке нет
+        self.x += dx * self.width
+        self.y += dy * self.height
+        col = neck % cols + dx
+        row = neck // cols + dy
+        if 0 <= col < cols and 0 <= row < self.rows:
+            occupancy[row * cols + col] += 1
 
-        new_segment = GameObject(
-            last_segment.x, last_segment.y,
-            self.width, self.height,
-            new_color
-        )
-        self.body.append(new_segment)
+        return tail
 
     def grow(self, amount: int = 1) -> None:
         """
@@ -148,10 +475,36 @@ class Snake(GameObject):
         Returns:
             bool: True если произошло столкновение, иначе False.
         """
-        for segment in self.body:
-            if self.check_collision(segment):
-                return True
-        return False
+        # Голова сама занимает свою клетку, второй сегмент означает столкновение
+        index = self.cell_index(self.x, self.y)
+        return index >= 0 and self.occupancy[index] > 1
+
+    def is_head_at(self, x: int, y: int) -> bool:
+        """
+        Проверяет, находится ли голова в заданной клетке.
+
+        Args:
+            x (int): Координата X клетки.
+            y (int): Координата Y клетки.
+
+        Returns:
+            bool: True если голова в этой клетке.
+        """
+        return self.x == x and self.y == y
+
+    def is_cell_free(self, x: int, y: int) -> bool:
+        """
+        Проверяет, свободна ли клетка поля от змейки.
+
+        Args:
+            x (int): Координата X клетки.
+            y (int): Координата Y клетки.
+
+        Returns:
+            bool: True если клетка на поле и не занята змейкой.
+        """
+        index = self.cell_index(x, y)
+        return index >= 0 and self.occupancy[index] == 0
 
     def check_wall_collision(self, max_x: int, max_y: int) -> bool:
         """
@@ -167,28 +520,66 @@ class Snake(GameObject):
         return (self.x < 0 or self.x >= max_x or
                 self.y < 0 or self.y >= max_y)
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """
         Отрисовывает всю змейку.
 
         Args:
             surface (pygame.Surface): Поверхность для отрисовки.
+            offset (Tuple[int, int]): Точка поля, которая приходится на
+                левый верхний угол поверхности.
         """
         # Отрисовываем тело с обводкой
-        for i, segment in enumerate(self.body):
-            # Основной прямоугольник
-            segment.draw(surface)
-
-            # Обводка сегмента
-            pygame.draw.rect(
-                surface,
-                (0, 0, 0),  # Черная обводка
-                segment.rect,
-                1  # Толщина обводки
-            )
+        for cell in self.body:
+            self.draw_segment(surface, cell, offset)
+
+        self.draw_head(surface, offset)
 
+    def draw_segment(self, surface: pygame.Surface, cell: Cell,
+                     offset: Tuple[int, int] = (0, 0)) -> None:
+        """
+        Отрисовывает один сегмент тела.
+
+        Цвет выбирается по четности клетки: соседние сегменты всегда
+        разного цвета, а цвет сегмента не меняется при движении змейки.
+
+        Args:
+            surface (pygame.Surface): Поверхность для отрисовки.
+            cell (Cell): Клетка сегмента.
+            offset (Tuple[int, int]): Точка поля, которая приходится на
+                левый верхний угол поверхности.
+        """
+        segment_rect = pygame.Rect(cell.x - offset[0], cell.y - offset[1],
+                                   self.width, self.height)
+        parity = cell.x // self.width + cell.y // self.height
+
+        # Основной прямоугольник
+        pygame.draw.rect(
+            surface,
+            self.body_colors[parity % len(self.body_colors)],
+            segment_rect
+        )
+
+        # Обводка сегмента
+        pygame.draw.rect(
+            surface,
+            (0, 0, 0),  # Черная обводка
+            segment_rect,
+            1  # Толщина обводки
+        )
+
+    def draw_head(self, surface: pygame.Surface,
+                  offset: Tuple[int, int] = (0, 0)) -> None:
+        """
+        Отрисовывает голову змейки с глазами.
+
+        Args:
+            surface (pygame.Surface): Поверхность для отрисовки.
+            offset (Tuple[int, int]): Точка поля, которая приходится на
+                левый верхний угол поверхности.
+        """
         # Отрисовываем голову с более толстой обводкой
-        head_rect = self.rect
+        head_rect = self.rect.move(-offset[0], -offset[1])
 
         # Основной цвет головы
         pygame.draw.rect(surface, self.color, head_rect)
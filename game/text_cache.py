@@ -0,0 +1,69 @@
+"""
+Кэш отрисованного текста.
+"""
+
+from collections import OrderedDict
+from typing import Tuple
+import pygame
+
+
+class TextCache:
+    """
+    Хранит поверхности с уже отрисованным текстом.
+
+    Ключ кэша - (шрифт, текст, цвет). При переполнении вытесняется
+    запись, которая дольше всех не использовалась.
+
+    Attributes:
+        max_size (int): Максимальное количество поверхностей в кэше.
+        hits (int): Количество попаданий в кэш.
+        misses (int): Количество отрисовок шрифтом.
+    """
+
+    def __init__(self, max_size: int = 128):
+        """
+        Создает пустой кэш.
+
+        Args:
+            max_size (int): Максимальное количество поверхностей.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(self, font: pygame.font.Font, text: str,
+               color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        Возвращает поверхность с текстом, отрисовывая его при промахе.
+
+        Args:
+            font (pygame.font.Font): Шрифт.
+            text (str): Текст.
+            color (Tuple[int, int, int]): Цвет текста.
+
+        Returns:
+            pygame.Surface: Поверхность с текстом.
+        """
+        key = (font, text, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """
+        Очищает кэш.
+        """
+        self._surfaces.clear()
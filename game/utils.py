@@ -3,7 +3,41 @@
 """
 
 import argparse
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+# Допустимые значения параметров командной строки
+SPEED_RANGE = range(5, 31)
+WIDTH_RANGE = range(400, 2001)
+HEIGHT_RANGE = range(300, 1501)
+
+# Поле с окном на него может быть больше экрана: до 2500 клеток по стороне
+HUGE_FIELD_RANGE = range(400, 100001)
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    """
+    Разбирает размер вида "800x600".
+
+    Args:
+        text (str): Строка аргумента.
+
+    Returns:
+        Tuple[int, int]: Ширина и высота.
+
+    Raises:
+        argparse.ArgumentTypeError: Если строка не в формате ШИРИНАxВЫСОТА
+            или размер не помещается в допустимые пределы окна.
+    """
+    width, _, height = text.lower().replace('х', 'x').partition('x')
+    try:
+        size = int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается размер ШИРИНАxВЫСОТА: {text}")
+    if size[0] not in WIDTH_RANGE or size[1] not in HEIGHT_RANGE:
+        raise argparse.ArgumentTypeError(
+            f"окно должно быть от {WIDTH_RANGE[0]}x{HEIGHT_RANGE[0]} "
+            f"до {WIDTH_RANGE[-1]}x{HEIGHT_RANGE[-1]}: {text}")
+    return size
 
 
 def parse_arguments() -> Dict[str, Any]:
@@ -19,6 +53,7 @@ def parse_arguments() -> Dict[str, Any]:
         epilog='Примеры использования:\n'
                '  python main.py --прямой-запуск --имя Вася --скорость 15 --ширина 800 --высота 600\n'
                '  python main.py --прямой-запуск --сложная\n'
+               '  python main.py --прямой-запуск --окно 800x600 --ширина 40000 --высота 40000\n'
     )
 
     parser.add_argument(
@@ -41,7 +76,7 @@ def parse_arguments() -> Dict[str, Any]:
         dest='snake_speed',
         type=int,
         default=10,
-        choices=range(5, 31),
+        choices=SPEED_RANGE,
         help='Скорость змейки (5-30, по умолчанию: 10)'
     )
 
@@ -50,8 +85,7 @@ def parse_arguments() -> Dict[str, Any]:
         dest='width',
         type=int,
         default=800,
-        choices=range(400, 2001),
-        help='Ширина игрового поля (400-2000, по умолчанию: 800)'
+        help='Ширина игрового поля (400-2000, с --окно до 100000, по умолчанию: 800)'
     )
 
     parser.add_argument(
@@ -59,13 +93,30 @@ def parse_arguments() -> Dict[str, Any]:
         dest='height',
         type=int,
         default=600,
-        choices=range(300, 1501),
-        help='Высота игрового поля (300-1500, по умолчанию: 600)'
+        help='Высота игрового поля (300-1500, с --окно до 100000, по умолчанию: 600)'
     )
 
+    parser.add_argument(
+        '--окно', '--view',
+        dest='viewport',
+        type=parse_size,
+        default=None,
+        help='Размер окна на поле, например 800x600: камера следует за '
+             'змейкой, и поле может быть больше экрана'
+    )
 
     args = parser.parse_args()
 
+    # Пределы поля зависят от того, показывается ли оно целиком
+    if args.viewport is None:
+        width_range, height_range = WIDTH_RANGE, HEIGHT_RANGE
+    else:
+        width_range = height_range = HUGE_FIELD_RANGE
+    if args.width not in width_range:
+        parser.error(f"ширина поля должна быть от {width_range[0]} до {width_range[-1]}")
+    if args.height not in height_range:
+        parser.error(f"высота поля должна быть от {height_range[0]} до {height_range[-1]}")
+
     return {
         'player_name': args.player_name,
         'snake_speed': args.snake_speed,
@@ -73,5 +124,6 @@ def parse_arguments() -> Dict[str, Any]:
         'height': args.height,
         'grid_size': 40,
         'fps': 60,
+        'viewport': args.viewport,
         'direct_launch': args.direct_launch
     }
\ No newline at end of file
@@ -30,6 +30,21 @@ def setup_docs():
         'docs/source/game/snake.rst': module_rst_content('snake'),
         'docs/source/game/apple.rst': module_rst_content('apple'),
         'docs/source/game/base.rst': module_rst_content('base'),
+        'docs/source/game/simulation.rst': module_rst_content('simulation'),
+        'docs/source/game/batch.rst': module_rst_content('batch'),
+        'docs/source/game/free_cells.rst': module_rst_content('free_cells'),
+        'docs/source/game/text_cache.rst': module_rst_content('text_cache'),
+        'docs/source/game/scheduler.rst': module_rst_content('scheduler'),
+        'docs/source/game/replay.rst': module_rst_content('replay'),
+        'docs/source/game/results.rst': module_rst_content('results'),
+        'docs/source/game/profiler.rst': module_rst_content('profiler'),
+        'docs/source/game/autopilot.rst': module_rst_content('autopilot'),
+        'docs/source/game/hamiltonian.rst': module_rst_content('hamiltonian'),
+        'docs/source/game/evaluation.rst': module_rst_content('evaluation'),
+        'docs/source/game/env.rst': module_rst_content('env'),
+        'docs/source/game/arena.rst': module_rst_content('arena'),
+        'docs/source/game/network.rst': module_rst_content('network'),
+        'docs/source/game/camera.rst': module_rst_content('camera'),
         'docs/source/game/utils.rst': module_rst_content('utils'),
     }
 
@@ -107,6 +122,25 @@ def index_rst_content():
 
    python main.py
 
+Поле больше экрана: камера следует за змейкой, а окно задает флаг ``--окно``:
+
+.. code-block:: bash
+
+   python main.py --прямой-запуск --окно 800x600 --ширина 40000 --высота 40000
+
+Оценка бота на множестве игр без окна, по процессу на ядро:
+
+.. code-block:: bash
+
+   python evaluate.py --games 10000 --width 400-2000 --height 300-1500
+
+Сетевая игра: сервер и подключение к нему:
+
+.. code-block:: bash
+
+   python multiplayer.py serve --port 5555
+   python multiplayer.py join 127.0.0.1:5555
+
 Структура проекта
 ~~~~~~~~~~~~~~~~~
 
@@ -114,11 +148,14 @@ def index_rst_content():
 
    snake_game/
    ├── main.py
+   ├── evaluate.py
+   ├── multiplayer.py
    ├── game/
    │   ├── game_engine.py
    │   ├── snake.py
    │   ├── apple.py
    │   ├── base.py
+   │   ├── simulation.py
    │   └── utils.py
    ├── tests/
    └── docs/
@@ -144,6 +181,21 @@ def modules_rst_content():
    game/snake
    game/apple
    game/base
+   game/simulation
+   game/batch
+   game/free_cells
+   game/text_cache
+   game/scheduler
+   game/replay
+   game/results
+   game/profiler
+   game/autopilot
+   game/hamiltonian
+   game/evaluation
+   game/env
+   game/arena
+   game/network
+   game/camera
    game/utils
 '''
 
@@ -1,7 +1,8 @@
 """
 Основной файл игры Змейка.
 
-Этот модуль запускает игру через меню настройки параметров.
+Этот модуль запускает игру через меню настройки параметров или, с флагом
+--прямой-запуск, сразу с параметрами командной строки.
 """
 
 import sys
@@ -11,20 +12,23 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from game.game_engine import GameLauncher, GameEngine
+from game.utils import parse_arguments
 
 
 def main() -> None:
     """
     Главная функция, запускающая игру через меню настроек.
     """
+    config = parse_arguments()
     print("=" * 60)
     print("          ИГРА 'ЗМЕЙКА' - МЕНЮ НАСТРОЙКИ ПАРАМЕТРОВ")
     print("=" * 60)
 
     try:
-        # Запускаем лаунчер для настройки параметров
-        launcher = GameLauncher()
-        config = launcher.run()
+        if not config['direct_launch']:
+            # Запускаем лаунчер для настройки параметров
+            launcher = GameLauncher()
+            config = launcher.run()
 
         if config is None:
             print("\nВыход из программы.")
@@ -34,6 +38,8 @@ def main() -> None:
         print("ПАРАМЕТРЫ ИГРЫ УСТАНОВЛЕНЫ:")
         print(f"  Игрок: {config['player_name']}")
         print(f"  Размер поля: {config['width']}x{config['height']}")
+        if config.get('viewport'):
+            print(f"  Окно на поле: {config['viewport'][0]}x{config['viewport'][1]}")
         print(f"  Скорость змейки: {config['snake_speed']}")
         print(f"  Размер сетки: {config['grid_size']}")
         print(f"  Частота кадров: {config['fps']} FPS")
@@ -51,13 +57,14 @@ def main() -> None:
             fps=config['fps'],
             snake_speed=config['snake_speed'],
             player_name=config['player_name'],
-            fullscreen=True
+            fullscreen=True,
+            viewport=config.get('viewport')
         )
 
         game.run()
 
         print("\n" + "=" * 60)
-        print("Игра завершена. Результаты сохранены в файл 'results.txt'")
+        print("Игра завершена. Результаты сохранены в базу 'results.db'")
         print("=" * 60)
 
     except KeyboardInterrupt:
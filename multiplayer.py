@@ -0,0 +1,128 @@
+"""
+Сетевая игра Змейка.
+
+Сервер ведет арену и рассылает игрокам изменения каждого шага, клиент -
+обычное окно игры, которое рисует арену сервера. Без сервера на арене
+можно играть против ботов.
+
+Примеры использования:
+    python multiplayer.py serve --port 5555 --width 1200 --height 900
+    python multiplayer.py join 192.168.0.10:5555
+    python multiplayer.py arena --bots 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import List, Optional
+
+# Добавляем папку game в путь для импорта
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game.arena import Arena
+from game.game_engine import GameEngine
+from game.network import GameServer
+
+
+def check_field(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """
+    Проверяет, что на поле арены помещается змейка.
+
+    Змейка появляется головой вправо, и перед ней нужны две свободные
+    клетки, поэтому в строке должно быть не меньше START_LENGTH + 2 клеток.
+
+    Args:
+        parser (argparse.ArgumentParser): Разбор аргументов для сообщения
+            об ошибке.
+        args (argparse.Namespace): Разобранные аргументы.
+    """
+    if args.grid <= 0:
+        parser.error(f"размер клетки должен быть положительным: {args.grid}")
+    cols = args.width // args.grid
+    rows = args.height // args.grid
+    if cols < Arena.START_LENGTH + 2 or rows < 1:
+        parser.error(f"поле {cols}x{rows} клеток слишком мало: нужно хотя бы "
+                     f"{Arena.START_LENGTH + 2} клеток в строке")
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """
+    Запускает сервер и работает до прерывания.
+
+    Args:
+        args (argparse.Namespace): Разобранные аргументы.
+    """
+    server = GameServer(width=args.width, height=args.height,
+                        grid_size=args.grid, rate=args.rate,
+                        apples=args.apples, seed=args.seed, bots=args.bots)
+    await server.start(args.host, args.port)
+    print(f"Сервер слушает {args.host}:{server.port}, {args.rate} шагов/с")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Запускает сервер или клиент.
+
+    Args:
+        argv (Optional[List[str]]): Аргументы командной строки.
+    """
+    parser = argparse.ArgumentParser(description='Сетевая игра Змейка')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    server_parser = commands.add_parser('serve', help='Запустить сервер')
+    server_parser.add_argument('--host', default='0.0.0.0', help='Адрес (по умолчанию: все)')
+    server_parser.add_argument('--port', type=int, default=5555, help='Порт (по умолчанию: 5555)')
+    server_parser.add_argument('--width', type=int, default=1200, help='Ширина поля')
+    server_parser.add_argument('--height', type=int, default=900, help='Высота поля')
+    server_parser.add_argument('--grid', type=int, default=20, help='Размер клетки')
+    server_parser.add_argument('--rate', type=int, default=10, help='Шагов в секунду')
+    server_parser.add_argument('--apples', type=int, default=5, help='Яблок на поле')
+    server_parser.add_argument('--seed', type=int, default=None, help='Зерно арены')
+    server_parser.add_argument('--bots', type=int, default=0, help='Змеек-ботов на поле')
+
+    client_parser = commands.add_parser('join', help='Подключиться к серверу')
+    client_parser.add_argument('address', help='Адрес сервера ХОСТ:ПОРТ')
+    client_parser.add_argument('--имя', '--player', dest='player_name', default='Игрок',
+                               help='Имя игрока')
+
+    arena_parser = commands.add_parser('arena', help='Игра против ботов без сервера')
+    arena_parser.add_argument('--bots', type=int, default=30, help='Количество ботов')
+    arena_parser.add_argument('--width', type=int, default=1200, help='Ширина поля')
+    arena_parser.add_argument('--height', type=int, default=900, help='Высота поля')
+    arena_parser.add_argument('--grid', type=int, default=20, help='Размер клетки')
+    arena_parser.add_argument('--speed', type=int, default=10, help='Скорость змеек')
+    arena_parser.add_argument('--имя', '--player', dest='player_name', default='Игрок',
+                              help='Имя игрока')
+
+    args = parser.parse_args(argv)
+    if args.command in ('serve', 'arena'):
+        check_field(parser, args)
+
+    if args.command == 'serve':
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            print("\nСервер остановлен.")
+        return
+
+    if args.command == 'arena':
+        game = GameEngine(width=args.width, height=args.height, grid_size=args.grid,
+                          snake_speed=args.speed, player_name=args.player_name,
+                          fullscreen=False, legacy_results_path=None,
+                          arena_bots=args.bots)
+        game.run()
+        return
+
+    host, _, port = args.address.rpartition(':')
+    game = GameEngine(player_name=args.player_name, fullscreen=False,
+                      legacy_results_path=None, server=(host, int(port)))
+    game.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@
 import unittest
 from unittest.mock import patch
 from game.apple import Apple
+from game.free_cells import FreeCellIndex
 
 
 class TestApple(unittest.TestCase):
@@ -19,6 +20,8 @@ class TestApple(unittest.TestCase):
         self.assertEqual(apple.width, 25)
         self.assertEqual(apple.height, 25)
         self.assertEqual(apple.value, 5)
+        # Поля хранятся в слотах, без словаря у каждого объекта
+        self.assertFalse(hasattr(apple, '__dict__'))
 
     @patch('random.randint')
     def test_create_random(self, mock_randint):
@@ -52,6 +55,21 @@ class TestApple(unittest.TestCase):
         self.assertEqual(apple.y, 100)
         self.assertEqual(mock_randint.call_count, 2)
 
+    def test_respawn_free_cells(self):
+        """Тест появления яблока только в свободной клетке."""
+        free_cells = FreeCellIndex(40 * 30)
+        for index in range(40 * 30):
+            if index != 77:
+                free_cells.remove(index)
+
+        apple = Apple(0, 0, size=20)
+        self.assertTrue(apple.respawn(800, 600, 20, free_cells))
+        self.assertEqual(apple.x, 37 * 20)
+        self.assertEqual(apple.y, 1 * 20)
+
+        free_cells.remove(77)
+        self.assertFalse(apple.respawn(800, 600, 20, free_cells))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
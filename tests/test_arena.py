@@ -0,0 +1,144 @@
+"""
+Тесты для арены с несколькими змейками.
+"""
+
+import unittest
+from game.arena import Arena
+from game.base import Cell
+
+
+class TestArena(unittest.TestCase):
+    """Тесты для класса Arena."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.arena = Arena(width=400, height=300, grid_size=20, apples=2, seed=1)
+
+    def _place(self, snake_id, col, row):
+        """Ставит змейку головой в клетку (col, row), телом влево."""
+        snake = self.arena.add_snake(snake_id)
+        size = self.arena.grid_size
+        self.arena._vacate(snake)
+        snake.x, snake.y = col * size, row * size
+        snake.body.clear()
+        snake.body.extend(Cell((col - i) * size, row * size) for i in (1, 2))
+        for cell in self.arena.body_cells(snake_id):
+            self.arena.occupancy[cell] += 1
+        return snake
+
+    def _apples(self, cells):
+        """Ставит яблоки в заданные клетки."""
+        self.arena.apples = list(cells)
+        self.arena._apple_slots = {cell: slot for slot, cell in enumerate(cells)}
+
+    def test_add_snake(self):
+        """Тест появления змеек в свободных местах."""
+        for snake_id in range(10):
+            self.assertIsNotNone(self.arena.add_snake(snake_id))
+
+        cells = [cell for snake_id in self.arena.snakes
+                 for cell in self.arena.body_cells(snake_id)]
+        self.assertEqual(len(cells), 30)
+        self.assertEqual(len(set(cells)), 30)
+        self.assertFalse(set(cells) & set(self.arena.apples))
+
+    def test_step_moves_all(self):
+        """Тест одновременного шага всех змеек."""
+        self._apples([0, 1])
+        self._place(1, 5, 2)
+        self._place(2, 5, 8)
+
+        events = self.arena.step({2: (0, 1)})
+
+        self.assertEqual(events, [(1, 3, False, False), (2, 1, False, False)])
+        self.assertEqual(self.arena.body_cells(1)[0], 2 * 20 + 6)
+        self.assertEqual(self.arena.body_cells(2)[0], 9 * 20 + 5)
+
+    def test_head_into_body(self):
+        """Тест гибели при ударе в чужое тело."""
+        self._apples([0, 1])
+        self._place(1, 5, 2)
+        self._place(2, 4, 1)
+
+        events = self.arena.step({2: (0, 1)})
+
+        self.assertEqual([died for *_, died in events], [False, True])
+        self.assertEqual(list(self.arena.snakes), [1])
+
+    def test_head_on(self):
+        """Тест встречи голов: гибнут обе змейки."""
+        self._apples([0, 1])
+        self._place(1, 5, 2)
+        self._place(2, 6, 3)
+        self.arena.step({2: (0, -1)})
+
+        self.assertEqual(self.arena.snakes, {})
+
+    def test_follow_tail(self):
+        """Тест хода в клетку, которую на этом шаге покидает чужой хвост."""
+        self._apples([0, 1])
+        self._place(1, 5, 2)
+        self._place(2, 3, 3)
+
+        events = self.arena.step({2: (0, -1)})
+
+        self.assertEqual([died for *_, died in events], [False, False])
+
+    def test_eat_apple(self):
+        """Тест поедания яблока и его перестановки."""
+        snake = self._place(1, 5, 2)
+        self._apples([2 * 20 + 6, 0])
+
+        self.arena.step()
+        self.assertEqual(snake.grow_pending, 1)
+        self.assertEqual(len(self.arena.moved_apples), 1)
+        slot, cell = self.arena.moved_apples[0]
+        self.assertEqual(slot, 0)
+        self.assertEqual(self.arena.apples[0], cell)
+
+        events = self.arena.step()
+        self.assertTrue(events[0][2])
+        self.assertEqual(len(self.arena.body_cells(1)), 4)
+
+    def test_wall(self):
+        """Тест гибели от стены."""
+        self._apples([0, 1])
+        self._place(1, 19, 2)
+
+        events = self.arena.step()
+
+        self.assertTrue(events[0][3])
+        self.assertEqual(self.arena.snakes, {})
+
+    def test_shared_occupancy(self):
+        """Тест что змейки меняют общую сетку, и она совпадает с их клетками."""
+        arena = Arena(width=600, height=400, grid_size=20, apples=8, seed=3)
+        for snake_id in range(20):
+            arena.add_snake(snake_id)
+
+        for _ in range(200):
+            arena.step({i: arena.steer(i) for i in arena.snakes if i % 3})
+            for snake_id in range(20):
+                if snake_id not in arena.snakes:
+                    arena.add_snake(snake_id)
+
+            expected = bytearray(len(arena.occupancy))
+            for snake_id, snake in arena.snakes.items():
+                self.assertIs(snake.occupancy, arena.occupancy)
+                for cell in arena.body_cells(snake_id):
+                    expected[cell] += 1
+            self.assertEqual(arena.occupancy, expected)
+
+    def test_steer(self):
+        """Тест что бот идет к яблоку и не сворачивает в занятую клетку."""
+        self._apples([2 * 20 + 10, 14 * 20 + 19])
+        self._place(1, 5, 2)
+        self.assertEqual(self.arena.steer(1), (1, 0))
+
+        # Чужая змейка перекрывает путь вправо
+        self._place(2, 7, 2)
+        self.assertIn(self.arena.steer(1), ((0, -1), (0, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
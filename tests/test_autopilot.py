@@ -0,0 +1,94 @@
+"""
+Тесты для автопилота.
+"""
+
+import unittest
+from game.autopilot import Autopilot
+from game.base import Cell
+from game.simulation import Simulation
+
+
+class TestAutopilot(unittest.TestCase):
+    """Тесты для класса Autopilot."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.sim = Simulation(width=400, height=300, grid_size=20, seed=1)
+        self.pilot = Autopilot.for_simulation(self.sim)
+
+    def _place_apple(self, col, row):
+        self.sim.apple.x = col * self.sim.grid_size
+        self.sim.apple.y = row * self.sim.grid_size
+
+    def test_shortest_path_to_apple(self):
+        """Тест что змейка идет к яблоку кратчайшим путем."""
+        # Голова в клетке (10, 7), змейка смотрит вправо
+        self._place_apple(10, 2)
+
+        for _ in range(5):
+            self.sim.step(self.pilot.choose(self.sim))
+
+        self.assertEqual(self.sim.score, 1)
+
+    def test_field_reused_while_apple_stays(self):
+        """Тест что поле расстояний не строится заново на каждом шаге."""
+        self._place_apple(0, 0)
+
+        for _ in range(5):
+            self.sim.step(self.pilot.choose(self.sim))
+
+        self.assertEqual(self.pilot.recomputed, 1)
+
+    def test_no_reverse(self):
+        """Тест что бот не разворачивается в собственную шею."""
+        # Яблоко прямо за хвостом
+        self._place_apple(6, 7)
+
+        self.assertNotEqual(self.pilot.choose(self.sim), (-1, 0))
+
+    def _set_snake(self, head, body, direction):
+        """Укладывает змейку по клеткам: голова и тело от шеи к хвосту."""
+        size = self.sim.grid_size
+        snake = self.sim.snake
+        snake.x, snake.y = head[0] * size, head[1] * size
+        snake.body.clear()
+        snake.body.extend(Cell(col * size, row * size) for col, row in body)
+        snake.direction = snake.next_direction = direction
+        snake.rebuild_occupancy()
+
+    def test_waits_for_tail_when_apple_unreachable(self):
+        """Тест хода при отрезанном яблоке и повторного поиска после ухода хвоста."""
+        # Яблоко в углу закрыто телом, хвост уходит из (0, 1) на следующем шаге
+        self._set_snake((2, 1), [(2, 0), (1, 0), (1, 1), (0, 1)], (0, 1))
+        self._place_apple(0, 0)
+
+        self.assertIn(self.pilot.choose(self.sim), ((0, 1), (1, 0)))
+        self.assertEqual(self.pilot.recomputed, 1)
+
+        self.sim.step((0, 1))
+        self.pilot.choose(self.sim)
+        self.assertEqual(self.pilot.recomputed, 2)
+
+    def test_largest_region(self):
+        """Тест выбора хода в большую из двух областей."""
+        # Тело стоит стеной в столбце 3: слева 45 клеток, справа 240
+        self._set_snake((3, 0), [(3, row) for row in range(1, 15)], (0, -1))
+        snake = self.sim.snake
+
+        moves = self.pilot._moves(snake, snake.cell_index(snake.x, snake.y))
+        self.assertEqual({direction for direction, _ in moves}, {(-1, 0), (1, 0)})
+        self.assertEqual(self.pilot._largest_region(moves, snake.occupancy), (1, 0))
+
+    def test_self_play(self):
+        """Тест что бот доигрывает игру без ошибок и набирает очки."""
+        sim = Simulation(width=200, height=200, grid_size=20, seed=3)
+        pilot = Autopilot.for_simulation(sim)
+
+        while not sim.game_over and sim.ticks < 5000:
+            sim.step(pilot.choose(sim))
+
+        self.assertGreater(sim.score, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,6 +22,7 @@ class TestGameObject(unittest.TestCase):
         self.assertEqual(self.obj.width, 50)
         self.assertEqual(self.obj.height, 60)
         self.assertEqual(self.obj.color, (255, 0, 0))
+        self.assertFalse(hasattr(self.obj, '__dict__'))
 
     def test_rect_property(self):
         """Тест свойства rect."""
@@ -38,6 +39,14 @@ class TestGameObject(unittest.TestCase):
         self.assertEqual(self.obj.x, 110)
         self.assertEqual(self.obj.y, 145)
 
+    def test_draw_with_offset(self):
+        """Тест отрисовки со сдвигом поверхности относительно поля."""
+        surface = pygame.Surface((100, 100))
+        self.obj.draw(surface, offset=(80, 140))
+
+        self.assertEqual(tuple(surface.get_at((20, 10)))[:3], (255, 0, 0))
+        self.assertEqual(tuple(surface.get_at((19, 10)))[:3], (0, 0, 0))
+
     def test_check_collision(self):
         """Тест проверки столкновений."""
         other = GameObject(120, 160, 30, 40)
@@ -0,0 +1,119 @@
+"""
+Тесты для пакетной симуляции.
+"""
+
+import unittest
+import numpy as np
+from game.batch import BatchSimulation
+
+
+class TestBatchSimulation(unittest.TestCase):
+    """Тесты для класса BatchSimulation."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.batch = BatchSimulation(num_games=4, cols=10, rows=8, seed=1)
+
+    def test_initialization(self):
+        """Тест начального состояния."""
+        self.assertTrue(self.batch.alive.all())
+        self.assertTrue((self.batch.length == 3).all())
+        self.assertTrue((self.batch.occupancy.sum(axis=1) == 3).all())
+        # Яблоко не попадает на змейку
+        for i in range(4):
+            self.assertEqual(self.batch.occupancy[i, self.batch.apple[i]], 0)
+
+    def test_step_moves_right(self):
+        """Тест шага без смены направления."""
+        self.batch.apple[:] = 0
+        self.batch.step()
+
+        heads = self.batch.body[np.arange(4), self.batch.head_ptr]
+        self.assertTrue((heads == 4 * 10 + 6).all())
+        self.assertTrue((self.batch.occupancy.sum(axis=1) == 3).all())
+
+    def test_reverse_is_ignored(self):
+        """Тест запрета разворота на 180 градусов."""
+        self.batch.apple[:] = 0
+        self.batch.step(np.array([2, 0, -1, 1]))
+
+        self.assertEqual(list(self.batch.direction), [3, 0, 3, 1])
+        self.assertTrue(self.batch.alive.all())
+
+    def test_eat_and_grow(self):
+        """Тест поедания яблока и роста."""
+        self.batch.apple[:] = 4 * 10 + 6
+        self.batch.step()
+        self.assertTrue((self.batch.score == 1).all())
+
+        self.batch.apple[:] = 0
+        self.batch.step()
+        self.assertTrue((self.batch.length == 4).all())
+        self.assertTrue((self.batch.occupancy.sum(axis=1) == 4).all())
+
+    def test_wall_collision_and_reset(self):
+        """Тест гибели у стены и перезапуска."""
+        self.batch.apple[:] = 0
+        for _ in range(5):
+            self.batch.step()
+
+        self.assertFalse(self.batch.alive.any())
+
+        self.batch.reset([0])
+        self.assertTrue(self.batch.alive[0])
+        self.assertFalse(self.batch.alive[1:].any())
+
+    def test_death_keeps_state(self):
+        """Тест что погибшая змейка не растет и не сдвигает хвост."""
+        self.batch.apple[:] = 0
+        for _ in range(4):
+            self.batch.step()
+        self.batch.grow_pending[:] = 1
+        self.batch.step()
+
+        self.assertFalse(self.batch.alive.any())
+        self.assertTrue((self.batch.length == 3).all())
+        self.assertTrue((self.batch.grow_pending == 1).all())
+        self.assertTrue((self.batch.occupancy.sum(axis=1) == 3).all())
+
+    def _square_snake(self, grow_pending):
+        """Змейка длины 4 по кругу 2x2, голова над хвостом."""
+        batch = BatchSimulation(num_games=1, cols=10, rows=8, seed=1)
+        batch.body[0, :4] = [0, 1, 11, 10]
+        batch.head_ptr[0] = 3
+        batch.length[0] = 4
+        batch.grow_pending[0] = grow_pending
+        batch.occupancy[0] = 0
+        batch.occupancy[0, [0, 1, 11, 10]] = 1
+        batch.direction[0] = 0
+        batch.apple[0] = 50
+        batch.step()
+        return batch
+
+    def test_follow_tail(self):
+        """Тест хода в клетку уходящего хвоста."""
+        batch = self._square_snake(grow_pending=0)
+        self.assertTrue(batch.alive[0])
+        self.assertEqual(batch.body[0, batch.head_ptr[0]], 0)
+        self.assertEqual(batch.occupancy[0].sum(), 4)
+
+        # Растущая змейка хвост не освобождает
+        batch = self._square_snake(grow_pending=1)
+        self.assertFalse(batch.alive[0])
+        self.assertEqual(batch.length[0], 4)
+
+    def test_respawn_on_crowded_board(self):
+        """Тест яблока на почти заполненном поле."""
+        self.batch.occupancy[0] = 1
+        self.batch.occupancy[0, 7] = 0
+        self.batch._respawn_apples(np.array([0]))
+        self.assertEqual(self.batch.apple[0], 7)
+
+        self.batch.occupancy[0, 7] = 1
+        self.batch._respawn_apples(np.array([0]))
+        self.assertTrue(self.batch.won[0])
+        self.assertFalse(self.batch.alive[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
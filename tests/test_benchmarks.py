@@ -0,0 +1,59 @@
+"""
+Тесты для набора бенчмарков.
+"""
+
+import unittest
+from benchmarks.run_benchmarks import (Case, camera_cases, compare, make_snake,
+                                       run)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Тесты для вспомогательных функций бенчмарков."""
+
+    def test_make_snake(self):
+        """Тест укладки длинной змейки по полю."""
+        snake = make_snake(1000, 20, 800, 600)
+
+        self.assertEqual(snake.get_length(), 1000)
+        self.assertEqual(sum(snake.occupancy), 1000)
+        self.assertFalse(snake.check_self_collision())
+        self.assertFalse(snake.check_wall_collision(800, 600))
+
+        with self.assertRaises(ValueError):
+            make_snake(2000, 20, 800, 600)
+
+    def test_run_and_compare(self):
+        """Тест формата результатов и поиска регрессий."""
+        case = Case('noop', {'n': 1}, lambda: None, lambda state: None, number=10)
+        report = run([case, Case('skipped', {}, None, None, 1)], repeat=2,
+                     pattern='noop', min_time=0.0)
+
+        self.assertEqual(list(report['results']), ['noop'])
+        self.assertEqual(report['results']['noop']['params'], {'n': 1})
+        self.assertEqual(report['results']['noop']['repeat'], 2)
+
+        current = {'results': {'a': {'min_ns': 130.0}, 'b': {'min_ns': 100.0},
+                               'new': {'min_ns': 1.0}}}
+        baseline = {'results': {'a': {'min_ns': 100.0}, 'b': {'min_ns': 100.0}}}
+        rows = {row['name']: row for row in compare(current, baseline, threshold=0.2)}
+
+        self.assertEqual(set(rows), {'a', 'b'})
+        self.assertTrue(rows['a']['regression'])
+        self.assertFalse(rows['b']['regression'])
+
+    def test_camera_cases_use_own_field(self):
+        """Тест что каждый замер камеры готовит поле своего размера."""
+        cases = {case.name: case for case in camera_cases(
+            side_cells=(10, 1000), grid_size=4, viewport=(80, 60))}
+
+        for side in (10, 1000):
+            suffix = f'[{side}x{side},grid=4]'
+            simulation, _ = cases['simulation.step_huge' + suffix].setup()
+            self.assertEqual((simulation.snake.cols, simulation.snake.rows),
+                             (side, side))
+            engine = cases['camera.frame' + suffix].setup()
+            self.assertEqual(engine.simulation.snake.cols, side)
+
+
+if __name__ == '__main__':
+    unittest.main()
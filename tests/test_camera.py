@@ -0,0 +1,100 @@
+"""
+Тесты для камеры и кэша кусков большого поля.
+"""
+
+import unittest
+import pygame
+from game.camera import Camera, ChunkCache
+
+
+class TestCamera(unittest.TestCase):
+    """Тесты для класса Camera."""
+
+    def test_follow(self):
+        """Тест центрирования на клетке и остановки у краев поля."""
+        camera = Camera(1000, 800, 210, 100, grid_size=10)
+        self.assertEqual((camera.width, camera.height), (210, 100))
+
+        self.assertTrue(camera.follow(500, 400))
+        self.assertEqual(camera.offset, (400, 350))
+        self.assertFalse(camera.follow(500, 400))
+
+        camera.follow(0, 790)
+        self.assertEqual(camera.offset, (0, 700))
+        camera.follow(990, 0)
+        self.assertEqual(camera.offset, (790, 0))
+        self.assertEqual(camera.rect, pygame.Rect(790, 0, 210, 100))
+
+    def test_view_larger_than_field(self):
+        """Тест что область не больше поля."""
+        camera = Camera(200, 100, 800, 600, grid_size=20)
+
+        self.assertEqual((camera.width, camera.height), (200, 100))
+        camera.follow(100, 60)
+        self.assertEqual(camera.offset, (0, 0))
+
+
+class TestChunkCache(unittest.TestCase):
+    """Тесты для класса ChunkCache."""
+
+    def setUp(self):
+        """Кэш кусков 4x4 клетки по 10 пикселей, куски заливаются по номеру."""
+        self.rendered = []
+
+        def render(surface, key):
+            self.rendered.append(key)
+            surface.fill((key[0], key[1], 0))
+
+        self.cache = ChunkCache(10, render, chunk_cells=4, capacity=6)
+
+    def test_draw_visible_chunks(self):
+        """Тест отрисовки только видимых кусков со сдвигом камеры."""
+        target = pygame.Surface((60, 80))
+        target.fill((255, 255, 255))
+        self.cache.draw(target, pygame.Rect(20, 40, 60, 60))
+
+        self.assertEqual(sorted(self.rendered), [(0, 1), (0, 2), (1, 1), (1, 2)])
+        self.assertEqual(tuple(target.get_at((0, 0)))[:3], (0, 1, 0))
+        self.assertEqual(tuple(target.get_at((20, 0)))[:3], (1, 1, 0))
+        self.assertEqual(tuple(target.get_at((20, 59)))[:3], (1, 2, 0))
+        # Ниже области поверхность не тронута
+        self.assertEqual(tuple(target.get_at((20, 60)))[:3], (255, 255, 255))
+
+    def test_invalidate(self):
+        """Тест перерисовки только измененного куска и только при показе."""
+        first = self.cache.get((0, 0))
+        self.cache.get((1, 0))
+        self.rendered.clear()
+
+        self.cache.invalidate(45, 5)
+        self.cache.invalidate(500, 500)
+        self.assertIs(self.cache.get((0, 0)), first)
+        self.assertEqual(self.rendered, [])
+
+        self.cache.get((1, 0))
+        self.cache.get((1, 0))
+        self.assertEqual(self.rendered, [(1, 0)])
+
+        self.cache.clear()
+        self.cache.get((0, 0))
+        self.assertEqual(self.rendered, [(1, 0), (0, 0)])
+        self.assertEqual(self.cache.renders, 4)
+
+    def test_eviction_reuses_surfaces(self):
+        """Тест вытеснения давно не показанных кусков."""
+        surfaces = {id(self.cache.get((col, 0))) for col in range(6)}
+        self.cache.get((0, 0))
+        self.cache.invalidate(45, 5)
+
+        for col in range(6, 12):
+            self.assertIn(id(self.cache.get((col, 0))), surfaces)
+        self.assertEqual(len(self.cache), 6)
+
+        # Вытесненный кусок рисуется заново, а отметка о нем не копится
+        self.rendered.clear()
+        self.cache.get((1, 0))
+        self.assertEqual(self.rendered, [(1, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Тесты для среды обучения с подкреплением.
+"""
+
+import unittest
+import numpy as np
+from game.env import SnakeEnv
+
+
+class TestSnakeEnv(unittest.TestCase):
+    """Тесты для класса SnakeEnv."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.env = SnakeEnv(width=400, height=300, grid_size=20)
+
+    def _cell(self, x, y):
+        """Номер клетки по координатам в пикселях."""
+        return (y // 20) * self.env.cols + x // 20
+
+    def test_reset(self):
+        """Тест начального наблюдения."""
+        obs = self.env.reset(seed=1)
+        snake = self.env.simulation.snake
+
+        self.assertEqual(obs.shape, (3, 15, 20))
+        self.assertEqual(obs.dtype, np.uint8)
+        self.assertEqual(obs[SnakeEnv.HEAD].sum(), 1)
+        self.assertEqual(obs[SnakeEnv.HEAD, snake.y // 20, snake.x // 20], 1)
+        self.assertEqual(obs[SnakeEnv.BODY].sum(), 2)
+        self.assertEqual(obs[SnakeEnv.APPLE].sum(), 1)
+        self.assertEqual(self.env.action_count, 4)
+
+    def test_step_reuses_buffer(self):
+        """Тест что наблюдение обновляется в одном и том же буфере."""
+        first = self.env.reset(seed=1)
+        obs, reward, done, info = self.env.step(3)
+
+        self.assertIs(obs, first)
+        self.assertEqual(reward, 0.0)
+        self.assertFalse(done)
+        self.assertEqual(info['ticks'], 1)
+        self.assertEqual(obs[SnakeEnv.HEAD].sum(), 1)
+        self.assertEqual(obs[SnakeEnv.BODY].sum(), 2)
+
+    def test_apple_reward(self):
+        """Тест награды за яблоко."""
+        self.env.reset(seed=1)
+        simulation = self.env.simulation
+        snake = simulation.snake
+        simulation.apple.x, simulation.apple.y = snake.x + 20, snake.y
+        obs, reward, done, info = self.env.step(3)
+
+        self.assertEqual(reward, SnakeEnv.REWARD_APPLE)
+        self.assertEqual(info['score'], 1)
+        self.assertEqual(obs[SnakeEnv.APPLE].sum(), 1)
+        apple = self._cell(simulation.apple.x, simulation.apple.y)
+        self.assertEqual(obs[SnakeEnv.APPLE].reshape(-1)[apple], 1)
+
+    def test_death(self):
+        """Тест награды и конца эпизода при ударе о стену."""
+        self.env.reset(seed=1)
+        done = False
+        steps = 0
+        while not done:
+            _, reward, done, info = self.env.step(0)
+            steps += 1
+
+        self.assertEqual(reward, SnakeEnv.REWARD_DEATH)
+        self.assertFalse(info['truncated'])
+        self.assertEqual(self.env.step(0)[2], True)
+
+    def test_truncated(self):
+        """Тест конца эпизода, в котором змейка долго не ест."""
+        env = SnakeEnv(width=400, height=300, grid_size=20, max_idle_steps=2)
+        env.reset(seed=1)
+        env.simulation.apple.x, env.simulation.apple.y = 0, 0
+        env.step(3)
+        _, reward, done, info = env.step(3)
+
+        self.assertTrue(done)
+        self.assertEqual(reward, SnakeEnv.REWARD_STEP)
+        self.assertTrue(info['truncated'])
+
+    def test_observation_matches_simulation(self):
+        """Тест совпадения наблюдения с игрой на длинном эпизоде."""
+        obs = self.env.reset(seed=3)
+        rng = np.random.default_rng(0)
+        for _ in range(300):
+            obs, _, done, _ = self.env.step(int(rng.integers(4)))
+            if done:
+                obs = self.env.reset(seed=3)
+            snake = self.env.simulation.snake
+            body = np.zeros(snake.cols * snake.rows, dtype=np.uint8)
+            for cell in snake.body:
+                body[self._cell(cell.x, cell.y)] += 1
+            np.testing.assert_array_equal(obs[SnakeEnv.BODY].reshape(-1), body)
+
+    def test_same_seed_same_episode(self):
+        """Тест воспроизводимости эпизода по зерну."""
+        runs = []
+        for _ in range(2):
+            self.env.reset(seed=5)
+            runs.append([self.env.step(a % 4)[1] for a in range(50)])
+            runs[-1].append(self.env.observation.copy().tobytes())
+        self.assertEqual(runs[0], runs[1])
+
+    def test_step_before_reset(self):
+        """Тест шага без reset."""
+        with self.assertRaises(RuntimeError):
+            self.env.step(0)
+
+    def test_invalid_action(self):
+        """Тест что номер вне ACTIONS отклоняется, а игра не меняется."""
+        self.env.reset(seed=1)
+        ticks = self.env.simulation.ticks
+        for action in (-1, len(SnakeEnv.ACTIONS)):
+            with self.assertRaises(ValueError):
+                self.env.step(action)
+        self.assertEqual(self.env.simulation.ticks, ticks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Тесты для параллельного прогона игр.
+"""
+
+import subprocess
+import sys
+import unittest
+from game.evaluation import (CRASHED, STALLED, WON, EvaluationConfig,
+                             EvaluationStats, GameResult, play_game,
+                             run_evaluation)
+
+
+class TestEvaluationConfig(unittest.TestCase):
+    """Тесты для класса EvaluationConfig."""
+
+    def test_game_params(self):
+        """Тест что параметры игры зависят только от зерна и номера."""
+        config = EvaluationConfig(10, seed=3, width_range=(400, 1200),
+                                  grid_range=(20, 40))
+        params = config.game_params(7)
+
+        self.assertEqual(params, EvaluationConfig(100, seed=3, width_range=(400, 1200),
+                                                  grid_range=(20, 40)).game_params(7))
+        self.assertNotEqual(params, config.game_params(8))
+        width, height, grid_size, speed, _ = params
+        self.assertTrue(400 <= width <= 1200)
+        self.assertEqual(height, 600)
+        self.assertTrue(20 <= grid_size <= 40)
+        self.assertEqual(speed, 10)
+
+    def test_invalid(self):
+        """Тест неверных параметров."""
+        with self.assertRaises(ValueError):
+            EvaluationConfig(0)
+        with self.assertRaises(ValueError):
+            EvaluationConfig(10, width_range=(800, 400))
+        with self.assertRaises(ValueError):
+            EvaluationConfig(10, width_range=(100, 400))
+        with self.assertRaises(ValueError):
+            EvaluationConfig(10, pilot='random')
+
+
+class TestPlayGame(unittest.TestCase):
+    """Тесты для функции play_game."""
+
+    def test_path_pilot(self):
+        """Тест игры бота по кратчайшему пути."""
+        config = EvaluationConfig(1, width_range=(400, 400), height_range=(300, 300))
+        result = play_game(config, 0)
+
+        self.assertEqual(result, play_game(config, 0))
+        self.assertIn(result.outcome, (WON, CRASHED))
+        self.assertEqual(result.length, result.score + 3)
+
+    def test_cycle_pilot_wins(self):
+        """Тест что бот на цикле заполняет поле."""
+        config = EvaluationConfig(1, width_range=(400, 400), height_range=(300, 300),
+                                  pilot='cycle')
+        result = play_game(config, 0)
+
+        self.assertEqual(result.outcome, WON)
+        self.assertEqual(result.length, 70)
+
+    def test_stalled(self):
+        """Тест остановки игры, в которой змейка долго не ест."""
+        config = EvaluationConfig(1, width_range=(400, 400), height_range=(300, 300),
+                                  pilot='cycle', stall_factor=0)
+        result = play_game(config, 0)
+
+        self.assertEqual(result.outcome, STALLED)
+
+
+class TestEvaluationStats(unittest.TestCase):
+    """Тесты для класса EvaluationStats."""
+
+    def test_summary(self):
+        """Тест сводной статистики."""
+        stats = EvaluationStats()
+        stats.add(1, 2.0, [GameResult(0, 800, 600, 40, 10, 5, 8, 100, CRASHED),
+                           GameResult(1, 800, 600, 40, 20, 1, 4, 100, CRASHED)])
+        stats.add(2, 1.0, [GameResult(2, 800, 600, 40, 10, 9, 12, 300, WON)])
+        summary = stats.summary()
+
+        self.assertEqual(summary['games'], 3)
+        self.assertEqual(summary['outcomes'], {CRASHED: 2, WON: 1})
+        self.assertEqual(summary['score']['mean'], 5)
+        self.assertEqual(summary['score']['min'], 1)
+        self.assertEqual(summary['score']['median'], 5)
+        self.assertEqual(summary['score']['max'], 9)
+        self.assertEqual(summary['mean_length'], 8)
+        self.assertEqual(summary['mean_game_seconds'], (10 + 5 + 30) / 3)
+        self.assertEqual(summary['ticks_per_second'], {'1': 100.0, '2': 300.0})
+
+
+class TestRunEvaluation(unittest.TestCase):
+    """Тесты для функции run_evaluation."""
+
+    def test_pool_matches_inline(self):
+        """Тест что пул процессов дает те же итоги, что и один процесс."""
+        config = EvaluationConfig(12, width_range=(400, 600), height_range=(300, 400))
+        progress = []
+
+        inline = run_evaluation(config, workers=1, chunk_size=5,
+                                on_progress=lambda stats: progress.append(stats.games))
+        pooled = run_evaluation(config, workers=2, chunk_size=5)
+
+        self.assertEqual(progress, [5, 10, 12])
+        self.assertEqual(inline.scores, pooled.scores)
+        self.assertEqual(inline.total_ticks, pooled.total_ticks)
+        self.assertEqual(pooled.games, 12)
+
+    def test_workers_skip_engine(self):
+        """Тест что прогон игр не загружает движок с окном и сетью."""
+        code = ('import sys, game.evaluation; '
+                'print("game.game_engine" in sys.modules)')
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                text=True, check=True).stdout
+        self.assertEqual(output.split()[-1], 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Тесты для индекса свободных клеток.
+"""
+
+import random
+import unittest
+from game.free_cells import FreeCellIndex
+
+
+class TestFreeCellIndex(unittest.TestCase):
+    """Тесты для класса FreeCellIndex."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.index = FreeCellIndex(10)
+
+    def test_initialization(self):
+        """Тест что изначально все клетки свободны."""
+        self.assertEqual(len(self.index), 10)
+        self.assertIn(0, self.index)
+        self.assertIn(9, self.index)
+
+    def test_remove_and_add(self):
+        """Тест удаления и возврата клеток."""
+        self.index.remove(3)
+        self.index.remove(3)  # Повторное удаление ничего не меняет
+        self.assertEqual(len(self.index), 9)
+        self.assertNotIn(3, self.index)
+
+        self.index.add(3)
+        self.index.add(3)
+        self.assertEqual(len(self.index), 10)
+        self.assertIn(3, self.index)
+
+    def test_sample_only_free(self):
+        """Тест что выбираются только свободные клетки."""
+        for cell in range(9):
+            self.index.remove(cell)
+
+        rng = random.Random(0)
+        for _ in range(20):
+            self.assertEqual(self.index.sample(rng), 9)
+
+        self.index.remove(9)
+        with self.assertRaises(IndexError):
+            self.index.sample(rng)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,17 @@
 Тесты для игрового движка.
 """
 
+import asyncio
+import os
+import tempfile
+import threading
+import time
 import unittest
+from collections import deque
 from unittest.mock import Mock, patch
 import pygame
 from game.game_engine import GameEngine
+from game.network import ArenaMirror, GameServer
 
 
 class TestGameEngine(unittest.TestCase):
@@ -26,7 +33,9 @@ class TestGameEngine(unittest.TestCase):
             grid_size=20,
             fps=60,
             snake_speed=10,
-            player_name="ТестовыйИгрок"
+            player_name="ТестовыйИгрок",
+            results_path=':memory:',
+            legacy_results_path=None
         )
 
         # Мокаем pygame методы
@@ -36,6 +45,10 @@ class TestGameEngine(unittest.TestCase):
         self.engine.font.render = Mock(return_value=Mock())
         self.engine.big_font.render = Mock(return_value=Mock())
 
+    def tearDown(self):
+        """Остановка фоновой записи результатов."""
+        self.engine.result_writer.close()
+
     def test_initialization(self):
         """Тест инициализации движка."""
         self.assertEqual(self.engine.width, 400)
@@ -82,22 +95,372 @@ class TestGameEngine(unittest.TestCase):
         # Движок не должен ничего обновлять
         self.assertTrue(self.engine.game_over)
 
-    @patch('builtins.open')
-    def test_save_result(self, mock_open):
+    def test_save_result(self):
         """Тест сохранения результата."""
-        mock_file = Mock()
-        mock_open.return_value.__enter__.return_value = mock_file
-
         self.engine.score = 150
         self.engine.snake.get_length = Mock(return_value=12)
 
         self.engine._save_result()
+        self.engine.result_writer.flush()
+
+        row = self.engine.results.connection.execute(
+            'SELECT player, score, length, speed, field_width, field_height, '
+            'grid_size FROM results'
+        ).fetchall()
+        self.assertEqual(row, [("ТестовыйИгрок", 150, 12, 10, 400, 300, 20)])
+        self.assertEqual(self.engine.results.high_score("ТестовыйИгрок"), 150)
+
+    def test_replay_only_with_dir(self):
+        """Тест что игра записывается, только если задана папка реплеев."""
+        self.assertIsNone(self.engine.recorder)
+        self.engine._tick()
+        self.assertEqual(self.engine.simulation.ticks, 1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = GameEngine(width=400, height=300, grid_size=20,
+                                results_path=':memory:', legacy_results_path=None,
+                                replay_dir=tmp)
+            while not engine.game_over:
+                engine._tick()
+            engine.result_writer.close()
+            self.assertEqual(len(engine.recorder.inputs), engine.simulation.ticks)
+            self.assertEqual(len(os.listdir(tmp)), 1)
+
+    def test_board_cache(self):
+        """Тест кэширования отрисованного поля."""
+        self.engine.game_surface = Mock()
+        self.engine._render_game_board = Mock(return_value=Mock())
+
+        self.engine._draw_game_board()
+        self.engine._draw_game_board()
+        self.assertEqual(self.engine._render_game_board.call_count, 1)
+        self.assertEqual(self.engine.game_surface.blit.call_count, 2)
+
+        # Смена цвета сбрасывает кэш
+        self.engine.color1 = pygame.Color('#000000')
+        self.engine._draw_game_board()
+        self.assertEqual(self.engine._render_game_board.call_count, 2)
+
+    def test_dirty_rects(self):
+        """Тест частичной перерисовки после шага змейки."""
+        self.engine.fullscreen = False
+        self.engine.font.render = Mock(return_value=pygame.Surface((1, 1)))
+        self.engine.apple.x, self.engine.apple.y = 0, 0
+
+        head = pygame.Rect(self.engine.snake.x, self.engine.snake.y, 20, 20)
+        tail = self.engine.snake.body[-1]
+
+        self.engine.draw()  # Первый кадр всегда полный
+        self.engine.update(1.0)
+
+        pygame.display.update = Mock()
+        self.engine.draw()
+
+        pygame.display.update.assert_called_once()
+        rects = pygame.display.update.call_args[0][0]
+        self.assertIn(head, rects)
+        self.assertIn(pygame.Rect(tail.x, tail.y, 20, 20), rects)
+        self.assertIn(head.move(20, 0), rects)
+        # Панель статистики не изменилась
+        self.assertTrue(all(rect.bottom <= 300 for rect in rects))
+
+    def test_profiler_phases_headless(self):
+        """Тест что без окна кадр отмечает все фазы отрисовки по порядку."""
+        self.engine.headless = True
+        self.engine.fullscreen = False
+        self.engine.font.render = Mock(return_value=pygame.Surface((1, 1)))
+        self.engine.apple.x, self.engine.apple.y = 0, 0
+        lap = self.engine.profiler.lap = Mock()
+        phases = ['board', 'snake', 'ui', 'messages', 'screen', 'profiler', 'flip']
+
+        self.engine.draw()  # Полный кадр
+        self.assertEqual([call[0][0] for call in lap.call_args_list], phases)
+
+        lap.reset_mock()
+        self.engine.update(1.0)
+        with patch.object(self.engine, '_draw_dirty',
+                          wraps=self.engine._draw_dirty) as draw_dirty:
+            self.engine.draw()  # Частичный кадр
+        draw_dirty.assert_called_once()
+        self.assertEqual([call[0][0] for call in lap.call_args_list], phases)
+
+    @patch('pygame.transform.scale')
+    def test_manual_scaling_reuses_surface(self, mock_scale):
+        """Тест что масштаб считается один раз, а кадр масштабируется в готовую поверхность."""
+        self.engine.fullscreen = True
+        self.engine.scaled_by_sdl = False
+        self.engine.screen_width = 1920
+        self.engine.screen_height = 1080
+        self.engine._update_scaling()
+
+        self.assertTrue(self.engine.needs_scaling)
+        self.assertEqual(self.engine.scale_factor, 1080 / 420)
+
+        self.engine._draw_to_screen()
+        self.engine._draw_to_screen()
+
+        dest = self.engine._scaled_surface
+        for call in mock_scale.call_args_list:
+            self.assertIs(call[0][2], dest)
+        self.engine.screen.blit.assert_called_with(dest, self.engine.screen_offset)
+
+    @patch('pygame.event.wait')
+    def test_redraw_only_on_change(self, mock_wait):
+        """Тест что кадр перерисовывается только после изменений."""
+        mock_wait.return_value = Mock(type=pygame.NOEVENT)
+        self.engine._needs_redraw = False
+        self.engine.apple.x, self.engine.apple.y = 0, 0
+
+        # Шаг еще не наступил - перерисовка не нужна, ждем остаток задержки
+        self.engine.update(0.03)
+        self.assertFalse(self.engine._needs_redraw)
+        self.engine._wait_for_work()
+        mock_wait.assert_called_with(70)
+
+        self.engine.update(0.08)
+        self.assertTrue(self.engine._needs_redraw)
+
+        # На паузе ждем только события
+        self.engine.paused = True
+        self.engine._wait_for_work()
+        mock_wait.assert_called_with(0)
+
+    @patch('pygame.event.get')
+    def test_toggle_profiler(self, mock_event_get):
+        """Тест переключения панели времени кадра."""
+        mock_event = Mock()
+        mock_event.type = pygame.KEYDOWN
+        mock_event.key = pygame.K_F3
+        mock_event_get.return_value = [mock_event]
+        self.engine._needs_redraw = False
+
+        self.engine.handle_events()
+        self.assertTrue(self.engine.show_profiler)
+        self.assertTrue(self.engine._needs_redraw)
+
+        self.engine.handle_events()
+        self.assertFalse(self.engine.show_profiler)
+
+    @patch('pygame.event.get')
+    def test_autopilot(self, mock_event_get):
+        """Тест управления змейкой автопилотом."""
+        mock_event = Mock()
+        mock_event.type = pygame.KEYDOWN
+        mock_event.key = pygame.K_F2
+        mock_event_get.return_value = [mock_event]
+
+        self.engine.handle_events()
+        self.assertTrue(self.engine.autopilot)
+
+        # Яблоко прямо над головой, бот поворачивает к нему
+        self.engine.apple.x = self.engine.snake.x
+        self.engine.apple.y = self.engine.snake.y - 2 * self.engine.grid_size
+        self.engine._tick()
+        self.engine._tick()
+        self.assertEqual(self.engine.score, 1)
+
+    def test_pilot_mode(self):
+        """Тест выбора бота на гамильтоновом цикле."""
+        engine = GameEngine(width=400, height=300, grid_size=20,
+                            results_path=':memory:', legacy_results_path=None,
+                            autopilot=True, pilot_mode='cycle')
+        engine.result_writer.close()
+        self.assertIsInstance(engine.pilot, GameEngine.PILOTS['cycle'])
+
+        length = engine.snake.get_length()
+        for _ in range(50):
+            engine._tick()
+        self.assertFalse(engine.game_over)
+        self.assertEqual(engine.snake.get_length(), length + engine.score)
+
+        with self.assertRaises(ValueError):
+            GameEngine(results_path=':memory:', legacy_results_path=None,
+                       pilot_mode='random')
+
+    @patch('pygame.event.get')
+    def test_network_client(self, mock_event_get):
+        """Тест сетевой игры: движок рисует арену сервера и шлет направления."""
+        loop = asyncio.new_event_loop()
+        server = GameServer(width=400, height=300, grid_size=20, rate=60, seed=1)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            engine = GameEngine(width=800, height=600, grid_size=40,
+                                results_path=':memory:', legacy_results_path=None,
+                                server=('127.0.0.1', server.port))
+            engine.font.render = Mock(return_value=pygame.Surface((1, 1)))
+
+            # Поле и скорость задает сервер
+            self.assertEqual((engine.game_width, engine.game_height), (400, 300))
+            self.assertEqual(engine.grid_size, 20)
+            self.assertEqual(engine.snake_speed, 60)
+            mirror = engine.client.mirror
+            self.assertEqual(mirror.player_id, 1)
+
+            mock_event = Mock()
+            mock_event.type = pygame.KEYDOWN
+            mock_event.key = pygame.K_DOWN
+            mock_event_get.return_value = [mock_event]
+            engine.handle_events()
+
+            deadline = time.monotonic() + 2.0
+            while mirror.directions.get(1) != 1 and time.monotonic() < deadline:
+                engine.update(0.01)
+                time.sleep(0.01)
+            self.assertEqual(mirror.directions.get(1), 1)
+            self.assertGreater(mirror.tick, 0)
+            self.assertFalse(engine.game_over)
+
+            cells = engine.capture_frame(per_cell=True)
+            head = mirror.snakes[1][0]
+            self.assertEqual(tuple(cells[head % mirror.cols, head // mirror.cols]),
+                             tuple(engine._player_colors[0][:3]))
+            # Своей симуляции у клиента нет
+            self.assertIsNone(engine.simulation)
+            self.assertIsNone(engine.snake)
+            engine.client.close()
+            engine.result_writer.close()
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def test_network_game_over(self):
+        """Тест конца сетевой игры при гибели змейки и потере подключения."""
+        engine = self.engine
+        engine.simulation = None
+        mirror = ArenaMirror()
+        mirror.player_id = 1
+        mirror.snakes[1] = deque(range(5))
+        engine.client = Mock(connected=True, mirror=mirror)
+
+        engine._client_update()
+        self.assertFalse(engine.game_over)
+        self.assertEqual(engine.score, 2)
+
+        # Змейка погибла: результат записан, длина - перед гибелью
+        del mirror.snakes[1]
+        engine._client_update()
+        self.assertTrue(engine.game_over)
+        self.assertEqual(engine._snake_length(), 5)
+
+        # Сервер поставил змейку снова, потом подключение пропало
+        mirror.snakes[1] = deque(range(3))
+        engine._client_update()
+        self.assertFalse(engine.game_over)
+        self.assertEqual(engine.score, 0)
+        engine.client.connected = False
+        engine._client_update()
+        self.assertTrue(engine.game_over)
+
+        engine.result_writer.flush()
+        rows = engine.results.connection.execute(
+            'SELECT score, length FROM results ORDER BY id').fetchall()
+        self.assertEqual(rows, [(2, 5), (0, 3)])
+
+    def test_arena_mode(self):
+        """Тест режима арены: змейка игрока и боты на одном поле."""
+        engine = GameEngine(width=400, height=300, grid_size=20, snake_speed=10,
+                            results_path=':memory:', legacy_results_path=None,
+                            arena_bots=6)
+        engine.font.render = Mock(return_value=pygame.Surface((1, 1)))
+        self.assertEqual(len(engine.arena.snakes), 7)
+        self.assertIs(engine.snake, engine.arena.snakes[GameEngine.PLAYER_ID])
+        self.assertIsNone(engine.simulation)
+        self.assertIsNone(engine.pilot)
+
+        cells = engine.capture_frame(per_cell=True)
+        bot = engine.arena.body_cells(1)[0]
+        self.assertEqual(tuple(cells[bot % 20, bot // 20]),
+                         GameEngine.REMOTE_COLORS[1])
+
+        # Змейка игрока упирается в стену, боты продолжают игру
+        for _ in range(25):
+            engine.update(0.1)
+        self.assertTrue(engine.game_over)
+        self.assertEqual(len(engine.arena.snakes), 6)
+
+        engine.result_writer.flush()
+        self.assertEqual(engine.results.connection.execute(
+            'SELECT COUNT(*) FROM results').fetchone()[0], 1)
+        engine.result_writer.close()
+
+    def test_headless_restores_video_driver(self):
+        """Тест что движок без окна не меняет драйвер для всего процесса."""
+        with patch.dict(os.environ):
+            os.environ.pop('SDL_VIDEODRIVER', None)
+            engine = GameEngine(results_path=':memory:', legacy_results_path=None,
+                                headless=True)
+            engine.result_writer.close()
+            self.assertNotIn('SDL_VIDEODRIVER', os.environ)
+
+            os.environ['SDL_VIDEODRIVER'] = 'offscreen'
+            engine = GameEngine(results_path=':memory:', legacy_results_path=None,
+                                headless=True)
+            engine.result_writer.close()
+            self.assertEqual(os.environ['SDL_VIDEODRIVER'], 'offscreen')
+
+    def test_arena_too_narrow(self):
+        """Тест арены, на которой не помещается змейка игрока."""
+        with self.assertRaises(ValueError):
+            GameEngine(width=80, height=300, grid_size=20,
+                       results_path=':memory:', legacy_results_path=None,
+                       arena_bots=2)
+
+    def test_camera_mode(self):
+        """Тест большого поля: видна только область вокруг головы."""
+        engine = GameEngine(width=8000, height=8000, grid_size=8, snake_speed=10,
+                            results_path=':memory:', legacy_results_path=None,
+                            viewport=(200, 160))
+        engine.font.render = Mock(return_value=pygame.Surface((1, 1)))
+        self.assertEqual((engine.display_width, engine.display_height), (200, 280))
+
+        snake = engine.snake
+        engine.apple.x, engine.apple.y = snake.x, snake.y - 16
+        cells = engine.capture_frame(per_cell=True)
+        self.assertEqual(cells.shape, (25, 20, 3))
+        self.assertEqual(tuple(cells[12, 10]), tuple(snake.color[:3]))
+        self.assertEqual(tuple(cells[12, 8]), tuple(engine.apple.color[:3]))
+        # Поле целиком не рисуется, в кэше только фон одного куска
+        self.assertEqual(engine._board_surface.get_size(), (128, 128))
+
+        renders = engine.chunks.renders
+        for _ in range(32):
+            cells = engine.step_frame(per_cell=True)
+        self.assertEqual(tuple(cells[12, 10]), tuple(snake.color[:3]))
+        self.assertIn(tuple(cells[11, 10]),
+                      [tuple(color[:3]) for color in snake.body_colors])
+        # Камера прошла два куска: новые столбцы и куски с головой и хвостом
+        self.assertLessEqual(engine.chunks.renders - renders, 2 * 32 + 2 * 3)
+        self.assertLessEqual(len(engine.chunks), engine.chunks.capacity)
+        engine.result_writer.close()
+
+        with self.assertRaises(ValueError):
+            GameEngine(viewport=(200, 160), arena_bots=2, results_path=':memory:',
+                       legacy_results_path=None)
+
+    def test_capture_frame(self):
+        """Тест получения кадра в массив NumPy."""
+        self.engine.fullscreen = False
+        self.engine.font.render = Mock(return_value=pygame.Surface((1, 1)))
+        self.engine.apple.x, self.engine.apple.y = 0, 0
+
+        frame = self.engine.capture_frame()
+        self.assertEqual(frame.shape, (400, 420, 3))
+
+        cells = self.engine.capture_frame(per_cell=True)
+        self.assertEqual(cells.shape, (20, 15, 3))
+        self.assertEqual(tuple(cells[0, 0]), tuple(self.engine.apple.color[:3]))
+        head = self.engine.snake.x // 20, self.engine.snake.y // 20
+        self.assertEqual(tuple(cells[head]), tuple(self.engine.snake.color[:3]))
 
-        mock_file.write.assert_called_once()
-        args, _ = mock_file.write.call_args
-        self.assertIn("ТестовыйИгрок", args[0])
-        self.assertIn("150", args[0])
-        self.assertIn("12", args[0])
+        # Следующий шаг рисуется в ту же поверхность и тот же буфер
+        next_cells = self.engine.step_frame(per_cell=True)
+        self.assertIs(next_cells, cells)
+        self.assertEqual(tuple(cells[head[0] + 1, head[1]]),
+                         tuple(self.engine.snake.color[:3]))
 
 
 if __name__ == '__main__':
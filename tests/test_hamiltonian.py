@@ -0,0 +1,97 @@
+"""
+Тесты для решателя на гамильтоновом цикле.
+"""
+
+import unittest
+from game.hamiltonian import HamiltonianSolver, build_cycle
+from game.simulation import Simulation
+
+
+class TestBuildCycle(unittest.TestCase):
+    """Тесты для функции build_cycle."""
+
+    def _check(self, cols, rows):
+        cycle = build_cycle(cols, rows)
+        cells = cols * rows
+
+        # На поле с нечетным числом клеток одна остается вне цикла
+        self.assertEqual(len(cycle), cells - cells % 2)
+        self.assertEqual(len(set(cycle)), len(cycle))
+        for i, cell in enumerate(cycle):
+            following = cycle[(i + 1) % len(cycle)]
+            distance = (abs(cell % cols - following % cols)
+                        + abs(cell // cols - following // cols))
+            self.assertEqual(distance, 1, (cols, rows, i))
+
+    def test_all_parities(self):
+        """Тест циклов для четных и нечетных сторон."""
+        for cols in range(2, 8):
+            for rows in range(2, 8):
+                self._check(cols, rows)
+
+    def test_corner_outside_cycle(self):
+        """Тест что на нечетном поле вне цикла остается правый нижний угол."""
+        cycle = build_cycle(5, 3)
+        self.assertNotIn(14, cycle)
+
+    def test_too_narrow(self):
+        """Тест поля в одну клетку шириной."""
+        with self.assertRaises(ValueError):
+            build_cycle(1, 10)
+
+
+class TestHamiltonianSolver(unittest.TestCase):
+    """Тесты для класса HamiltonianSolver."""
+
+    def _play(self, width, height, grid_size, seed):
+        sim = Simulation(width=width, height=height, grid_size=grid_size, seed=seed)
+        solver = HamiltonianSolver.for_simulation(sim)
+        while not sim.game_over:
+            sim.step(solver.choose(sim))
+        return sim
+
+    def test_fills_even_board(self):
+        """Тест что змейка заполняет поле с четным числом клеток."""
+        for seed in range(5):
+            sim = self._play(400, 300, 40, seed)
+
+            self.assertTrue(sim.won)
+            self.assertEqual(sim.snake.get_length(), 70)
+
+    def test_fills_transposed_board(self):
+        """Тест поля с нечетным числом строк и четным числом столбцов."""
+        sim = self._play(400, 280, 40, 1)
+
+        self.assertTrue(sim.won)
+        self.assertEqual(sim.snake.get_length(), 70)
+
+    def test_odd_board(self):
+        """Тест поля с двумя нечетными сторонами."""
+        won = 0
+        for seed in range(20):
+            sim = self._play(440, 300, 40, seed)
+
+            self.assertTrue(sim.game_over)
+            self.assertGreaterEqual(sim.snake.get_length(), 11 * 7 - 2)
+            won += sim.won
+
+        # Последнюю клетку удается занять только при удачном яблоке
+        self.assertGreater(won, 0)
+
+    def test_shortcuts_on_empty_board(self):
+        """Тест что короткая змейка срезает путь по циклу."""
+        sim = Simulation(width=800, height=600, grid_size=40, seed=0)
+        solver = HamiltonianSolver.for_simulation(sim)
+        # Яблоко в правом нижнем углу, до него по циклу почти все поле
+        sim.apple.x, sim.apple.y = 760, 560
+
+        for _ in range(40):
+            sim.step(solver.choose(sim))
+            if sim.score:
+                break
+
+        self.assertEqual(sim.score, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Тесты для сетевой игры.
+"""
+
+import asyncio
+import random
+import struct
+import unittest
+from game.arena import Arena
+from game.network import (INPUT, TICK, ArenaMirror, FrameDecoder, GameServer,
+                          encode_frame, encode_snake, encode_tick, encode_welcome)
+from game.simulation import Simulation
+
+
+def _same_state(mirror, arena):
+    """Проверяет, что копия клиента совпадает с ареной."""
+    return (mirror.tick == arena.ticks and mirror.apples == arena.apples
+            and sorted(mirror.snakes) == sorted(arena.snakes)
+            and all(list(mirror.snakes[i]) == arena.body_cells(i) for i in arena.snakes))
+
+
+class TestFrameDecoder(unittest.TestCase):
+    """Тесты для класса FrameDecoder."""
+
+    def test_split_frames(self):
+        """Тест сборки сообщений из произвольных кусков."""
+        data = encode_frame(INPUT, b'\x01') + encode_frame(TICK, b'abc') + encode_frame(INPUT, b'')
+        decoder = FrameDecoder()
+        frames = []
+        for i in range(len(data)):
+            frames.extend(decoder.feed(data[i:i + 1]))
+
+        self.assertEqual(frames, [(INPUT, b'\x01'), (TICK, b'abc'), (INPUT, b'')])
+
+
+class TestArenaMirror(unittest.TestCase):
+    """Тесты для класса ArenaMirror."""
+
+    def test_follows_arena(self):
+        """Тест что изменения шагов воспроизводят арену у клиента."""
+        arena = Arena(width=400, height=300, grid_size=20, apples=20, seed=2)
+        for snake_id in range(1, 6):
+            arena.add_snake(snake_id)
+        mirror = ArenaMirror()
+        decoder = FrameDecoder()
+        for kind, payload in decoder.feed(encode_welcome(3, arena, 60)):
+            mirror.apply(kind, payload)
+        self.assertEqual(mirror.player_id, 3)
+        self.assertTrue(_same_state(mirror, arena))
+
+        rng = random.Random(0)
+        next_id = 6
+        for _ in range(300):
+            spawned = []
+            if rng.random() < 0.1 and arena.add_snake(next_id) is not None:
+                spawned.append(encode_snake(next_id, 3, arena.body_cells(next_id)))
+                next_id += 1
+            directions = {i: rng.choice(Simulation.ACTIONS)
+                          for i in arena.snakes if rng.random() < 0.2}
+            events = arena.step(directions)
+            frame = encode_tick(arena.ticks, spawned, [], events, arena.moved_apples)
+            for kind, payload in decoder.feed(frame):
+                mirror.apply(kind, payload)
+            self.assertTrue(_same_state(mirror, arena))
+
+    def test_payload_size(self):
+        """Тест размера шага: по байту на змейку и постоянный заголовок."""
+        arena = Arena(width=800, height=600, grid_size=20, apples=0, seed=1)
+        for snake_id in range(32):
+            arena.add_snake(snake_id)
+        events = arena.step()
+
+        frame = encode_tick(arena.ticks, [], [], events, [])
+        self.assertEqual(len(frame), 17 + 32)
+
+    def test_many_apples(self):
+        """Тест арены, где яблок больше, чем помещается в байт."""
+        arena = Arena(width=800, height=600, grid_size=20, apples=300, seed=1)
+        arena.add_snake(1)
+        mirror = ArenaMirror()
+        mirror.apply(*FrameDecoder().feed(encode_welcome(1, arena, 10))[0])
+        self.assertEqual(mirror.apples, arena.apples)
+
+        # Яблоко с номером больше 255 переставляется
+        moved = [(299, 5)]
+        arena.apples[299] = 5
+        mirror.apply(*FrameDecoder().feed(
+            encode_tick(arena.ticks + 1, [], [], arena.step(), moved))[0])
+        self.assertEqual(mirror.apples[299], 5)
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    """Тесты для класса GameServer."""
+
+    async def asyncSetUp(self):
+        """Запуск сервера на свободном порту."""
+        self.server = GameServer(width=800, height=600, grid_size=20, rate=60,
+                                 apples=3, seed=1)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        """Остановка сервера."""
+        await self.server.close()
+
+    async def _client(self, mirror, stop, seed):
+        """Клиент, который применяет сообщения и иногда поворачивает."""
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        decoder = FrameDecoder()
+        rng = random.Random(seed)
+        try:
+            while not stop.is_set():
+                try:
+                    data = await asyncio.wait_for(reader.read(65536), 0.05)
+                except asyncio.TimeoutError:
+                    continue
+                if not data:
+                    break
+                for kind, payload in decoder.feed(data):
+                    mirror.apply(kind, payload)
+                    if kind == TICK and rng.random() < 0.05:
+                        writer.write(encode_frame(INPUT, bytes([rng.randrange(4)])))
+        finally:
+            writer.close()
+
+    async def _read_frame(self, reader):
+        """Читает одно сообщение сервера."""
+        decoder = FrameDecoder()
+        while True:
+            frames = decoder.feed(await asyncio.wait_for(reader.read(65536), 1.0))
+            if frames:
+                return frames[0]
+
+    async def test_many_clients(self):
+        """Тест 32 клиентов: частота шагов и одинаковое состояние у всех."""
+        stop = asyncio.Event()
+        mirrors = [ArenaMirror() for _ in range(32)]
+        tasks = [asyncio.create_task(self._client(mirror, stop, i))
+                 for i, mirror in enumerate(mirrors)]
+
+        await asyncio.sleep(0.2)
+        start_tick = self.server.arena.ticks
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.sleep(1.0)
+        rate = (self.server.arena.ticks - start_tick) / (loop.time() - start)
+        self.assertGreater(rate, 50)
+
+        # Останавливаем шаги и даем клиентам дочитать последние
+        self.server._ticker.cancel()
+        await asyncio.sleep(0.2)
+        for mirror in mirrors:
+            self.assertTrue(_same_state(mirror, self.server.arena))
+        self.assertEqual(sorted(m.player_id for m in mirrors), list(range(1, 33)))
+
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    async def test_disconnect_removes_snake(self):
+        """Тест что змейка отключившегося игрока убирается у всех."""
+        # Шаги выполняются вручную, чтобы змейки не успели разбиться
+        self.server._ticker.cancel()
+        stop = asyncio.Event()
+        watcher = ArenaMirror()
+        task = asyncio.create_task(self._client(watcher, stop, 0))
+        await asyncio.sleep(0.1)
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        await asyncio.sleep(0.1)
+        self.server.tick()
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(self.server.arena.snakes), 2)
+        other = next(i for i in self.server.clients if i != watcher.player_id)
+        self.assertIn(other, watcher.snakes)
+
+        writer.close()
+        await asyncio.sleep(0.1)
+        self.server.tick()
+        await asyncio.sleep(0.1)
+        self.assertEqual(list(self.server.clients), [watcher.player_id])
+        self.assertNotIn(other, watcher.snakes)
+
+        stop.set()
+        await task
+
+    async def test_player_ids_reused(self):
+        """Тест что номера игроков выдаются снова и не доходят до ботов."""
+        self.server._ticker.cancel()
+        self.server._next_id = GameServer.BOT_ID_BASE - 1
+        first = ArenaMirror()
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        first.apply(*await self._read_frame(reader))
+        self.assertEqual(first.player_id, GameServer.BOT_ID_BASE - 1)
+
+        # Свободных номеров нет: сервер закрывает подключение
+        refused, refused_writer = await asyncio.open_connection('127.0.0.1',
+                                                                self.server.port)
+        self.assertEqual(await asyncio.wait_for(refused.read(), 1.0), b'')
+        refused_writer.close()
+
+        writer.close()
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.server.clients, {})
+        # Номер свободен только после шага, который разослал удаление змейки
+        self.server.tick()
+
+        second = ArenaMirror()
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        second.apply(*await self._read_frame(reader))
+        self.assertEqual(second.player_id, GameServer.BOT_ID_BASE - 1)
+        writer.close()
+
+    async def test_oversized_frame(self):
+        """Тест что сообщение с огромной длиной не читается, а клиент отключается."""
+        self.server._ticker.cancel()
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        await self._read_frame(reader)
+        self.assertEqual(len(self.server.clients), 1)
+
+        # Заголовок обещает 4 ГБ данных
+        writer.write(struct.pack('<IB', 0xFFFFFFFF, INPUT))
+        self.assertEqual(await asyncio.wait_for(reader.read(), 1.0), b'')
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.clients, {})
+        writer.close()
+
+    async def test_bots(self):
+        """Тест ботов сервера: они ходят и появляются снова после гибели."""
+        server = GameServer(width=400, height=300, grid_size=20, apples=2,
+                            seed=1, bots=5, respawn_ticks=1)
+        self.assertEqual(len(server.arena.snakes), 5)
+        for _ in range(300):
+            server.tick()
+            self.assertGreaterEqual(len(server.arena.snakes), 3)
+        self.assertTrue(all(i >= GameServer.BOT_ID_BASE for i in server.arena.snakes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Тесты для профилировщика кадров.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from game.profiler import FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """Тесты для класса FrameProfiler."""
+
+    def _record(self, profiler, durations):
+        """Записывает кадры с заданной длительностью фазы update."""
+        clock = [0.0]
+        with patch('game.profiler.time.perf_counter', side_effect=lambda: clock[0]):
+            for duration in durations:
+                clock[0] = 0.0
+                profiler.start_frame()
+                profiler.lap('events')
+                clock[0] += duration
+                profiler.lap('update')
+                profiler.end_frame()
+
+    def test_lap_attributes_time_to_phase(self):
+        """Тест что время между отметками попадает в нужную фазу."""
+        profiler = FrameProfiler()
+        self._record(profiler, [0.004, 0.002])
+
+        self.assertEqual(len(profiler), 2)
+        self.assertEqual(profiler.values('update'), [0.004, 0.002])
+        self.assertEqual(profiler.values('events'), [0.0, 0.0])
+        self.assertEqual(profiler.values('total'), [0.004, 0.002])
+
+    def test_ring_buffer_keeps_last_frames(self):
+        """Тест что хранятся только последние кадры."""
+        profiler = FrameProfiler(capacity=3)
+        self._record(profiler, [0.001, 0.002, 0.003, 0.004, 0.005])
+
+        self.assertEqual(profiler.frame_count, 5)
+        self.assertEqual(len(profiler), 3)
+        self.assertEqual(profiler.values('update'), [0.003, 0.004, 0.005])
+
+    def test_percentiles(self):
+        """Тест перцентилей по методу ближайшего ранга."""
+        profiler = FrameProfiler()
+        self.assertEqual(profiler.percentiles(), (0.0, 0.0, 0.0))
+
+        self._record(profiler, [i / 1000 for i in range(1, 101)])
+        p50, p95, p99 = profiler.percentiles('update')
+
+        self.assertAlmostEqual(p50, 50.0)
+        self.assertAlmostEqual(p95, 95.0)
+        self.assertAlmostEqual(p99, 99.0)
+
+    def test_dump_csv(self):
+        """Тест сохранения кадров в CSV."""
+        profiler = FrameProfiler(capacity=2)
+        self._record(profiler, [0.001, 0.002, 0.003])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'frames.csv')
+            profiler.dump_csv(path)
+            with open(path, encoding='utf-8') as f:
+                rows = list(csv.reader(f))
+
+        self.assertEqual(rows[0], ['frame'] + list(FrameProfiler.PHASES) + ['total'])
+        self.assertEqual([row[0] for row in rows[1:]], ['1', '2'])
+        self.assertEqual(rows[-1][-1], '3.000')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Тесты для записи и воспроизведения игр.
+"""
+
+import os
+import tempfile
+import unittest
+from game.simulation import Simulation
+from game.replay import Replay, ReplayRecorder, pack_state
+
+
+class TestReplay(unittest.TestCase):
+    """Тесты для классов ReplayRecorder и Replay."""
+
+    def setUp(self):
+        """Записываем короткую игру с поворотами."""
+        self.sim = Simulation(width=400, height=300, grid_size=20, seed=7)
+        self.recorder = ReplayRecorder(self.sim, keyframe_interval=10)
+
+        pattern = [(0, -1), None, (1, 0), None, (0, 1), None, (1, 0), None]
+        tick = 0
+        while self.recorder.step(pattern[tick % len(pattern)]):
+            tick += 1
+
+    def test_same_seed_same_game(self):
+        """Тест детерминированности по зерну."""
+        first = Simulation(width=400, height=300, grid_size=20, seed=3)
+        second = Simulation(width=400, height=300, grid_size=20, seed=3)
+
+        self.assertEqual((first.apple.x, first.apple.y),
+                         (second.apple.x, second.apple.y))
+
+    def test_roundtrip_and_play(self):
+        """Тест сохранения, загрузки и проигрывания до конца."""
+        for compression in ('lzma', 'zlib'):
+            data = self.recorder.to_replay().to_bytes(compression)
+            replay = Replay.from_bytes(data)
+
+            self.assertEqual(replay.seed, 7)
+            self.assertEqual(replay.num_ticks, self.sim.ticks)
+
+            final = replay.play()
+            self.assertTrue(final.game_over)
+            self.assertEqual(final.score, self.sim.score)
+            self.assertEqual(pack_state(final), pack_state(self.sim))
+
+    def test_seek_matches_full_playback(self):
+        """Тест что переход по ключевому кадру совпадает с проигрыванием с начала."""
+        replay = self.recorder.to_replay()
+        self.assertGreater(len(replay.keyframes), 1)
+
+        from_start = Replay(replay.seed, replay.width, replay.height,
+                            replay.grid_size, replay.inputs,
+                            {0: replay.keyframes[0]}, replay.keyframe_interval)
+
+        for tick in (0, 9, 10, 11, replay.num_ticks):
+            self.assertEqual(pack_state(replay.seek(tick)),
+                             pack_state(from_start.seek(tick)))
+
+    def test_save_and_load_file(self):
+        """Тест записи реплея в файл."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'game.snkr')
+            self.recorder.save(path)
+            replay = Replay.load(path)
+
+        self.assertEqual(replay.inputs, bytes(self.recorder.inputs))
+
+    def test_keyframe_interval_on_big_field(self):
+        """Тест что на большом поле ключевые кадры сохраняются реже."""
+        self.assertEqual(ReplayRecorder(Simulation(seed=1)).keyframe_interval,
+                         ReplayRecorder.KEYFRAME_INTERVAL)
+
+        big = Simulation(width=4000, height=4000, grid_size=4, seed=1)
+        recorder = ReplayRecorder(big)
+        self.assertEqual(recorder.keyframe_interval, 1000 * 1000 // 8)
+
+    def test_keyframes_thinned(self):
+        """Тест что ключевых кадров не больше MAX_KEYFRAMES и по ним можно перематывать."""
+        sim = Simulation(width=400, height=300, grid_size=20, seed=7)
+        recorder = ReplayRecorder(sim, keyframe_interval=1)
+        recorder.MAX_KEYFRAMES = 4
+        for _ in range(9):
+            recorder.step()
+
+        self.assertEqual(sorted(recorder.keyframes), [0, 4, 8])
+        self.assertEqual(recorder.keyframe_interval, 4)
+        replay = recorder.to_replay()
+        self.assertEqual(pack_state(replay.seek(9)), pack_state(sim))
+
+    def test_bad_data(self):
+        """Тест чтения неизвестного формата."""
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b'not a replay')
+
+
+if __name__ == '__main__':
+    unittest.main()
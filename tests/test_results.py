@@ -0,0 +1,271 @@
+"""
+Тесты для хранилища результатов.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from game.results import (ResultsStore, ResultWriter, format_legacy_line,
+                          parse_legacy_line)
+
+LEGACY_LINES = [
+    "2024-01-01 10:00:00 | Игрок | Очки: 5 | Длина: 8 | Скорость: 10\n",
+    "2024-01-02 10:00:00 | Игрок | Очки: 12 | Длина: 15 | Скорость: 10 | Поле: 800x600\n",
+    "2024-01-03 10:00:00 | Вася | Очки: 7 | Длина: 10 | Скорость: 15 | Поле: 800x600 | Сетка: 40\n",
+]
+
+
+class TestResultsStore(unittest.TestCase):
+    """Тесты для класса ResultsStore."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.legacy_path = os.path.join(self.tmpdir.name, 'results.txt')
+        self.store = ResultsStore(os.path.join(self.tmpdir.name, 'results.db'))
+
+    def tearDown(self):
+        """Очистка после теста."""
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def _write_legacy(self, lines, mode='w'):
+        with open(self.legacy_path, mode, encoding='utf-8') as f:
+            f.writelines(lines)
+
+    def test_parse_legacy_formats(self):
+        """Тест разбора всех форматов старого файла."""
+        old, with_field, full = (parse_legacy_line(line) for line in LEGACY_LINES)
+
+        self.assertEqual(old['score'], 5)
+        self.assertIsNone(old['field_width'])
+        self.assertIsNone(old['grid_size'])
+        self.assertEqual((with_field['field_width'], with_field['field_height']), (800, 600))
+        self.assertIsNone(with_field['grid_size'])
+        self.assertEqual(full['player'], 'Вася')
+        self.assertEqual(full['grid_size'], 40)
+        self.assertIsNone(parse_legacy_line("мусор\n"))
+
+    def test_format_legacy_line(self):
+        """Тест записи результата строкой старого файла."""
+        for line in LEGACY_LINES:
+            self.assertEqual(format_legacy_line(parse_legacy_line(line)), line)
+
+    def test_high_scores(self):
+        """Тест рекордов по игроку и по настройкам."""
+        self.store.add_many([
+            {'player': 'А', 'score': 10, 'length': 13, 'speed': 10,
+             'field_width': 800, 'field_height': 600, 'grid_size': 40,
+             'timestamp': '2024-01-01 10:00:00'},
+            {'player': 'Б', 'score': 30, 'length': 33, 'speed': 20,
+             'field_width': 800, 'field_height': 600, 'grid_size': 40,
+             'timestamp': '2024-01-01 11:00:00'},
+        ])
+
+        self.assertEqual(self.store.high_score('А'), 10)
+        self.assertEqual(self.store.high_score(), 30)
+        self.assertEqual(self.store.high_score('В'), 0)
+        self.assertEqual(self.store.config_high_score(10, 800, 600, 40), 10)
+        self.assertEqual(self.store.config_high_score(10, 400, 300, 40), 0)
+
+    def test_migrate_legacy(self):
+        """Тест переноса старого файла без повторов."""
+        self._write_legacy(LEGACY_LINES)
+
+        self.assertEqual(self.store.migrate_legacy(self.legacy_path), 3)
+        self.assertEqual(self.store.migrate_legacy(self.legacy_path), 0)
+        self.assertEqual(self.store.count(), 3)
+        self.assertEqual(self.store.high_score('Игрок'), 12)
+
+        # Строки, дописанные старой версией игры, переносятся при следующем запуске
+        self._write_legacy(LEGACY_LINES[:1], mode='a')
+        self.assertEqual(self.store.migrate_legacy(self.legacy_path), 1)
+        self.assertEqual(self.store.count(), 4)
+
+    def test_migrate_missing_file(self):
+        """Тест переноса при отсутствии старого файла."""
+        self.assertEqual(self.store.migrate_legacy(self.legacy_path), 0)
+
+    def test_unknown_sync_mode(self):
+        """Тест проверки режима синхронизации."""
+        with self.assertRaises(ValueError):
+            ResultsStore(':memory:', sync='ALWAYS')
+
+    def test_persistence(self):
+        """Тест что результаты сохраняются между открытиями базы."""
+        self._write_legacy(LEGACY_LINES)
+        self.store.migrate_legacy(self.legacy_path)
+        self.store.close()
+
+        self.store = ResultsStore(os.path.join(self.tmpdir.name, 'results.db'))
+        self.assertEqual(self.store.count(), 3)
+        self.assertEqual(self.store.high_score(), 12)
+
+
+class TestResultWriter(unittest.TestCase):
+    """Тесты для класса ResultWriter."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'results.db')
+        self.legacy_path = os.path.join(self.tmpdir.name, 'results.txt')
+
+    def tearDown(self):
+        """Очистка после теста."""
+        self.tmpdir.cleanup()
+
+    @staticmethod
+    def _result(score):
+        return {'player': 'Игрок', 'score': score, 'length': score + 3,
+                'speed': 10, 'field_width': 800, 'field_height': 600,
+                'grid_size': 40, 'timestamp': '2024-01-01 10:00:00'}
+
+    def test_close_drains_queue(self):
+        """Тест что при закрытии записываются все результаты."""
+        writer = ResultWriter(ResultsStore(self.path, sync='FULL'),
+                              max_queue=64, batch_size=3)
+        for score in range(50):
+            writer.put(self._result(score))
+        writer.close()
+
+        self.assertEqual(writer.written, 50)
+        self.assertIsNone(writer.last_error)
+
+        store = ResultsStore(self.path)
+        self.assertEqual(store.count(), 50)
+        self.assertEqual(store.high_score('Игрок'), 49)
+        store.close()
+
+    def test_flush(self):
+        """Тест ожидания записи без остановки потока."""
+        writer = ResultWriter(ResultsStore(self.path))
+        writer.put(self._result(5))
+        writer.flush()
+
+        self.assertEqual(writer.store.high_score(), 5)
+        writer.close()
+
+    def test_put_after_close(self):
+        """Тест записи после остановки."""
+        writer = ResultWriter(ResultsStore(self.path))
+        writer.close()
+        writer.close()
+
+        with self.assertRaises(RuntimeError):
+            writer.put(self._result(1))
+
+    def test_retry_failed_batch(self):
+        """Тест повторной записи пачки после ошибки базы."""
+        store = ResultsStore(self.path)
+        errors = [sqlite3.OperationalError('database is locked')]
+        add_many = store.add_many
+
+        def flaky_add_many(results):
+            if errors:
+                raise errors.pop()
+            return add_many(results)
+
+        with mock.patch.object(store, 'add_many', side_effect=flaky_add_many):
+            writer = ResultWriter(store, fallback_path=self.legacy_path,
+                                  retry_interval=0.01)
+            with self.assertLogs('game.results', 'WARNING'):
+                writer.put(self._result(7))
+                writer.close()
+
+        self.assertEqual((writer.written, writer.spilled, writer.lost), (1, 0, 0))
+        self.assertIsInstance(writer.last_error, sqlite3.OperationalError)
+        self.assertFalse(os.path.exists(self.legacy_path))
+
+    def test_spill_to_legacy_file(self):
+        """Тест что результаты, дважды не записанные в базу, не теряются."""
+        store = ResultsStore(self.path)
+        with mock.patch.object(store, 'add_many',
+                               side_effect=sqlite3.OperationalError('disk I/O error')):
+            writer = ResultWriter(store, fallback_path=self.legacy_path,
+                                  retry_interval=0.01)
+            with self.assertLogs('game.results', 'ERROR'):
+                writer.put(self._result(3))
+                writer.put(self._result(4))
+                writer.close()
+
+        self.assertEqual((writer.written, writer.spilled, writer.lost), (0, 2, 0))
+        store = ResultsStore(self.path)
+        self.assertEqual(store.migrate_legacy(self.legacy_path), 2)
+        self.assertEqual(store.high_score('Игрок'), 4)
+        store.close()
+
+    def test_full_queue_does_not_block(self):
+        """Тест что put при заполненной очереди не ждет базу и файл."""
+        store = ResultsStore(self.path)
+        started, release = threading.Event(), threading.Event()
+        add_many = store.add_many
+
+        def slow_add_many(results):
+            started.set()
+            release.wait()
+            return add_many(results)
+
+        with mock.patch.object(store, 'add_many', side_effect=slow_add_many):
+            writer = ResultWriter(store, max_queue=2,
+                                  fallback_path=self.legacy_path)
+            writer.put(self._result(1))
+            started.wait()
+            for score in range(2, 6):
+                writer.put(self._result(score))
+            self.assertEqual(writer.spilled, 0)
+            self.assertFalse(os.path.exists(self.legacy_path))
+            with self.assertLogs('game.results', 'ERROR'):
+                writer.put(self._result(6))
+            self.assertEqual(writer.lost, 1)
+
+            release.set()
+            writer.close()
+
+        self.assertEqual(writer.written, 3)
+        self.assertEqual(writer.spilled, 2)
+        with open(self.legacy_path, encoding='utf-8') as f:
+            scores = [parse_legacy_line(line)['score'] for line in f]
+        self.assertEqual(scores, [4, 5])
+
+    def test_close_timeout(self):
+        """Тест что close не ждет зависший поток записи бесконечно."""
+        store = ResultsStore(self.path)
+        started, release = threading.Event(), threading.Event()
+
+        def stuck_add_many(results):
+            started.set()
+            release.wait()
+            return len(results)
+
+        with mock.patch.object(store, 'add_many', side_effect=stuck_add_many):
+            writer = ResultWriter(store, max_queue=1,
+                                  fallback_path=self.legacy_path)
+            writer.put(self._result(1))
+            started.wait()
+            writer.put(self._result(2))
+            with self.assertLogs('game.results', 'ERROR'):
+                writer.close(timeout=0.05)
+            release.set()
+            writer._thread.join()
+        self.assertEqual(writer.written, 2)
+        store.close()
+
+    def test_lost_without_fallback(self):
+        """Тест учета результатов, которые некуда сохранить."""
+        store = ResultsStore(self.path)
+        with mock.patch.object(store, 'add_many',
+                               side_effect=sqlite3.OperationalError('readonly')):
+            writer = ResultWriter(store, retry_interval=0.01)
+            with self.assertLogs('game.results', 'ERROR'):
+                writer.put(self._result(1))
+                writer.close()
+
+        self.assertEqual(writer.lost, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Тесты для планировщика шагов.
+"""
+
+import unittest
+from game.scheduler import TickScheduler
+
+
+class TestTickScheduler(unittest.TestCase):
+    """Тесты для класса TickScheduler."""
+
+    def test_leftover_time_is_kept(self):
+        """Тест что остаток времени переносится на следующий кадр."""
+        scheduler = TickScheduler(rate=25)
+
+        # 60 кадров по 1/60 с должны дать ровно 25 шагов
+        ticks = sum(scheduler.advance(1 / 60) for _ in range(60))
+        self.assertEqual(ticks, 25)
+
+    def test_several_ticks_per_frame(self):
+        """Тест скорости выше частоты кадров."""
+        scheduler = TickScheduler(rate=120)
+        self.assertEqual(scheduler.advance(1 / 60), 2)
+
+    def test_spiral_of_death_cap(self):
+        """Тест ограничения количества догоняющих шагов."""
+        scheduler = TickScheduler(rate=10, max_ticks=5)
+
+        self.assertEqual(scheduler.advance(3.0), 5)
+        self.assertEqual(scheduler.dropped_ticks, 25)
+        self.assertEqual(scheduler.accumulator, 0.0)
+
+    def test_reset_skips_next_interval(self):
+        """Тест что время паузы не превращается в шаги."""
+        scheduler = TickScheduler(rate=10)
+        scheduler.advance(0.05)
+        scheduler.reset()
+
+        self.assertEqual(scheduler.advance(10.0), 0)
+        self.assertAlmostEqual(scheduler.time_to_next_tick(), 0.1)
+
+    def test_measured_rate(self):
+        """Тест измерения фактической частоты шагов."""
+        scheduler = TickScheduler(rate=25)
+        for _ in range(120):
+            scheduler.advance(1 / 60)
+        self.assertAlmostEqual(scheduler.measured_rate, 25, delta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
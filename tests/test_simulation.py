@@ -0,0 +1,94 @@
+"""
+Тесты для игровой логики без отрисовки.
+"""
+
+import unittest
+from game.simulation import Simulation
+
+
+class TestSimulation(unittest.TestCase):
+    """Тесты для класса Simulation."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.sim = Simulation(width=400, height=300, grid_size=20)
+
+    def test_initialization(self):
+        """Тест начального состояния."""
+        self.assertEqual(self.sim.game_width, 400)
+        self.assertEqual(self.sim.game_height, 300)
+        self.assertEqual(self.sim.snake.x, 200)
+        self.assertEqual(self.sim.snake.y, 140)
+        self.assertEqual(self.sim.score, 0)
+        self.assertFalse(self.sim.game_over)
+
+    def test_step_moves_snake(self):
+        """Тест шага без смены направления."""
+        self.sim.apple.x, self.sim.apple.y = 0, 0
+
+        self.assertTrue(self.sim.step())
+        self.assertEqual(self.sim.snake.x, 220)
+        self.assertEqual(self.sim.ticks, 1)
+
+    def test_step_with_action(self):
+        """Тест шага со сменой направления."""
+        self.sim.apple.x, self.sim.apple.y = 0, 0
+
+        self.sim.step((0, -1))
+        self.assertEqual(self.sim.snake.y, 120)
+
+    def test_eat_apple(self):
+        """Тест поедания яблока."""
+        self.sim.apple.x, self.sim.apple.y = 220, 140
+
+        self.sim.step()
+        self.assertEqual(self.sim.score, 1)
+        self.assertEqual(self.sim.snake.grow_pending, 1)
+
+    def test_wall_collision(self):
+        """Тест завершения игры при ударе о стену."""
+        self.sim.apple.x, self.sim.apple.y = 0, 0
+
+        while self.sim.step():
+            pass
+
+        self.assertTrue(self.sim.game_over)
+        self.assertEqual(self.sim.snake.x, 400)
+        self.assertFalse(self.sim.step())
+
+    def test_free_cells_track_snake(self):
+        """Тест что индекс свободных клеток следует за змейкой."""
+        self.sim.apple.x, self.sim.apple.y = 0, 0
+        cols = self.sim.game_width // self.sim.grid_size
+        rows = self.sim.game_height // self.sim.grid_size
+
+        for _ in range(3):
+            self.sim.step()
+            self.assertEqual(len(self.sim.free_cells),
+                             cols * rows - self.sim.snake.get_length())
+            head = self.sim.snake.cell_index(self.sim.snake.x, self.sim.snake.y)
+            self.assertNotIn(head, self.sim.free_cells)
+
+    def test_full_board_is_win(self):
+        """Тест победы при заполнении поля."""
+        sim = Simulation(width=80, height=40, grid_size=20)
+
+        # Обходим поле 4x2, подкладывая яблоко под каждый шаг
+        for action, cell in [((1, 0), (60, 20)), ((0, -1), (60, 0)),
+                             ((-1, 0), (40, 0)), ((-1, 0), (20, 0)),
+                             ((-1, 0), (0, 0))]:
+            sim.apple.x, sim.apple.y = cell
+            self.assertTrue(sim.step(action))
+
+        # Единственная свободная клетка - там, где был хвост
+        self.assertEqual(len(sim.free_cells), 1)
+        self.assertEqual((sim.apple.x, sim.apple.y), (0, 20))
+
+        self.assertFalse(sim.step((0, 1)))
+        self.assertTrue(sim.won)
+        self.assertTrue(sim.game_over)
+        self.assertEqual(sim.snake.get_length(), 8)
+        self.assertEqual(sim.score, 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,8 @@
 
 import unittest
 import pygame
-from game.snake import Snake
+from game.base import Cell
+from game.snake import Snake, SnakeBody
 
 
 class TestSnake(unittest.TestCase):
@@ -60,11 +61,144 @@ class TestSnake(unittest.TestCase):
         self.assertEqual(len(self.snake.body), initial_length + 1)
         self.assertEqual(self.snake.grow_pending, 1)
 
+    def test_move_keeps_length(self):
+        """Тест что хвост освобождает клетку при движении."""
+        tail = self.snake.body[-1]
+
+        self.snake.move()
+
+        self.assertEqual(len(self.snake.body), 2)
+        self.assertNotIn(tail, self.snake.body)
+        self.assertEqual(self.snake.body[-1].x, tail.x + 20)
+
     def test_check_self_collision(self):
         """Тест проверки столкновения с собой."""
         # Новая змейка не должна сталкиваться сама с собой
         self.assertFalse(self.snake.check_self_collision())
 
+        # Разворот по кругу приводит голову в собственное тело
+        self.snake.grow(2)
+        for direction in [(0, 1), (-1, 0), (0, -1)]:
+            self.snake.set_direction(direction)
+            self.snake.move()
+        self.assertTrue(self.snake.check_self_collision())
+
+    def test_occupancy(self):
+        """Тест сетки занятости."""
+        self.assertEqual(sum(self.snake.occupancy), 3)
+        self.assertFalse(self.snake.is_cell_free(60, 100))
+        self.assertTrue(self.snake.is_cell_free(40, 100))
+        self.assertFalse(self.snake.is_cell_free(-20, 100))
+
+        self.snake.move()
+
+        self.assertTrue(self.snake.is_cell_free(60, 100))
+        self.assertFalse(self.snake.is_cell_free(120, 100))
+        self.assertEqual(sum(self.snake.occupancy), 3)
+
+    def test_move_off_field(self):
+        """Тест что разбившаяся о стену змейка дальше не двигается."""
+        snake = Snake(40, 0, size=20, length=2, field_width=60, field_height=40)
+        snake.move()
+        self.assertTrue(snake.check_wall_collision(60, 40))
+        with self.assertRaises(ValueError):
+            snake.move()
+
+    def test_body_contains(self):
+        """Тест проверки клетки тела по сетке занятости змейки."""
+        body = self.snake.body
+        self.assertIs(body.occupancy, self.snake.occupancy)
+        self.assertIn(Cell(80, 100), body)
+        self.assertIn(Cell(60, 100), body)
+        # Голова занимает клетку в сетке, но не входит в тело
+        self.assertNotIn(Cell(100, 100), body)
+        self.assertNotIn(Cell(100, 120), body)
+
+        self.snake.move()
+        self.assertIn(Cell(100, 100), body)
+        self.assertNotIn(Cell(60, 100), body)
+
+    def test_default_field(self):
+        """Тест что без размеров поля змейка стоит на стандартном поле."""
+        snake = Snake(100, 100, 20, 3)
+        self.assertEqual((snake.cols, snake.rows), (40, 30))
+        self.assertEqual(snake.get_length(), 3)
+        with self.assertRaises(ValueError):
+            Snake(900, 100, size=20, length=3)
+
+        snake = Snake(900, 100, size=20, length=3,
+                      field_width=1000, field_height=200)
+        self.assertEqual(snake.get_length(), 3)
+        self.assertFalse(snake.is_cell_free(880, 100))
+
+class TestSnakeBody(unittest.TestCase):
+    """Тесты для класса SnakeBody."""
+
+    def setUp(self):
+        """Тело на поле 10x5 клеток по 20 пикселей."""
+        self.body = SnakeBody(10, 5, 20, [Cell(40, 20), Cell(20, 20)])
+
+    def test_sequence(self):
+        """Тест доступа к клеткам как у deque."""
+        self.body.appendleft(Cell(60, 20))
+        self.body.append(Cell(0, 20))
+
+        cells = [Cell(60, 20), Cell(40, 20), Cell(20, 20), Cell(0, 20)]
+        self.assertEqual(list(self.body), cells)
+        self.assertEqual(list(reversed(self.body)), cells[::-1])
+        self.assertEqual(self.body[0], Cell(60, 20))
+        self.assertEqual(self.body[-1], Cell(0, 20))
+        self.assertEqual(list(self.body.indices()), [13, 12, 11, 10])
+        self.assertIn(Cell(20, 20), self.body)
+        self.assertNotIn(Cell(80, 20), self.body)
+        self.assertNotIn(Cell(-20, 20), self.body)
+
+        self.assertEqual(self.body.pop(), Cell(0, 20))
+        self.assertEqual(len(self.body), 3)
+        with self.assertRaises(IndexError):
+            self.body[3]
+
+        self.body.clear()
+        self.assertFalse(self.body)
+        with self.assertRaises(IndexError):
+            self.body.pop()
+
+    def test_ring_buffer(self):
+        """Тест перехода через конец буфера и роста буфера."""
+        body = SnakeBody(40, 40, 1)
+        for i in range(10):
+            body.appendleft_index(i)
+        # Хвост уходит, голова идет дальше: сегменты переходят через край буфера
+        for i in range(10, 30):
+            body.appendleft_index(i)
+            self.assertEqual(body.pop_index(), i - 10)
+        self.assertEqual(list(body.indices()), list(range(29, 19, -1)))
+        self.assertEqual(list(body.indices(reverse=True)), list(range(20, 30)))
+        self.assertEqual(body.nbytes, 4 * SnakeBody.MIN_CAPACITY)
+
+        for i in range(30, 1000):
+            body.appendleft_index(i)
+        self.assertEqual(list(body.indices(reverse=True)), list(range(20, 1000)))
+        self.assertLessEqual(body.nbytes, 4 * 2 * len(body))
+
+        copy = body.copy()
+        copy.pop_index()
+        self.assertEqual(len(body), 980)
+        self.assertEqual(len(copy), 979)
+
+    def test_capacity_limited_by_field(self):
+        """Тест что буфер не больше количества клеток поля."""
+        body = SnakeBody(5, 5, 1, [Cell(i % 5, i // 5) for i in range(25)])
+        self.assertEqual(body.nbytes, 4 * 25)
+        # Сегмент поверх тела бывает на шаге столкновения
+        body.append(Cell(0, 0))
+        self.assertEqual(body.nbytes, 4 * 26)
+
+    def test_off_field(self):
+        """Тест что клетка тела вне поля не принимается."""
+        with self.assertRaises(ValueError):
+            self.body.appendleft(Cell(200, 20))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Тесты для кэша отрисованного текста.
+"""
+
+import unittest
+from unittest.mock import Mock
+from game.text_cache import TextCache
+
+
+class TestTextCache(unittest.TestCase):
+    """Тесты для класса TextCache."""
+
+    def setUp(self):
+        """Подготовка тестовой среды."""
+        self.cache = TextCache(max_size=2)
+        self.font = Mock()
+        self.font.render = Mock(side_effect=lambda text, aa, color: (text, color))
+
+    def test_render_is_cached(self):
+        """Тест повторного использования поверхности."""
+        first = self.cache.render(self.font, 'Очки: 1', (255, 255, 100))
+        second = self.cache.render(self.font, 'Очки: 1', (255, 255, 100))
+
+        self.assertIs(first, second)
+        self.assertEqual(self.font.render.call_count, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_key_includes_color_and_font(self):
+        """Тест что цвет и шрифт входят в ключ."""
+        other_font = Mock()
+        other_font.render = Mock(return_value=Mock())
+
+        self.cache.render(self.font, 'ПАУЗА', (255, 255, 0))
+        self.cache.render(self.font, 'ПАУЗА', (255, 0, 0))
+        self.cache.render(other_font, 'ПАУЗА', (255, 255, 0))
+
+        self.assertEqual(self.font.render.call_count, 2)
+        self.assertEqual(other_font.render.call_count, 1)
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованной записи."""
+        self.cache.render(self.font, 'a', (0, 0, 0))
+        self.cache.render(self.font, 'b', (0, 0, 0))
+        self.cache.render(self.font, 'a', (0, 0, 0))  # 'a' становится свежей
+        self.cache.render(self.font, 'c', (0, 0, 0))  # вытесняет 'b'
+
+        self.assertEqual(len(self.cache), 2)
+        self.cache.render(self.font, 'a', (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 3)
+        self.cache.render(self.font, 'b', (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()